@@ -401,6 +401,23 @@ class AvailabilityRecordSerializer(ModelSerializer):
         return obj.content_type.model
 
 
+class AvailabilityStatusChangeSerializer(Serializer):
+    status = CharField()
+    timestamp = serializers.DateTimeField()
+    linked_id = UUIDField()
+    linked_model = CharField()
+
+
+class AvailabilityUptimeQuerySerializer(serializers.Serializer):
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get("start") and attrs.get("end") and attrs["start"] >= attrs["end"]:
+            raise serializers.ValidationError({"end": "Must be after start"})
+        return attrs
+
+
 class UserDefaultAssetLocationSerializer(ModelSerializer):
     location_object = AssetLocationSerializer(source="location", read_only=True)
 
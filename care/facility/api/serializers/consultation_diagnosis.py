@@ -11,7 +11,49 @@ from care.facility.static_data.icd11 import get_icd11_diagnosis_object_by_id
 from care.users.api.serializers.user import UserBaseMinimumSerializer
 
 
+def parse_diagnosis_id(value) -> int | None:
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PreloadedDiagnosisField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves diagnoses from `preloaded` before falling back to a query
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(queryset=ICD11Diagnosis.objects.all(), **kwargs)
+        self.preloaded: dict[int, ICD11Diagnosis] = {}
+
+    def to_internal_value(self, data):
+        if (pk := parse_diagnosis_id(data)) in self.preloaded:
+            return self.preloaded[pk]
+        return super().to_internal_value(data)
+
+
+class ConsultationCreateDiagnosisListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        # the diagnoses of all the items are loaded with a single query
+        if isinstance(data, list):
+            ids = {
+                parse_diagnosis_id(item.get("diagnosis"))
+                for item in data
+                if isinstance(item, dict)
+            }
+            ids.discard(None)
+            self.child.fields["diagnosis"].preloaded = ICD11Diagnosis.objects.in_bulk(
+                ids
+            )
+        return super().to_internal_value(data)
+
+
 class ConsultationCreateDiagnosisSerializer(serializers.ModelSerializer):
+    diagnosis = PreloadedDiagnosisField()
+
     def validate_verification_status(self, value):
         if value in INACTIVE_CONDITION_VERIFICATION_STATUSES:
             msg = "Verification status not allowed"
@@ -21,6 +63,7 @@ class ConsultationCreateDiagnosisSerializer(serializers.ModelSerializer):
     class Meta:
         model = ConsultationDiagnosis
         fields = ("diagnosis", "verification_status", "is_principal")
+        list_serializer_class = ConsultationCreateDiagnosisListSerializer
 
 
 class ConsultationDiagnosisSerializer(serializers.ModelSerializer):
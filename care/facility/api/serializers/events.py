@@ -1,5 +1,6 @@
 from rest_framework.serializers import ModelSerializer, SerializerMethodField
 
+from care.facility.events.tree import get_event_type_tree
 from care.facility.models.events import EventType, PatientConsultationEvent
 from care.users.api.serializers.user import UserBaseMinimumSerializer
 from care.utils.ulid.serializers import ULIDField
@@ -19,7 +20,15 @@ class NestedEventTypeSerializer(ModelSerializer):
         fields = ("id", "parent", "name", "description", "model", "fields", "children")
 
     def get_children(self, obj: EventType) -> list[EventType] | None:
-        return NestedEventTypeSerializer(obj.children.all(), many=True).data or None
+        # the tree is resolved once and shared with the nested serializers
+        # through the context
+        if "event_type_tree" not in self.context:
+            self.context["event_type_tree"] = get_event_type_tree()
+        children = self.context["event_type_tree"].get_children(obj.id)
+        return (
+            NestedEventTypeSerializer(children, many=True, context=self.context).data
+            or None
+        )
 
 
 class PatientConsultationEventDetailSerializer(ModelSerializer):
@@ -5,6 +5,7 @@ from rest_framework import serializers
 from care.facility.models import FACILITY_TYPES, Facility, FacilityLocalGovtBody
 from care.facility.models.bed import Bed
 from care.facility.models.facility import FEATURE_CHOICES, FacilityHubSpoke
+from care.facility.models.facility_flag import FacilityFlag
 from care.facility.models.patient import PatientRegistration
 from care.users.api.serializers.lsg import (
     DistrictSerializer,
@@ -19,6 +20,7 @@ from care.utils.models.validators import (
     custom_image_extension_validator,
 )
 from care.utils.serializers.fields import ChoiceField, ExternalIdSerializerField
+from care.utils.serializers.flags import FlagListSerializer, FlagsSerializerMixin
 
 User = get_user_model()
 
@@ -92,7 +94,7 @@ class FacilityBasicInfoSerializer(serializers.ModelSerializer):
         )
 
 
-class FacilitySerializer(FacilityBasicInfoSerializer):
+class FacilitySerializer(FlagsSerializerMixin, FacilityBasicInfoSerializer):
     """Serializer for facility.models.Facility."""
 
     facility_type = ChoiceField(choices=FACILITY_TYPES)
@@ -104,12 +106,14 @@ class FacilitySerializer(FacilityBasicInfoSerializer):
     bed_count = serializers.SerializerMethodField()
 
     facility_flags = serializers.SerializerMethodField()
+    flag_model = FacilityFlag
 
     def get_facility_flags(self, facility):
-        return facility.get_facility_flags()
+        return self.get_flags(facility)
 
     class Meta:
         model = Facility
+        list_serializer_class = FlagListSerializer
         fields = [
             "id",
             "name",
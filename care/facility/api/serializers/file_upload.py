@@ -4,7 +4,7 @@ from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
 from care.facility.api.serializers.shifting import has_facility_permission
-from care.facility.models.facility import Facility
+from care.facility.models.facility import Facility, FacilityUser
 from care.facility.models.file_upload import FileUpload
 from care.facility.models.notification import Notification
 from care.facility.models.patient import PatientRegistration
@@ -127,6 +127,158 @@ def check_permissions(file_type, associating_id, user, action="create"):  # noqa
         raise serializers.ValidationError({"permission": "denied"}) from e
 
 
+class FacilityAccess:
+    """
+    Set based equivalent of has_facility_permission, the facilities the user
+    is a member of are fetched once and reused for every facility checked
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._member_facility_ids = None
+
+    @property
+    def member_facility_ids(self) -> set[int]:
+        if self._member_facility_ids is None:
+            self._member_facility_ids = set(
+                FacilityUser.objects.filter(user=self.user).values_list(
+                    "facility_id", flat=True
+                )
+            )
+        return self._member_facility_ids
+
+    def has_permission(self, facility) -> bool:
+        if not facility:
+            return False
+        user = self.user
+        return (
+            user.is_superuser
+            or (
+                user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]
+                and user.district_id == facility.district_id
+            )
+            or (
+                user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]
+                and user.state_id == facility.state_id
+            )
+            or facility.id in self.member_facility_ids
+        )
+
+
+def check_read_permissions(file_type, associating_ids, user):  # noqa: PLR0912
+    """
+    Resolves read permissions for several associating ids of the same file type
+    at once, returns the internal ids to filter files by.
+
+    Follows the same rules as check_permissions(..., action="read") and raises
+    if access to any of the requested ids is denied.
+    """
+    associating_ids = set(associating_ids)
+    access = FacilityAccess(user)
+    allowed = []
+    try:
+        if file_type == FileUpload.FileType.PATIENT.value:
+            patients = PatientRegistration.objects.filter(
+                external_id__in=associating_ids
+            ).select_related("facility", "last_consultation")
+            for patient in patients:
+                if not patient.is_active:
+                    raise serializers.ValidationError(
+                        {"patient": "Cannot upload file for a discharged patient."}
+                    )
+                if not (
+                    user.id == patient.assigned_to_id
+                    or (
+                        patient.last_consultation
+                        and user.id == patient.last_consultation.assigned_to_id
+                    )
+                    or access.has_permission(patient.facility)
+                ):
+                    msg = "No Permission"
+                    raise Exception(msg)
+                allowed.append((patient.external_id, patient.id))
+        elif file_type in (
+            FileUpload.FileType.CONSULTATION.value,
+            FileUpload.FileType.DISCHARGE_SUMMARY.value,
+        ):
+            consultations = PatientConsultation.objects.filter(
+                external_id__in=associating_ids
+            ).select_related("patient__facility", "facility")
+            for consultation in consultations:
+                if not (
+                    user.id
+                    in (
+                        consultation.patient.assigned_to_id,
+                        consultation.assigned_to_id,
+                    )
+                    or access.has_permission(consultation.patient.facility)
+                    or access.has_permission(consultation.facility)
+                ):
+                    msg = "No Permission"
+                    raise Exception(msg)
+                allowed.append(
+                    (
+                        consultation.external_id,
+                        consultation.external_id
+                        if file_type == FileUpload.FileType.DISCHARGE_SUMMARY.value
+                        else consultation.id,
+                    )
+                )
+        elif file_type == FileUpload.FileType.CONSENT_RECORD.value:
+            consents = PatientConsent.objects.filter(
+                external_id__in=associating_ids
+            ).select_related(
+                "consultation__patient__facility", "consultation__facility"
+            )
+            for consent in consents:
+                consultation = consent.consultation
+                if not (
+                    user.id
+                    in (
+                        consultation.assigned_to_id,
+                        consultation.patient.assigned_to_id,
+                    )
+                    or access.has_permission(consultation.facility)
+                    or access.has_permission(consultation.patient.facility)
+                ):
+                    msg = "No Permission"
+                    raise Exception(msg)
+                allowed.append((consent.external_id, str(consent.external_id)))
+        elif file_type == FileUpload.FileType.SAMPLE_MANAGEMENT.value:
+            samples = PatientSample.objects.filter(
+                external_id__in=associating_ids
+            ).select_related("patient__facility", "consultation", "testing_facility")
+            for sample in samples:
+                if not (
+                    user.id == sample.patient.assigned_to_id
+                    or (
+                        sample.consultation
+                        and user.id == sample.consultation.assigned_to_id
+                    )
+                    or access.has_permission(sample.testing_facility)
+                    or access.has_permission(sample.patient.facility)
+                ):
+                    msg = "No Permission"
+                    raise Exception(msg)
+                allowed.append((sample.external_id, sample.id))
+        elif file_type in (
+            FileUpload.FileType.CLAIM.value,
+            FileUpload.FileType.COMMUNICATION.value,
+        ):
+            return list(associating_ids)
+        else:
+            msg = "Undefined File Type"
+            raise Exception(msg)
+
+        if len(allowed) != len(associating_ids):
+            msg = "Associating object not found"
+            raise Exception(msg)
+        return [internal_id for _, internal_id in allowed]
+
+    except Exception as e:
+        raise serializers.ValidationError({"permission": "denied"}) from e
+
+
 class FileUploadCreateSerializer(serializers.ModelSerializer):
     id = serializers.UUIDField(source="external_id", read_only=True)
     file_type = ChoiceField(choices=FileUpload.FileTypeChoices)
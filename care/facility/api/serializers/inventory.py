@@ -1,8 +1,5 @@
-from datetime import timedelta
-
 from django.db import IntegrityError, transaction
-from django.db.models import F, Sum
-from django.utils import timezone
+from django.db.models import F
 from rest_framework import serializers
 
 from care.facility.models import (
@@ -15,6 +12,7 @@ from care.facility.models import (
     FacilityInventoryUnit,
     FacilityInventoryUnitConverter,
 )
+from care.facility.utils.inventory.rollup import get_burn_rates, record_inventory_log
 
 
 class FacilityInventoryItemTagSerializer(serializers.ModelSerializer):
@@ -127,6 +125,7 @@ class FacilityInventoryLogSerializer(serializers.ModelSerializer):
 
         instance = super().create(validated_data)
         summary_obj.save()
+        record_inventory_log(instance)
 
         if not validated_data["is_incoming"]:
             self.set_burn_rate(facility, item)
@@ -138,23 +137,12 @@ class FacilityInventoryLogSerializer(serializers.ModelSerializer):
 
 
 def set_burn_rate(facility, item):
-    yesterday = timezone.now() - timedelta(days=1)
-
-    previous_usage_log_sum = FacilityInventoryLog.objects.filter(
-        probable_accident=False,
-        facility=facility,
-        item=item,
-        is_incoming=False,
-        created_date__gte=yesterday,
-    ).aggregate(Sum("quantity_in_default_unit"))
-
-    if previous_usage_log_sum:
-        burn_rate = 0
-        if previous_usage_log_sum["quantity_in_default_unit__sum"]:
-            burn_rate = previous_usage_log_sum["quantity_in_default_unit__sum"] / 24
-        FacilityInventoryBurnRate.objects.update_or_create(
-            facility=facility, item=item, defaults={"burn_rate": burn_rate}
-        )
+    burn_rate = get_burn_rates(facility_id=facility.id, item_id=item.id).get(
+        (facility.id, item.id), 0
+    )
+    FacilityInventoryBurnRate.objects.update_or_create(
+        facility=facility, item=item, defaults={"burn_rate": burn_rate}
+    )
 
 
 class FacilityInventorySummarySerializer(serializers.ModelSerializer):
@@ -162,6 +150,10 @@ class FacilityInventorySummarySerializer(serializers.ModelSerializer):
 
     item_object = FacilityInventoryItemSerializer(source="item", read_only=True)
     unit_object = FacilityInventoryUnitSerializer(source="unit", read_only=True)
+    burn_rate = serializers.SerializerMethodField()
+    start_stock = serializers.SerializerMethodField()
+    total_added = serializers.SerializerMethodField()
+    total_consumed = serializers.SerializerMethodField()
 
     class Meta:
         model = FacilityInventorySummary
@@ -173,6 +165,24 @@ class FacilityInventorySummarySerializer(serializers.ModelSerializer):
             "facility",
         )
 
+    def get_rollup(self, obj):
+        return self.context.get("rollups", {}).get((obj.facility_id, obj.item_id))
+
+    def get_burn_rate(self, obj) -> float:
+        return self.context.get("burn_rates", {}).get((obj.facility_id, obj.item_id), 0)
+
+    def get_start_stock(self, obj) -> float:
+        rollup = self.get_rollup(obj)
+        return rollup.start_stock if rollup else obj.quantity
+
+    def get_total_added(self, obj) -> float:
+        rollup = self.get_rollup(obj)
+        return rollup.incoming if rollup else 0
+
+    def get_total_consumed(self, obj) -> float:
+        rollup = self.get_rollup(obj)
+        return rollup.outgoing if rollup else 0
+
 
 class FacilityInventoryMinQuantitySerializer(serializers.ModelSerializer):
     id = serializers.UUIDField(source="external_id", read_only=True)
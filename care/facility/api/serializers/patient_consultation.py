@@ -3,6 +3,7 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch, prefetch_related_objects
 from django.utils import timezone
 from django.utils.timezone import localtime, make_aware, now
 from rest_framework import serializers
@@ -58,12 +59,12 @@ from care.facility.models.patient_consultation import (
     PatientConsent,
     PatientConsultation,
 )
+from care.facility.tasks.consultation_events import create_consultation_events_task
 from care.users.api.serializers.user import (
     UserAssignedSerializer,
     UserBaseMinimumSerializer,
 )
 from care.users.models import User
-from care.utils.lock import Lock
 from care.utils.notification_handler import NotificationGenerator
 from care.utils.queryset.facility import get_home_facility_queryset
 from care.utils.serializers.fields import ChoiceField, ExternalIdSerializerField
@@ -190,9 +191,6 @@ class PatientConsultationSerializer(serializers.ModelSerializer):
             dosage_type=PrescriptionDosageType.PRN.value,
         ).values()
 
-    def _lock_key(self, patient_id):
-        return f"patient_consultation__patient_registration__{patient_id}"
-
     class Meta:
         model = PatientConsultation
         read_only_fields = (
@@ -361,26 +359,35 @@ class PatientConsultationSerializer(serializers.ModelSerializer):
         action = validated_data.pop("action", -1)
         review_interval = validated_data.get("review_interval", -1)
 
-        # Authorisation Check
-
         user = self.context["request"].user
-        allowed_facilities = get_home_facility_queryset(user)
-        if not allowed_facilities.filter(
-            id=self.validated_data["patient"].facility_id
-        ).exists():
-            raise ValidationError(
-                {"facility": "Consultation creates are only allowed in home facility"}
+
+        with transaction.atomic():
+            # the patient row stays locked until the consultation commits, and
+            # is loaded along with its last consultation and whether it is in
+            # a facility the user can create consultations in
+            patient = (
+                PatientRegistration.objects.select_for_update(of=("self",))
+                .select_related("facility", "last_consultation")
+                .annotate(
+                    in_home_facility=Exists(
+                        get_home_facility_queryset(user).filter(
+                            id=OuterRef("facility_id")
+                        )
+                    )
+                )
+                .get(id=validated_data["patient"].id)
             )
+            validated_data["patient"] = patient
 
-        # End Authorisation Checks
+            if not patient.in_home_facility:
+                raise ValidationError(
+                    {
+                        "facility": "Consultation creates are only allowed in home facility"
+                    }
+                )
 
-        with (
-            Lock(self._lock_key(validated_data["patient"].id)),
-            transaction.atomic(),
-        ):
-            patient = validated_data["patient"]
             if patient.last_consultation:
-                if patient.last_consultation.assigned_to == user:
+                if patient.last_consultation.assigned_to_id == user.id:
                     raise ValidationError(
                         {
                             "Permission Denied": "Only Facility Staff can create consultation for a Patient"
@@ -469,32 +476,58 @@ class PatientConsultationSerializer(serializers.ModelSerializer):
             consultation.save()
             patient.save()
 
-            create_consultation_events(
-                consultation.id,
-                (consultation, *diagnosis, *symptoms),
-                consultation.created_by.id,
-                consultation.created_date,
+            # events and notifications are created by workers once the
+            # consultation is committed, instead of before responding
+            event_objects = [
+                (obj._meta.label, obj.id)  # noqa: SLF001
+                for obj in (consultation, *diagnosis, *symptoms)
+            ]
+            transaction.on_commit(
+                lambda: create_consultation_events_task.delay(
+                    consultation.id,
+                    event_objects,
+                    user.id,
+                    consultation.created_date.isoformat(),
+                )
             )
 
-            NotificationGenerator(
-                event=Notification.Event.PATIENT_CONSULTATION_CREATED,
-                caused_by=user,
-                caused_object=consultation,
-                facility=patient.facility,
-            ).generate()
-
-            if consultation.assigned_to:
+            def notify():
                 NotificationGenerator(
-                    event=Notification.Event.PATIENT_CONSULTATION_ASSIGNMENT,
+                    event=Notification.Event.PATIENT_CONSULTATION_CREATED,
                     caused_by=user,
                     caused_object=consultation,
-                    facility=consultation.patient.facility,
-                    notification_mediums=[
-                        Notification.Medium.SYSTEM,
-                        Notification.Medium.WHATSAPP,
-                    ],
+                    facility=patient.facility,
                 ).generate()
 
+                if consultation.assigned_to:
+                    NotificationGenerator(
+                        event=Notification.Event.PATIENT_CONSULTATION_ASSIGNMENT,
+                        caused_by=user,
+                        caused_object=consultation,
+                        facility=patient.facility,
+                        notification_mediums=[
+                            Notification.Medium.SYSTEM,
+                            Notification.Medium.WHATSAPP,
+                        ],
+                    ).generate()
+
+            transaction.on_commit(notify)
+
+            # the response lists the diagnoses and symptoms with their authors
+            prefetch_related_objects(
+                [consultation],
+                Prefetch(
+                    "diagnoses",
+                    queryset=ConsultationDiagnosis.objects.select_related("created_by"),
+                ),
+                Prefetch(
+                    "symptoms",
+                    queryset=EncounterSymptom.objects.select_related(
+                        "created_by", "updated_by"
+                    ),
+                ),
+            )
+
             return consultation
 
     def validate_create_diagnoses(self, value):
@@ -11,7 +11,74 @@ from care.users.api.serializers.lsg import (
 from care.users.models import REVERSE_LOCAL_BODY_CHOICES, District, LocalBody, Ward
 
 
+class GeographyLookup:
+    """
+    Resolves the district, local body and ward names of external test uploads.
+
+    Local bodies and wards of a district are loaded once and matched in
+    memory, so validating many rows of an upload does not query per row.
+    """
+
+    def __init__(self):
+        self._districts = {}
+        self._local_bodies = {}
+        self._local_body_matches = {}
+        self._wards = {}
+
+    def get_district(self, name: str):
+        key = name.lower()
+        if key not in self._districts:
+            self._districts[key] = District.objects.filter(name__icontains=name).first()
+        return self._districts[key]
+
+    def get_local_body(self, district: District, name: str, body_type: int):
+        if district.id not in self._local_bodies:
+            self._local_bodies[district.id] = list(
+                LocalBody.objects.filter(district=district).order_by("id")
+            )
+        key = (district.id, body_type, name.lower())
+        if key not in self._local_body_matches:
+            self._local_body_matches[key] = next(
+                (
+                    local_body
+                    for local_body in self._local_bodies[district.id]
+                    if local_body.body_type == body_type
+                    and key[2] in local_body.name.lower()
+                ),
+                None,
+            )
+        return self._local_body_matches[key]
+
+    def get_ward(self, local_body: LocalBody, number: int):
+        district_id = local_body.district_id
+        if district_id not in self._wards:
+            wards = {}
+            for ward in Ward.objects.filter(
+                local_body__district_id=district_id
+            ).order_by("-id"):
+                wards[(ward.local_body_id, ward.number)] = ward
+            self._wards[district_id] = wards
+        return self._wards[district_id].get((local_body.id, number))
+
+
+class ResolvedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Accepts model instances resolved during validation as is, instead of
+    fetching them again by primary key
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, self.get_queryset().model):
+            return data
+        return super().to_internal_value(data)
+
+
 class PatientExternalTestSerializer(serializers.ModelSerializer):
+    district = ResolvedPrimaryKeyRelatedField(queryset=District.objects.all())
+    local_body = ResolvedPrimaryKeyRelatedField(queryset=LocalBody.objects.all())
+    ward = ResolvedPrimaryKeyRelatedField(
+        queryset=Ward.objects.all(), required=False, allow_null=True
+    )
     ward_object = WardSerializer(source="ward", read_only=True)
     local_body_object = LocalBodySerializer(source="local_body", read_only=True)
     district_object = DistrictSerializer(source="district", read_only=True)
@@ -24,12 +91,13 @@ class PatientExternalTestSerializer(serializers.ModelSerializer):
     result_date = serializers.DateField(input_formats=["%Y-%m-%d"], required=False)
 
     def validate_empty_values(self, data, *args, **kwargs):  # noqa: PLR0912
+        geography = self.context.get("geography") or GeographyLookup()
         district_obj = None
         if "district" in data:
             district = data["district"]
-            district_obj = District.objects.filter(name__icontains=district).first()
+            district_obj = geography.get_district(district)
             if district_obj:
-                data["district"] = district_obj.id
+                data["district"] = district_obj
             else:
                 raise ValidationError({"district": ["District Does not Exist"]})
         else:
@@ -55,13 +123,11 @@ class PatientExternalTestSerializer(serializers.ModelSerializer):
             if not data["local_body"]:
                 raise ValidationError({"local_body": ["Local Body Cannot Be Empty"]})
             local_body = data["local_body"]
-            local_body_obj = LocalBody.objects.filter(
-                name__icontains=local_body,
-                district=district_obj,
-                body_type=local_body_type,
-            ).first()
+            local_body_obj = geography.get_local_body(
+                district_obj, local_body, local_body_type
+            )
             if local_body_obj:
-                data["local_body"] = local_body_obj.id
+                data["local_body"] = local_body_obj
             else:
                 raise ValidationError({"local_body": ["Local Body Does not Exist"]})
         else:
@@ -75,11 +141,9 @@ class PatientExternalTestSerializer(serializers.ModelSerializer):
                     {"ward": ["Ward must be an integer value"]}
                 ) from e
             if data["ward"]:
-                ward_obj = Ward.objects.filter(
-                    number=data["ward"], local_body=local_body_obj
-                ).first()
+                ward_obj = geography.get_ward(local_body_obj, int(data["ward"]))
                 if ward_obj:
-                    data["ward"] = ward_obj.id
+                    data["ward"] = ward_obj
                 else:
                     raise ValidationError({"ward": ["Ward Does not Exist"]})
 
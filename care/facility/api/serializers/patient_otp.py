@@ -1,13 +1,12 @@
 import secrets
 import string
-from datetime import timedelta
 
 from django.conf import settings
-from django.utils.timezone import localtime, now
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
 from care.facility.models.patient import PatientMobileOTP
+from care.facility.utils.patient_otp import get_client_ip, get_otp_store
 from care.utils.sms.send_sms import send_sms
 
 
@@ -26,34 +25,25 @@ class PatientMobileOTPSerializer(serializers.ModelSerializer):
         fields = ("phone_number",)
 
     def create(self, validated_data):
-        # Filter to only allow n sms per phone number per 6 hour
-
-        sent_otps = PatientMobileOTP.objects.filter(
-            created_date__gte=(
-                localtime(now()) - timedelta(settings.OTP_REPEAT_WINDOW)
-            ),
-            is_used=False,
-            phone_number=validated_data["phone_number"],
-        )
-
-        if sent_otps.count() >= settings.OTP_MAX_REPEATS_WINDOW:
+        # only allow n sms per phone number (and client ip) per 6 hours
+        phone_number = validated_data["phone_number"]
+        store = get_otp_store()
+        client_ip = get_client_ip(self.context["request"])
+        if store.get_rate_limited_scope(phone_number, client_ip):
             raise ValidationError({"phone_number": "Max Retries has exceeded"})
 
-        otp_obj = super().create(validated_data)
         otp = rand_pass(settings.OTP_LENGTH)
+        store.save(phone_number, otp)
 
         if settings.USE_SMS:
             send_sms(
-                otp_obj.phone_number,
+                phone_number,
                 (
                     f"Open Healthcare Network Patient Management System Login, OTP is {otp} . "
                     "Please do not share this Confidential Login Token with anyone else"
                 ),
             )
         elif settings.DEBUG:
-            print(otp, otp_obj.phone_number)  # noqa: T201
-
-        otp_obj.otp = otp
-        otp_obj.save()
+            print(otp, phone_number)  # noqa: T201
 
-        return otp_obj
+        return PatientMobileOTP(phone_number=phone_number)
@@ -1,12 +1,11 @@
 import logging
 import re
+from datetime import timedelta
 from typing import TYPE_CHECKING
 
 from django.conf import settings
 from django.core.cache import cache
-from django.db.models import CharField, Exists, F, OuterRef, Q, Subquery, Value
-from django.db.models.fields.json import KT
-from django.db.models.functions import Coalesce, NullIf
+from django.db.models import Exists, OuterRef, Q, Subquery
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.http import Http404
@@ -41,6 +40,8 @@ from care.facility.api.serializers.asset import (
     AssetServiceSerializer,
     AssetTransactionSerializer,
     AvailabilityRecordSerializer,
+    AvailabilityStatusChangeSerializer,
+    AvailabilityUptimeQuerySerializer,
     DummyAssetOperateResponseSerializer,
     DummyAssetOperateSerializer,
     UserDefaultAssetLocationSerializer,
@@ -56,14 +57,19 @@ from care.facility.models import (
 from care.facility.models.asset import (
     AssetTypeChoices,
     AvailabilityRecord,
+    LatestAvailabilityRecord,
     StatusChoices,
 )
 from care.facility.models.bed import AssetBed, ConsultationBed
+from care.facility.tasks.push_asset_config import get_asset_config_tag
+from care.facility.utils.availability.history import get_status_changes, get_uptime
 from care.users.models import User
 from care.utils.assetintegration.asset_classes import AssetClasses
 from care.utils.assetintegration.base import BaseAssetIntegration
 from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
+from care.utils.cache.response import cache_response
 from care.utils.filters.choicefilter import CareChoiceFilter, inverse_choices
+from care.utils.queryset.asset import get_middleware_asset_queryset
 from care.utils.queryset.asset_bed import get_asset_queryset
 from care.utils.queryset.asset_location import get_asset_location_queryset
 from care.utils.queryset.facility import get_facility_queryset
@@ -293,6 +299,40 @@ class AvailabilityViewSet(ListModelMixin, RetrieveModelMixin, GenericViewSet):
         msg = "Either asset_external_id or asset_location_external_id is required"
         raise exceptions.ValidationError(msg)
 
+    @extend_schema(responses=AvailabilityStatusChangeSerializer(many=True))
+    def list(self, request, *args, **kwargs):
+        """
+        Lists the status changes of the asset or location, newest first,
+        including the ones older than AVAILABILITY_COMPACTION_DAYS that were
+        compacted into intervals
+        """
+        # checks access to the asset or location
+        self.get_queryset()
+        if "asset_external_id" in self.kwargs:
+            changes = get_status_changes("asset", self.kwargs["asset_external_id"])
+        else:
+            changes = get_status_changes(
+                "assetlocation", self.kwargs["asset_location_external_id"]
+            )
+        page = self.paginate_queryset(changes)
+        return self.get_paginated_response(
+            AvailabilityStatusChangeSerializer(page, many=True).data
+        )
+
+    @extend_schema(tags=["asset"], parameters=[AvailabilityUptimeQuerySerializer])
+    @action(methods=["GET"], detail=False)
+    def uptime(self, request, *args, **kwargs):
+        # checks access to the asset or location
+        self.get_queryset()
+        query = AvailabilityUptimeQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        end = query.validated_data.get("end") or timezone.now()
+        start = query.validated_data.get("start") or end - timedelta(days=7)
+        external_id = self.kwargs.get("asset_external_id") or self.kwargs.get(
+            "asset_location_external_id"
+        )
+        return Response(get_uptime(external_id, start, end))
+
 
 class AssetViewSet(
     ListModelMixin,
@@ -318,12 +358,9 @@ class AssetViewSet(
         queryset = get_asset_queryset(user=self.request.user, queryset=self.queryset)
         return queryset.annotate(
             latest_status=Subquery(
-                AvailabilityRecord.objects.filter(
-                    content_type__model="asset",
+                LatestAvailabilityRecord.objects.filter(
                     object_external_id=OuterRef("external_id"),
-                )
-                .order_by("-created_date")
-                .values("status")[:1]
+                ).values("status")[:1]
             )
         )
 
@@ -433,6 +470,21 @@ class AssetViewSet(
             )
 
 
+def parse_middleware_hostname(value: str | None) -> str | None:
+    if value and (match := re.match(r"^(https?://)?([^\s/]+)/?$", value)):
+        return match.group(2)  # extract the hostname from the URL
+    return None
+
+
+def get_asset_config_tags(view) -> list[str]:
+    hostname = parse_middleware_hostname(
+        view.request.query_params.get("middleware_hostname")
+    )
+    if hostname is None:
+        return []
+    return [get_asset_config_tag(view.request.user.facility.id, hostname)]
+
+
 class AssetRetrieveConfigViewSet(ListModelMixin, GenericViewSet):
     queryset = Asset.objects.all()
     authentication_classes = [MiddlewareAuthentication]
@@ -447,10 +499,13 @@ class AssetRetrieveConfigViewSet(ListModelMixin, GenericViewSet):
             )
         ],
     )
+    @cache_response(60 * 60, tags=get_asset_config_tags)
     def list(self, request, *args, **kwargs):
         """
         This API is used by the middleware to retrieve assets and their configurations
-        for a given facility and middleware hostname.
+        for a given facility and middleware hostname. Responses carry an ETag and
+        requests with it as If-None-Match are answered with a 304 until the
+        configuration changes.
         """
         middleware_hostname = request.query_params.get("middleware_hostname")
         if not middleware_hostname:
@@ -459,37 +514,16 @@ class AssetRetrieveConfigViewSet(ListModelMixin, GenericViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if match := re.match(r"^(https?://)?([^\s/]+)/?$", middleware_hostname):
-            middleware_hostname = match.group(2)  # extract the hostname from the URL
-        else:
+        middleware_hostname = parse_middleware_hostname(middleware_hostname)
+        if middleware_hostname is None:
             return Response(
                 {"middleware_hostname": "Invalid middleware hostname"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        queryset = (
-            self.get_queryset()
-            .filter(
-                current_location__facility=self.request.user.facility,
-                asset_class__in=[
-                    AssetClasses.ONVIF.name,
-                    AssetClasses.HL7MONITOR.name,
-                ],
-            )
-            .annotate(
-                resolved_middleware_hostname=Coalesce(
-                    NullIf(KT("meta__middleware_hostname"), Value("")),
-                    NullIf(F("current_location__middleware_address"), Value("")),
-                    F("current_location__facility__middleware_address"),
-                    output_field=CharField(),
-                )
-            )
-            .filter(resolved_middleware_hostname=middleware_hostname)
-            .exclude(
-                Q(meta__local_ip_address__isnull=True)
-                | Q(meta__local_ip_address__exact=""),
-            )
-        ).only("external_id", "meta", "description", "name", "asset_class")
+        queryset = get_middleware_asset_queryset(
+            middleware_hostname, facility=self.request.user.facility
+        )
 
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
@@ -1,6 +1,4 @@
 from django.shortcuts import get_object_or_404
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django_filters import rest_framework as filters
 from drf_spectacular.utils import extend_schema
 from rest_framework.decorators import action
@@ -13,7 +11,9 @@ from care.facility.api.serializers.events import (
     NestedEventTypeSerializer,
     PatientConsultationEventDetailSerializer,
 )
+from care.facility.events.tree import get_event_type_tree
 from care.facility.models.events import EventType, PatientConsultationEvent
+from care.utils.cache.response import cache_response, model_tag
 from care.utils.queryset.consultation import get_consultation_queryset
 
 
@@ -27,17 +27,17 @@ class EventTypeViewSet(ReadOnlyModelViewSet):
         return super().get_serializer_class()
 
     @extend_schema(tags=("event_types",))
-    @method_decorator(cache_page(86400))
     @action(detail=True, methods=["GET"])
+    @cache_response(86400, tags=[model_tag(EventType)])
     def descendants(self, request, pk=None):
         event_type: EventType = get_object_or_404(self.queryset, pk=pk)
-        queryset = self.get_queryset().filter(pk__in=event_type.get_descendants())
+        queryset = event_type.get_descendants().filter(is_active=True)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
     @extend_schema(tags=("event_types",))
-    @method_decorator(cache_page(86400))
     @action(detail=False, methods=["GET"])
+    @cache_response(86400, tags=[model_tag(EventType)])
     def roots(self, request):
         queryset = self.get_queryset().filter(parent__isnull=True)
         serializer = self.get_serializer(queryset, many=True)
@@ -51,6 +51,7 @@ class PatientConsultationEventFilterSet(filters.FilterSet):
             "taken_at",
         )
     )
+    event_type_subtree = filters.NumberFilter(method="filter_event_type_subtree")
 
     class Meta:
         model = PatientConsultationEvent
@@ -60,6 +61,14 @@ class PatientConsultationEventFilterSet(filters.FilterSet):
             "is_latest",
         ]
 
+    def filter_event_type_subtree(self, queryset, name, value):
+        """
+        Filters the events of an event type or of any of its descendants
+        """
+        return queryset.filter(
+            event_type_id__in=get_event_type_tree().get_subtree_ids(int(value))
+        )
+
 
 class PatientConsultationEventViewSet(ReadOnlyModelViewSet):
     serializer_class = PatientConsultationEventDetailSerializer
@@ -15,7 +15,7 @@ from care.facility.api.serializers.file_upload import (
     FileUploadListSerializer,
     FileUploadRetrieveSerializer,
     FileUploadUpdateSerializer,
-    check_permissions,
+    check_read_permissions,
 )
 from care.facility.models.file_upload import FileUpload
 from care.users.models import User
@@ -86,13 +86,9 @@ class FileUploadViewSet(
             raise ValidationError({"file_type": "invalid file type"})
         file_type = FileUpload.FileType[file_type].value
 
-        associating_internal_ids = []
-
-        for associating_id in associating_ids:
-            associating_internal_id = check_permissions(
-                file_type, associating_id, self.request.user, "read"
-            )
-            associating_internal_ids.append(associating_internal_id)
+        associating_internal_ids = check_read_permissions(
+            file_type, associating_ids, self.request.user
+        )
 
         return self.queryset.filter(
             file_type=file_type, associating_id__in=associating_internal_ids
@@ -31,6 +31,11 @@ from care.facility.models import (
     FacilityInventoryMinQuantity,
     FacilityInventorySummary,
 )
+from care.facility.utils.inventory.rollup import (
+    get_burn_rates,
+    get_daily_rollups,
+    record_inventory_log_flag,
+)
 from care.users.models import User
 from care.utils.queryset.facility import get_facility_queryset
 
@@ -120,9 +125,11 @@ class FacilityInventoryLogViewSet(
         log_obj = get_object_or_404(
             self.get_queryset(), external_id=self.kwargs.get("external_id")
         )
-        log_obj.probable_accident = not log_obj.probable_accident
-        log_obj.save()
-        set_burn_rate(log_obj.facility, log_obj.item)
+        with transaction.atomic():
+            log_obj.probable_accident = not log_obj.probable_accident
+            log_obj.save()
+            record_inventory_log_flag(log_obj)
+            set_burn_rate(log_obj.facility, log_obj.item)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @extend_schema(tags=["inventory"])
@@ -146,8 +153,10 @@ class FacilityInventoryLogViewSet(
             serializer = self.get_serializer(data=data)
             serializer.is_valid(raise_exception=True)
             serializer.save(facility=facility, probable_accident=True)
-            inventory_log_object.probable_accident = True
-            inventory_log_object.save()
+            if not inventory_log_object.probable_accident:
+                inventory_log_object.probable_accident = True
+                inventory_log_object.save()
+                record_inventory_log_flag(inventory_log_object)
             serializer.set_burn_rate(facility, item_obj)
         return Response(status=status.HTTP_201_CREATED)
 
@@ -235,3 +244,12 @@ class FacilityInventorySummaryViewSet(
         return get_object_or_404(
             self.get_queryset(), external_id=self.kwargs.get("external_id")
         )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        facility_filter = {
+            "facility__external_id": self.kwargs.get("facility_external_id")
+        }
+        context["rollups"] = get_daily_rollups(**facility_filter)
+        context["burn_rates"] = get_burn_rates(**facility_filter)
+        return context
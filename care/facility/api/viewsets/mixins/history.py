@@ -1,14 +1,24 @@
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 
 from care.utils.serializers.history_serializer import ModelHistorySerializer
 
 
+class HistoryPagination(CursorPagination):
+    # keyset pagination on the partition key of the history tables, pages
+    # only read the partitions they span however far back they are
+    ordering = ("-history_date", "-history_id")
+
+
 class HistoryMixin:
+    history_pagination_class = HistoryPagination
+
     @action(detail=True, methods=["get"])
     def history(self, request, *args, **kwargs):
         obj = self.get_object()
-        page = self.paginate_queryset(obj.history.all())
+        paginator = self.history_pagination_class()
+        page = paginator.paginate_queryset(obj.history.all(), request, view=self)
         model = obj.history.__dict__["model"]
         serializer = ModelHistorySerializer(model, page, many=True)
         serializer.is_valid()
-        return self.get_paginated_response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
@@ -3,7 +3,7 @@ from json import JSONDecodeError
 
 from django.conf import settings
 from django.contrib.postgres.search import TrigramSimilarity
-from django.db import models
+from django.db import models, transaction
 from django.db.models import (
     Case,
     ExpressionWrapper,
@@ -50,7 +50,10 @@ from care.facility.api.serializers.patient import (
 )
 from care.facility.api.serializers.patient_icmr import PatientICMRSerializer
 from care.facility.api.viewsets.mixins.history import HistoryMixin
-from care.facility.events.handler import create_consultation_events
+from care.facility.api.viewsets.patient_notes_feed import (
+    annotate_last_edit,
+    publish_note,
+)
 from care.facility.models import (
     CATEGORY_CHOICES,
     COVID_CATEGORY_CHOICES,
@@ -78,6 +81,7 @@ from care.facility.models.patient_base import (
     NewDischargeReasonEnum,
 )
 from care.facility.models.patient_consultation import PatientConsultation
+from care.facility.tasks.consultation_events import create_consultation_events_task
 from care.users.models import User
 from care.utils.cache.cache_allowed_facilities import get_accessible_facilities
 from care.utils.filters.choicefilter import CareChoiceFilter
@@ -998,17 +1002,10 @@ class PatientNotesViewSet(
     def get_queryset(self):
         user = self.request.user
 
-        last_edit_subquery = PatientNotesEdit.objects.filter(
-            patient_note=OuterRef("pk")
-        ).order_by("-edited_date")
-
-        queryset = self.queryset.filter(
-            patient__external_id=self.kwargs.get("patient_external_id")
-        ).annotate(
-            last_edited_by=Subquery(
-                last_edit_subquery.values("edited_by__username")[:1]
-            ),
-            last_edited_date=Subquery(last_edit_subquery.values("edited_date")[:1]),
+        queryset = annotate_last_edit(
+            self.queryset.filter(
+                patient__external_id=self.kwargs.get("patient_external_id")
+            )
         )
 
         if user.is_superuser:
@@ -1045,35 +1042,46 @@ class PatientNotesViewSet(
             created_by=self.request.user,
         )
 
-        create_consultation_events(
-            instance.consultation_id,
-            instance,
-            self.request.user.id,
-            instance.created_date,
-        )
+        publish_note(patient, instance, serializer.data)
 
-        message = {
-            "facility_id": str(patient.facility.external_id),
-            "patient_id": str(patient.external_id),
-            "from": "patient/doctor_notes/create",
-        }
+        # events and notifications are created by workers once the note is
+        # committed, instead of before responding
+        user = self.request.user
+        if instance.consultation_id:
+            transaction.on_commit(
+                lambda: create_consultation_events_task.delay(
+                    instance.consultation_id,
+                    [(instance._meta.label, instance.id)],  # noqa: SLF001
+                    user.id,
+                    instance.created_date.isoformat(),
+                )
+            )
 
-        NotificationGenerator(
-            event=Notification.Event.PUSH_MESSAGE,
-            caused_by=self.request.user,
-            caused_object=instance,
-            message=message,
-            facility=patient.facility,
-            generate_for_facility=True,
-        ).generate()
+        def notify():
+            message = {
+                "facility_id": str(patient.facility.external_id),
+                "patient_id": str(patient.external_id),
+                "from": "patient/doctor_notes/create",
+            }
 
-        NotificationGenerator(
-            event=Notification.Event.PATIENT_NOTE_ADDED,
-            caused_by=self.request.user,
-            caused_object=instance,
-            facility=patient.facility,
-            generate_for_facility=True,
-        ).generate()
+            NotificationGenerator(
+                event=Notification.Event.PUSH_MESSAGE,
+                caused_by=user,
+                caused_object=instance,
+                message=message,
+                facility=patient.facility,
+                generate_for_facility=True,
+            ).generate()
+
+            NotificationGenerator(
+                event=Notification.Event.PATIENT_NOTE_ADDED,
+                caused_by=user,
+                caused_object=instance,
+                facility=patient.facility,
+                generate_for_facility=True,
+            ).generate()
+
+        transaction.on_commit(notify)
 
         return instance
 
@@ -1095,4 +1103,9 @@ class PatientNotesViewSet(
                 {"Note": "Only the user who created the note can edit it"}
             )
 
-        return super().perform_update(serializer)
+        modified_date = serializer.instance.modified_date
+        instance = serializer.save()
+        # unchanged notes are not saved
+        if instance.modified_date != modified_date:
+            publish_note(patient, instance, serializer.data)
+        return instance
@@ -1,4 +1,4 @@
-from collections import defaultdict
+from uuid import uuid4
 
 from django.conf import settings
 from django_filters import Filter
@@ -25,18 +25,17 @@ from care.facility.api.serializers.patient_external_test import (
     PatientExternalTestUpdateSerializer,
 )
 from care.facility.models import PatientExternalTest
+from care.facility.tasks.external_test import bulk_upsert_external_tests_task
+from care.facility.utils.external_tests.bulk_upsert import (
+    JobStatus,
+    create_external_tests,
+    get_job,
+    set_job,
+    validate_external_tests,
+)
 from care.users.models import User
 
 
-def pretty_errors(errors):
-    pretty_errors = defaultdict(list)
-    for attribute in PatientExternalTest.HEADER_CSV_MAPPING:
-        if attribute in errors:
-            for error in errors.get(attribute, ""):
-                pretty_errors[attribute].append(str(error))
-    return dict(pretty_errors)
-
-
 class MFilter(Filter):
     def filter(self, qs, value):
         if not value:
@@ -155,19 +154,40 @@ class PatientExternalTestViewSet(
             if str(request.user.district) != data["district"]:
                 raise ValidationError({"Error": "User must belong to same district"})
 
-        errors = []
-        ser_objects = []
-        invalid = False
-        for sample in request.data["sample_tests"]:
-            serializer = PatientExternalTestSerializer(data=sample)
-            valid = serializer.is_valid()
-            current_error = pretty_errors(serializer._errors)  # noqa: SLF001
-            if current_error and (not valid):
-                errors.append(current_error)
-                invalid = True
-            ser_objects.append(serializer)
-        if invalid:
-            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
-        for ser_object in ser_objects:
-            ser_object.save()
+        rows = request.data["sample_tests"]
+        if len(rows) > settings.EXTERNAL_TEST_BULK_UPSERT_ASYNC_THRESHOLD:
+            job_id = str(uuid4())
+            set_job(
+                job_id,
+                status=JobStatus.QUEUED.value,
+                user=request.user.id,
+                total=len(rows),
+                validated=0,
+                created=0,
+                errors=[],
+            )
+            bulk_upsert_external_tests_task.delay(job_id, rows)
+            return Response({"job_id": job_id}, status=status.HTTP_202_ACCEPTED)
+
+        validated, errors = validate_external_tests(rows)
+        if errors:
+            return Response(
+                [error["errors"] for error in errors],
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        create_external_tests(validated)
         return Response(status=status.HTTP_202_ACCEPTED)
+
+    @extend_schema(tags=["external_result"])
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path=r"bulk_upsert/(?P<job_id>[0-9a-f-]+)",
+    )
+    def bulk_upsert_status(self, request, job_id, *args, **kwargs):
+        job = get_job(job_id)
+        if not job or job["user"] != request.user.id:
+            return Response(
+                {"detail": "Upload not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({"job_id": job_id, **job})
@@ -3,6 +3,7 @@ import contextlib
 from django.db import transaction
 from django.db.models import F
 from django.db.models.query_utils import Q
+from django.utils.timezone import now
 from django_filters import Filter
 from django_filters import rest_framework as filters
 from drf_spectacular.utils import extend_schema
@@ -227,18 +228,51 @@ class InvestigationValueViewSet(
 
         queryset = queryset.filter(consultation=consultation)
 
+        for investigation in investigations:
+            if "external_id" not in investigation:
+                raise ValidationError({"external_id": "is required"})
+
+        objects = {
+            str(obj.external_id): obj
+            for obj in queryset.filter(
+                external_id__in=[i["external_id"] for i in investigations]
+            ).select_related("session")
+        }
+
+        if investigations and consultation.discharge_date:
+            raise ValidationError(
+                {"consultation": ["Discharged Consultation data cannot be updated"]}
+            )
+
+        updated_fields = set()
+        for investigation in investigations:
+            obj = objects.get(str(investigation["external_id"]))
+            if not obj:
+                raise ValidationError({investigation["external_id"]: "not found"})
+            serializer_obj = InvestigationValueSerializer(
+                instance=obj, data=investigation
+            )
+            serializer_obj.is_valid(raise_exception=True)
+            for field, value in serializer_obj.validated_data.items():
+                setattr(obj, field, value)
+                updated_fields.add(field)
+            obj.modified_date = now()
+
+        if not objects:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
         with transaction.atomic():
-            for investigation in investigations:
-                if "external_id" not in investigation:
-                    raise ValidationError({"external_id": "is required"})
-                obj = queryset.filter(external_id=investigation["external_id"]).first()
-                if not obj:
-                    raise ValidationError({investigation["external_id"]: "not found"})
-                serializer_obj = InvestigationValueSerializer(
-                    instance=obj, data=investigation
-                )
-                serializer_obj.is_valid(raise_exception=True)
-                serializer_obj.update(obj, investigation)
+            InvestigationValue.objects.bulk_update(
+                objects.values(), fields=[*updated_fields, "modified_date"]
+            )
+
+        NotificationGenerator(
+            event=Notification.Event.INVESTIGATION_UPDATED,
+            caused_by=request.user,
+            caused_object=next(iter(objects.values())).session,
+            facility=consultation.patient.facility,
+            extra_data={"consultation": consultation},
+        ).generate()
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -0,0 +1,233 @@
+import json
+from datetime import UTC, datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Max, OuterRef, Subquery
+from django.http import (
+    HttpResponse,
+    HttpResponseNotAllowed,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from care.facility.api.serializers.patient import PatientNotesSerializer
+from care.facility.models import PatientNotes, PatientRegistration
+from care.facility.models.patient import PatientNotesEdit, PatientNoteThreadChoices
+from care.utils.pubsub import get_broker
+from care.utils.queryset.patient import get_patient_notes_feed_queryset
+
+# notes replayed or returned to a long poll at once, clients catch up on the
+# rest with the cursor of the last one
+REPLAY_LIMIT = 100
+# milliseconds event sources wait before reconnecting with their last cursor
+RECONNECT_DELAY = 3000
+# cursor of a thread without notes
+EMPTY_CURSOR = datetime.min.replace(tzinfo=UTC).isoformat()
+
+
+def get_notes_channel(patient_external_id, thread: int) -> str:
+    return f"patient_notes:{patient_external_id}:{thread}"
+
+
+def annotate_last_edit(queryset):
+    last_edit_subquery = PatientNotesEdit.objects.filter(
+        patient_note=OuterRef("pk")
+    ).order_by("-edited_date")
+    return queryset.annotate(
+        last_edited_by=Subquery(last_edit_subquery.values("edited_by__username")[:1]),
+        last_edited_date=Subquery(last_edit_subquery.values("edited_date")[:1]),
+    )
+
+
+def publish_note(patient: PatientRegistration, note: PatientNotes, data: dict):
+    """
+    Publishes a note created or edited by a request to the feed of its
+    thread once the request commits. The cursor of a note is the time it was
+    last saved. A failure to publish is logged without failing the request,
+    subscribers catch up on the note when they reconnect.
+    """
+    channel = get_notes_channel(patient.external_id, note.thread)
+    message = {"cursor": note.modified_date.isoformat(), "data": data}
+    transaction.on_commit(lambda: get_broker().publish(channel, message), robust=True)
+
+
+def parse_cursor(value: str | None) -> datetime | None:
+    """
+    Parses a cursor given as a query parameter, a Last-Event-ID or an ETag
+    """
+    if not value:
+        return None
+    value = value.removeprefix("W/").strip('"')
+    cursor = parse_datetime(value)
+    if cursor is None or cursor.tzinfo is None:
+        msg = "Invalid cursor"
+        raise ValueError(msg)
+    return cursor
+
+
+def get_subscribed_patient(request, patient_external_id) -> PatientRegistration:
+    """
+    Authenticates the request like the API views do and returns the patient
+    if the user can read its notes. Feeds are only checked when opened.
+    """
+    request = Request(
+        request,
+        authenticators=[
+            authenticator()
+            for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        ],
+    )
+    if not request.user.is_authenticated:
+        raise NotAuthenticated
+    patient = (
+        get_patient_notes_feed_queryset(request.user)
+        .filter(external_id=patient_external_id)
+        .first()
+    )
+    if patient is None:
+        raise NotFound
+    return patient
+
+
+def get_notes_since(
+    patient: PatientRegistration, thread: int, since: datetime
+) -> list[dict]:
+    notes = annotate_last_edit(
+        PatientNotes.objects.filter(
+            patient=patient, thread=thread, modified_date__gt=since
+        ).select_related(
+            "facility",
+            "consultation",
+            "created_by",
+            "reply_to",
+            "reply_to__created_by",
+        )
+    ).order_by("modified_date", "id")[:REPLAY_LIMIT]
+    return [
+        {"cursor": note.modified_date.isoformat(), "data": data}
+        for note, data in zip(
+            notes, PatientNotesSerializer(notes, many=True).data, strict=True
+        )
+    ]
+
+
+def get_latest_cursor(patient: PatientRegistration, thread: int) -> str:
+    latest = PatientNotes.objects.filter(patient=patient, thread=thread).aggregate(
+        latest=Max("modified_date")
+    )["latest"]
+    return latest.isoformat() if latest else EMPTY_CURSOR
+
+
+def format_event(message: dict) -> str:
+    data = json.dumps(message["data"], cls=DjangoJSONEncoder)
+    return f"id: {message['cursor']}\nevent: note\ndata: {data}\n\n"
+
+
+async def stream_notes(patient, thread: int, since: datetime | None):
+    async with get_broker().subscribe(
+        get_notes_channel(patient.external_id, thread)
+    ) as subscription:
+        # subscribed before replaying, so that no note is missed in between
+        yield f"retry: {RECONNECT_DELAY}\n\n"
+        last = since
+        if since is not None:
+            for message in await sync_to_async(get_notes_since)(patient, thread, since):
+                last = parse_cursor(message["cursor"])
+                yield format_event(message)
+        while True:
+            # idle ticks only wait on the broker, without touching the database
+            message = await subscription.get(settings.PATIENT_NOTES_FEED_HEARTBEAT)
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            if last is not None and parse_cursor(message["cursor"]) <= last:
+                continue
+            yield format_event(message)
+
+
+async def long_poll_notes(
+    patient, thread: int, since: datetime | None, *, wait: bool = True
+):
+    async with get_broker().subscribe(
+        get_notes_channel(patient.external_id, thread)
+    ) as subscription:
+        if since is None:
+            cursor = await sync_to_async(get_latest_cursor)(patient, thread)
+            return JsonResponse({"results": []}, headers={"ETag": f'"{cursor}"'})
+        messages = await sync_to_async(get_notes_since)(patient, thread, since)
+        if (
+            not messages
+            and wait
+            and await subscription.get(settings.PATIENT_NOTES_LONG_POLL_TIMEOUT)
+        ):
+            messages = await sync_to_async(get_notes_since)(patient, thread, since)
+    if not messages:
+        return HttpResponse(status=304, headers={"ETag": f'"{since.isoformat()}"'})
+    return JsonResponse(
+        {"results": [message["data"] for message in messages]},
+        headers={"ETag": f'"{messages[-1]["cursor"]}"'},
+    )
+
+
+@transaction.non_atomic_requests
+async def patient_notes_feed(request, patient_external_id):  # noqa: PLR0911
+    """
+    Live feed of the notes of a patient thread (?thread=), meant to be served
+    by an ASGI worker. With `Accept: text/event-stream` it streams the notes
+    as server-sent events, replaying the ones saved after the Last-Event-ID
+    or ?since= cursor first. Otherwise it long-polls: the ETag of a response
+    is the cursor of the latest note, and a request with it as If-None-Match
+    waits up to PATIENT_NOTES_LONG_POLL_TIMEOUT seconds for newer notes
+    before answering 304.
+
+    A WSGI worker would be held by every open stream and waiting poll, so
+    under WSGI streams are refused with a 406 and polls answer at once.
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    try:
+        thread = PatientNoteThreadChoices(int(request.GET.get("thread", "")))
+    except ValueError:
+        return JsonResponse({"thread": ["Select a valid thread."]}, status=400)
+
+    stream = "text/event-stream" in request.headers.get("Accept", "")
+    asgi = isinstance(request, ASGIRequest)
+    if stream and not asgi:
+        return JsonResponse(
+            {
+                "detail": "Event streams are not served by this worker, long-poll instead."
+            },
+            status=406,
+        )
+    cursor_header = "Last-Event-ID" if stream else "If-None-Match"
+    try:
+        since = parse_cursor(
+            request.headers.get(cursor_header) or request.GET.get("since")
+        )
+    except ValueError:
+        return JsonResponse({"since": ["Invalid cursor."]}, status=400)
+
+    try:
+        patient = await sync_to_async(get_subscribed_patient)(
+            request, patient_external_id
+        )
+    except APIException as e:
+        return JsonResponse({"detail": e.detail}, status=e.status_code)
+
+    if not stream:
+        return await long_poll_notes(patient, thread, since, wait=asgi)
+    response = StreamingHttpResponse(
+        stream_notes(patient, thread, since), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # keeps proxies from buffering the events
+    response["X-Accel-Buffering"] = "no"
+    return response
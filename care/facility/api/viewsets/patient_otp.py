@@ -8,6 +8,7 @@ from rest_framework.viewsets import GenericViewSet
 
 from care.facility.api.serializers.patient_otp import PatientMobileOTPSerializer
 from care.facility.models.patient import PatientMobileOTP
+from care.facility.utils.patient_otp import get_otp_store
 from care.utils.models.validators import mobile_validator
 from config.patient_otp_token import PatientToken
 
@@ -39,16 +40,9 @@ class PatientMobileOTPViewSet(
         if len(otp) != settings.OTP_LENGTH:
             raise ValidationError({"otp": "Invalid OTP"})
 
-        otp_object = PatientMobileOTP.objects.filter(
-            phone_number=phone_number, otp=otp, is_used=False
-        ).first()
-
-        if not otp_object:
+        if not get_otp_store().verify(phone_number, otp):
             raise ValidationError({"otp": "Invalid OTP"})
 
-        otp_object.is_used = True
-        otp_object.save()
-
         token = PatientToken()
         token["phone_number"] = phone_number
 
@@ -1,5 +1,3 @@
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django_filters import rest_framework as filters
 from drf_spectacular.utils import extend_schema
 from rest_framework.mixins import ListModelMixin
@@ -11,6 +9,7 @@ from care.facility.api.serializers.summary import (
     FacilitySummarySerializer,
 )
 from care.facility.models import DistrictScopedSummary, FacilityRelatedSummary
+from care.utils.cache.response import cache_response, model_tag
 
 
 class FacilitySummaryFilter(filters.FilterSet):
@@ -44,7 +43,9 @@ class FacilityCapacitySummaryViewSet(
     filterset_class = FacilitySummaryFilter
 
     @extend_schema(tags=["summary"])
-    @method_decorator(cache_page(60 * 10))
+    @cache_response(
+        60 * 10, tags=[model_tag(FacilityRelatedSummary, s_type="FacilityCapacity")]
+    )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -61,7 +62,9 @@ class TriageSummaryViewSet(ListModelMixin, GenericViewSet):
     filterset_class = FacilitySummaryFilter
 
     @extend_schema(tags=["summary"])
-    @method_decorator(cache_page(60 * 60))
+    @cache_response(
+        60 * 60, tags=[model_tag(FacilityRelatedSummary, s_type="TriageSummary")]
+    )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -78,7 +81,9 @@ class TestsSummaryViewSet(ListModelMixin, GenericViewSet):
     filterset_class = FacilitySummaryFilter
 
     @extend_schema(tags=["summary"])
-    @method_decorator(cache_page(60 * 60 * 10))
+    @cache_response(
+        60 * 60 * 10, tags=[model_tag(FacilityRelatedSummary, s_type="TestSummary")]
+    )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -95,7 +100,9 @@ class PatientSummaryViewSet(ListModelMixin, GenericViewSet):
     filterset_class = FacilitySummaryFilter
 
     @extend_schema(tags=["summary"])
-    @method_decorator(cache_page(60 * 10))
+    @cache_response(
+        60 * 10, tags=[model_tag(FacilityRelatedSummary, s_type="PatientSummary")]
+    )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -121,6 +128,8 @@ class DistrictPatientSummaryViewSet(ListModelMixin, GenericViewSet):
     filterset_class = DistrictSummaryFilter
 
     @extend_schema(tags=["summary"])
-    @method_decorator(cache_page(60 * 10))
+    @cache_response(
+        60 * 10, tags=[model_tag(DistrictScopedSummary, s_type="PatientSummary")]
+    )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
@@ -31,9 +31,26 @@ def create_consultation_event_entry(
     fields_to_store = fields_to_store & fields if fields_to_store else fields
 
     batch = []
-    groups = EventType.objects.filter(
-        model=object_instance.__class__.__name__, fields__len__gt=0, is_active=True
-    ).values_list("id", "fields")
+    groups = list(
+        EventType.objects.filter(
+            model=object_instance.__class__.__name__, fields__len__gt=0, is_active=True
+        ).values_list("id", "fields")
+    )
+    if not groups:
+        return 0
+    # events created by workers may be older than the ones created since by
+    # requests, they are then stored without becoming the latest
+    object_events = PatientConsultationEvent.objects.filter(
+        consultation_id=consultation_id,
+        is_latest=True,
+        object_model=object_instance.__class__.__name__,
+        object_id=object_instance.id,
+    )
+    superseded = set(
+        object_events.select_for_update()
+        .filter(taken_at__gt=taken_at)
+        .values_list("event_type_id", flat=True)
+    )
     for group_id, group_fields in groups:
         if fields_to_store & {field.split("__", 1)[0] for field in group_fields}:
             value = {}
@@ -44,20 +61,12 @@ def create_consultation_event_entry(
             if all(not v for v in value.values()):
                 continue
 
-            PatientConsultationEvent.objects.select_for_update().filter(
-                consultation_id=consultation_id,
-                event_type=group_id,
-                is_latest=True,
-                object_model=object_instance.__class__.__name__,
-                object_id=object_instance.id,
-                taken_at__lt=taken_at,
-            ).update(is_latest=False)
             batch.append(
                 PatientConsultationEvent(
                     consultation_id=consultation_id,
                     caused_by_id=caused_by,
                     event_type_id=group_id,
-                    is_latest=True,
+                    is_latest=group_id not in superseded,
                     created_date=created_date,
                     taken_at=taken_at,
                     object_model=object_instance.__class__.__name__,
@@ -71,6 +80,10 @@ def create_consultation_event_entry(
                 )
             )
 
+    object_events.select_for_update().filter(
+        event_type__in=[event.event_type_id for event in batch if event.is_latest],
+        taken_at__lt=taken_at,
+    ).update(is_latest=False)
     PatientConsultationEvent.objects.bulk_create(batch)
     return len(batch)
 
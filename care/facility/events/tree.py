@@ -0,0 +1,71 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from care.facility.models.events import EventType
+from care.utils.cache.response import get_tag_versions, model_tag
+
+
+@dataclass(frozen=True)
+class EventTypeTree:
+    """
+    Immutable snapshot of the event type hierarchy, loaded with a single
+    query and shared by the requests of a process until an event type
+    changes.
+    """
+
+    version: str
+    event_types: Mapping[int, EventType]
+    children: Mapping[int | None, tuple[int, ...]]
+    descendants: Mapping[int, frozenset[int]]
+
+    @classmethod
+    def load(cls, version: str) -> "EventTypeTree":
+        # ordered by path, so that parents come before their children
+        event_types = {
+            event_type.id: event_type
+            for event_type in EventType.objects.order_by("path", "id")
+        }
+        children: dict[int | None, list[int]] = {}
+        descendants: dict[int, set[int]] = {pk: set() for pk in event_types}
+        for event_type in event_types.values():
+            children.setdefault(event_type.parent_id, []).append(event_type.id)
+            for ancestor_id in event_type.get_ancestor_ids():
+                descendants[ancestor_id].add(event_type.id)
+        return cls(
+            version=version,
+            event_types=MappingProxyType(event_types),
+            children=MappingProxyType({pk: tuple(ids) for pk, ids in children.items()}),
+            descendants=MappingProxyType(
+                {pk: frozenset(ids) for pk, ids in descendants.items()}
+            ),
+        )
+
+    def get_children(self, pk: int | None) -> list[EventType]:
+        return [self.event_types[child] for child in self.children.get(pk, ())]
+
+    def get_descendant_ids(self, pk: int) -> frozenset[int]:
+        return self.descendants.get(pk, frozenset())
+
+    def get_subtree_ids(self, pk: int) -> frozenset[int]:
+        """
+        Returns the id of the event type along with the ids of its descendants
+        """
+        return self.get_descendant_ids(pk) | {pk}
+
+
+_trees: dict[str, EventTypeTree] = {}
+
+
+def get_event_type_tree() -> EventTypeTree:
+    """
+    Returns the snapshot of the event type tree, reloading it when the cache
+    version of the EventType tag changed since it was loaded.
+    """
+    (version,) = get_tag_versions([model_tag(EventType)])
+    tree = _trees.get(version)
+    if tree is None:
+        tree = EventTypeTree.load(version)
+        _trees.clear()
+        _trees[version] = tree
+    return tree
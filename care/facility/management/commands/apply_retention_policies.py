@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandParser
+
+from care.facility.tasks.cleanup import get_retention_policies
+from care.utils.retention import apply_retention_policy
+
+
+class Command(BaseCommand):
+    """
+    Management command to delete (and optionally archive) expired rows of the
+    configured retention policies, reporting the progress of every batch.
+    """
+
+    help = "Apply data retention policies"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "policies",
+            nargs="*",
+            choices=list(get_retention_policies()),
+            help="policies to apply, all when omitted",
+        )
+        parser.add_argument("--batch-size", type=int, help="rows deleted per batch")
+        parser.add_argument(
+            "--pause", type=float, help="seconds to wait between batches"
+        )
+
+    def handle(self, *args, **options):
+        policies = get_retention_policies()
+        for name in options["policies"] or policies:
+            result = apply_retention_policy(
+                policies[name],
+                batch_size=options["batch_size"],
+                pause=options["pause"],
+                progress=lambda result: self.stdout.write(str(result)),
+            )
+            self.stdout.write(self.style.SUCCESS(f"Done {result}"))
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.utils import timezone
+
+from care.facility.tasks.cleanup import get_partitioned_history_tables
+from care.utils.partitions import add_months, archive_partition, get_partitions
+
+
+class Command(BaseCommand):
+    """
+    Management command to move the monthly partitions of the history tables
+    older than --months to gzipped CSV files under --directory, one file per
+    partition in a directory per table, and drop them.
+    """
+
+    help = "Archive old partitions of the history tables to compressed files"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=settings.HISTORY_ARCHIVE_AFTER_MONTHS,
+            help="partitions of months before this many months ago are archived",
+        )
+        parser.add_argument(
+            "--directory",
+            default=settings.HISTORY_ARCHIVE_DIR,
+            help="directory the archives are written to",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="list the partitions without archiving them",
+        )
+
+    def handle(self, *args, **options):
+        if options["months"] < 1:
+            msg = "--months has to be at least 1"
+            raise CommandError(msg)
+        before = add_months(timezone.now().date().replace(day=1), -options["months"])
+        directory = Path(options["directory"])
+
+        for table in get_partitioned_history_tables():
+            with connection.cursor() as cursor:
+                partitions = get_partitions(cursor, table)
+            for name, month in partitions.items():
+                if month >= before:
+                    break
+                if options["dry_run"]:
+                    self.stdout.write(f"Would archive {name}")
+                    continue
+                path = archive_partition(table, name, directory / table)
+                self.stdout.write(f"Archived {name} to {path}")
+        self.stdout.write(self.style.SUCCESS("Done"))
@@ -1,11 +1,11 @@
 import json
 
 import phonenumbers
-from django.core.management.base import BaseCommand
 from phonenumber_field.serializerfields import PhoneNumberField
 from rest_framework.exceptions import ValidationError
 
 from care.facility.models import PatientRegistration
+from care.utils.maintenance import BulkMaintenanceCommand
 
 
 def to_phone_number_field(phone_number):
@@ -16,22 +16,26 @@ def to_phone_number_field(phone_number):
         return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
 
 
-class Command(BaseCommand):
+class Command(BulkMaintenanceCommand):
     """
     Management command to clean the phone number field of patient to support E164 format.
     """
 
     help = "Cleans the phone number field of patient to support E164 field"
 
-    def handle(self, *args, **options) -> str | None:
-        qs = PatientRegistration.objects.all()
-        failed = []
-        for patient in qs:
-            try:
-                patient.phone_number = to_phone_number_field(patient.phone_number)
-                patient.save()
-            except Exception:
-                failed.append({"id": patient.id, "phone_number": patient.phone_number})
-
-        self.stdout.write(f"Completed for {qs.count()} | Failed for {len(failed)}")
-        self.stdout.write(f"Failed for {json.dumps(failed)}")
+    model = PatientRegistration
+    update_fields = ("phone_number",)
+    record_history = True
+
+    def update_object(self, patient) -> bool:
+        phone_number = str(to_phone_number_field(patient.phone_number))
+        if phone_number == patient.phone_number:
+            return False
+        patient.phone_number = phone_number
+        return True
+
+    def report(self, result):
+        self.stdout.write(
+            f"Completed for {result.updated} | Failed for {len(result.failed)}"
+        )
+        self.stdout.write(f"Failed for {json.dumps(result.failed)}")
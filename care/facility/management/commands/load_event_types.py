@@ -3,6 +3,7 @@ from typing import TypedDict
 from django.core.management import BaseCommand
 
 from care.facility.models.events import EventType
+from care.utils.cache.response import invalidate_cache_tags, model_tag
 
 
 class EventTypeDef(TypedDict, total=False):
@@ -296,6 +297,8 @@ class Command(BaseCommand):
         EventType.objects.filter(name__in=self.inactive_event_types).update(
             is_active=False
         )
+        # update() does not send the signals invalidating cached event types
+        invalidate_cache_tags(model_tag(EventType))
 
         self.create_objects(self.consultation_event_types)
 
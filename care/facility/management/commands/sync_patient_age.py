@@ -1,24 +1,59 @@
-from django.core.management.base import BaseCommand
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
 
 from care.facility.models import PatientRegistration
+from care.users.models import District, LocalBody
+from care.utils.maintenance import BatchResult, BulkMaintenanceCommand
 
 
-class Command(BaseCommand):
+class Command(BulkMaintenanceCommand):
     """
     Management command to sync Date of Birth and Year of Birth and Age.
     """
 
     help = "Syncs the age of Patients based on Date of Birth and Year of Birth"
 
-    def handle(self, *args, **options):
-        qs = PatientRegistration.objects.all()
-        failed = 0
-        for patient in qs:
-            try:
-                patient.save()
-            except Exception:
-                failed += 1
-        if failed:
-            self.stdout.write(f"Failed for {failed} Patient")
-        else:
-            self.stdout.write("Successfully Synced Age")
+    model = PatientRegistration
+
+    def update_batch(self, queryset):
+        """
+        Applies the fields derived in PatientRegistration.save in SQL, only
+        touching the patients where they are out of sync. The values are
+        derived from other fields of the same record, so no history is
+        recorded.
+        """
+        now = timezone.now()
+        updated = (
+            queryset.filter(date_of_birth__isnull=False)
+            .exclude(year_of_birth=ExtractYear("date_of_birth"))
+            .update(year_of_birth=ExtractYear("date_of_birth"), modified_date=now)
+        )
+        updated += (
+            queryset.filter(local_body__isnull=False)
+            .exclude(district_id=F("local_body__district_id"))
+            .update(
+                district_id=Subquery(
+                    LocalBody.objects.filter(id=OuterRef("local_body_id")).values(
+                        "district_id"
+                    )
+                ),
+                modified_date=now,
+            )
+        )
+        updated += (
+            queryset.filter(district__isnull=False)
+            .exclude(state_id=F("district__state_id"))
+            .update(
+                state_id=Subquery(
+                    District.objects.filter(id=OuterRef("district_id")).values(
+                        "state_id"
+                    )
+                ),
+                modified_date=now,
+            )
+        )
+        return BatchResult(updated=updated)
+
+    def report(self, result):
+        self.stdout.write(f"Successfully Synced Age ({result.updated} updates)")
@@ -0,0 +1,86 @@
+# Generated by Django 5.1.2 on 2026-10-19 10:22
+
+import uuid
+from itertools import batched
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Max, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+
+
+def backfill_daily_rollups(apps, schema_editor):
+    FacilityInventoryLog = apps.get_model("facility", "FacilityInventoryLog")
+    FacilityInventoryDailyRollup = apps.get_model(
+        "facility", "FacilityInventoryDailyRollup"
+    )
+
+    counted = Q(probable_accident=False)
+    days = (
+        FacilityInventoryLog.objects.filter(deleted=False, item__isnull=False)
+        .annotate(date=TruncDate("created_date"))
+        .values("facility_id", "item_id", "date")
+        .annotate(
+            incoming=Coalesce(
+                Sum("quantity_in_default_unit", filter=counted & Q(is_incoming=True)),
+                0.0,
+            ),
+            outgoing=Coalesce(
+                Sum("quantity_in_default_unit", filter=counted & Q(is_incoming=False)),
+                0.0,
+            ),
+            last_log_id=Max("id"),
+        )
+        .order_by()
+    )
+    for batch in batched(days.iterator(), 1000):
+        end_stocks = dict(
+            FacilityInventoryLog.objects.filter(
+                id__in=[day["last_log_id"] for day in batch]
+            ).values_list("id", "current_stock")
+        )
+        FacilityInventoryDailyRollup.objects.bulk_create(
+            [
+                FacilityInventoryDailyRollup(
+                    facility_id=day["facility_id"],
+                    item_id=day["item_id"],
+                    date=day["date"],
+                    incoming=day["incoming"],
+                    outgoing=day["outgoing"],
+                    end_stock=end_stocks[day["last_log_id"]],
+                )
+                for day in batch
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facility', '0467_alter_hospitaldoctors_area'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacilityInventoryDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('external_id', models.UUIDField(db_index=True, default=uuid.uuid4, unique=True)),
+                ('created_date', models.DateTimeField(auto_now_add=True, db_index=True, null=True)),
+                ('modified_date', models.DateTimeField(auto_now=True, db_index=True, null=True)),
+                ('deleted', models.BooleanField(db_index=True, default=False)),
+                ('date', models.DateField()),
+                ('incoming', models.FloatField(default=0)),
+                ('outgoing', models.FloatField(default=0)),
+                ('end_stock', models.FloatField(default=0)),
+                ('facility', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='facility.facility')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='facility.facilityinventoryitem')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('facility', 'item', 'date'), name='unique_facility_item_daily_rollup')],
+            },
+        ),
+        migrations.RunPython(
+            backfill_daily_rollups, reverse_code=migrations.RunPython.noop
+        ),
+    ]
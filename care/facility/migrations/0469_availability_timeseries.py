@@ -0,0 +1,153 @@
+# Generated by Django 5.1.2 on 2026-10-19 10:36
+
+import django.db.models.deletion
+import uuid
+from itertools import batched
+
+from django.db import migrations, models
+
+
+def backfill_latest_availability_records(apps, schema_editor):
+    AvailabilityRecord = apps.get_model("facility", "AvailabilityRecord")
+    LatestAvailabilityRecord = apps.get_model("facility", "LatestAvailabilityRecord")
+
+    latest_records = (
+        AvailabilityRecord.objects.filter(deleted=False)
+        .order_by("object_external_id", "-timestamp")
+        .distinct("object_external_id")
+    )
+    for batch in batched(latest_records.iterator(), 1000):
+        LatestAvailabilityRecord.objects.bulk_create(
+            [
+                LatestAvailabilityRecord(
+                    content_type_id=record.content_type_id,
+                    object_external_id=record.object_external_id,
+                    status=record.status,
+                    timestamp=record.timestamp,
+                )
+                for record in batch
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("facility", "0468_facility_inventory_daily_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LatestAvailabilityRecord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "external_id",
+                    models.UUIDField(db_index=True, default=uuid.uuid4, unique=True),
+                ),
+                (
+                    "created_date",
+                    models.DateTimeField(auto_now_add=True, db_index=True, null=True),
+                ),
+                (
+                    "modified_date",
+                    models.DateTimeField(auto_now=True, db_index=True, null=True),
+                ),
+                ("deleted", models.BooleanField(db_index=True, default=False)),
+                ("object_external_id", models.UUIDField(unique=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("Not Monitored", "Not Monitored"),
+                            ("Operational", "Operational"),
+                            ("Down", "Down"),
+                            ("Under Maintenance", "Under Maintenance"),
+                        ],
+                        default="Not Monitored",
+                        max_length=20,
+                    ),
+                ),
+                ("timestamp", models.DateTimeField()),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="AvailabilityInterval",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "external_id",
+                    models.UUIDField(db_index=True, default=uuid.uuid4, unique=True),
+                ),
+                (
+                    "created_date",
+                    models.DateTimeField(auto_now_add=True, db_index=True, null=True),
+                ),
+                (
+                    "modified_date",
+                    models.DateTimeField(auto_now=True, db_index=True, null=True),
+                ),
+                ("deleted", models.BooleanField(db_index=True, default=False)),
+                ("object_external_id", models.UUIDField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("Not Monitored", "Not Monitored"),
+                            ("Operational", "Operational"),
+                            ("Down", "Down"),
+                            ("Under Maintenance", "Under Maintenance"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                ("end", models.DateTimeField()),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["object_external_id", "start"],
+                        name="facility_av_object__ebbc20_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(
+            backfill_latest_availability_records,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.2 on 2026-10-19 11:01
+
+from django.db import migrations, models
+
+
+def populate_event_type_paths(apps, schema_editor):
+    EventType = apps.get_model("facility", "EventType")
+
+    event_types = list(EventType.objects.all())
+    children = {}
+    for event_type in event_types:
+        children.setdefault(event_type.parent_id, []).append(event_type)
+
+    stack = [("/", event_type) for event_type in children.get(None, [])]
+    while stack:
+        parent_path, event_type = stack.pop()
+        event_type.path = f"{parent_path}{event_type.id}/"
+        stack.extend((event_type.path, child) for child in children.get(event_type.id, []))
+    EventType.objects.bulk_update(event_types, ["path"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facility', '0470_sms_message'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventtype',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(
+            populate_event_type_paths,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name='eventtype',
+            index=models.Index(fields=['path'], name='event_type_path_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
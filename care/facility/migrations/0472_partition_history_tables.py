@@ -0,0 +1,40 @@
+# Generated by Django 5.1.2 on 2026-10-19 12:10
+
+from datetime import date
+
+from django.db import migrations
+
+from care.utils.partitions import add_months, partition_table
+
+PARTITIONED_TABLES = (
+    "facility_historicalpatientregistration",
+    "facility_historicalfacilitycapacity",
+)
+
+
+def partition_history_tables(apps, schema_editor):
+    # partitions are created three months ahead, later months are created
+    # by the create_history_partitions task
+    start = date.today().replace(day=1)
+    until = add_months(start, 3)
+    with schema_editor.connection.cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            partition_table(cursor, table, "history_date", start, until)
+            # the history of a row is listed by history_date
+            cursor.execute(
+                f'CREATE INDEX "{table}_id_history_date_idx" '
+                f'ON "{table}" (id, history_date DESC, history_id DESC)'
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facility', '0471_eventtype_path'),
+    ]
+
+    operations = [
+        # the partitioned tables keep working with the historical models, so
+        # reverting leaves them as they are
+        migrations.RunPython(partition_history_tables, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.2 on 2026-10-19 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facility', '0472_partition_history_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetConfigSync',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hostname', models.CharField(max_length=1024, unique=True)),
+                ('acknowledged', models.JSONField(default=dict)),
+                ('insecure_connection', models.BooleanField(default=False)),
+                ('synced_date', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -247,6 +247,47 @@ class AvailabilityRecord(BaseModel):
         return model.objects.get(external_id=self.object_external_id)
 
 
+class LatestAvailabilityRecord(BaseModel):
+    """
+    Latest availability status of each object, kept alongside the AvailabilityRecord history so that
+    the current status of an object is a single row lookup.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_external_id = models.UUIDField(unique=True)
+    status = models.CharField(
+        choices=AvailabilityStatus,
+        default=AvailabilityStatus.NOT_MONITORED,
+        max_length=20,
+    )
+    timestamp = models.DateTimeField(null=False, blank=False)
+
+    def __str__(self):
+        return f"{self.content_type} ({self.object_external_id}) - {self.status}"
+
+
+class AvailabilityInterval(BaseModel):
+    """
+    Compacted availability history, each row is a period of time [start, end) during which the status of
+    an object did not change. AvailabilityRecords older than AVAILABILITY_COMPACTION_DAYS are collapsed
+    into intervals.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_external_id = models.UUIDField()
+    status = models.CharField(choices=AvailabilityStatus, max_length=20)
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["object_external_id", "start"]),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type} ({self.object_external_id}) - {self.status} - {self.start} to {self.end}"
+
+
 class UserDefaultAssetLocation(BaseModel):
     user = models.ForeignKey(User, on_delete=models.PROTECT, null=False, blank=False)
     location = models.ForeignKey(
@@ -316,3 +357,18 @@ class AssetServiceEdit(models.Model):
 
     def __str__(self):
         return f"{self.asset_service.asset.name} - {self.serviced_on}"
+
+
+class AssetConfigSync(models.Model):
+    """
+    Configuration of the assets last acknowledged by a middleware, keyed by the external id of the assets.
+    Pushes to the middleware only send the assets whose configuration differs from it.
+    """
+
+    hostname = models.CharField(max_length=1024, unique=True)
+    acknowledged = JSONField(default=dict)
+    insecure_connection = models.BooleanField(default=False)
+    synced_date = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.hostname
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.fields import ArrayField
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Value
+from django.db.models.functions import Concat, Substr
 
 from care.utils.event_utils import CustomJSONEncoder
 from care.utils.ulid.models import ULIDField
@@ -30,6 +32,18 @@ class EventType(models.Model):
     fields = ArrayField(models.CharField(max_length=50), default=list)
     created_date = models.DateTimeField(auto_now_add=True)
     is_active = models.BooleanField(default=True)
+    # ids from the root down to this event type, eg. "/1/4/9/", maintained on
+    # save so that the descendants are the rows starting with this path
+    path = models.CharField(max_length=255, default="", editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["path"],
+                name="event_type_path_idx",
+                opclasses=["varchar_pattern_ops"],
+            )
+        ]
 
     def __str__(self) -> str:
         return f"{self.model} - {self.name}"
@@ -37,13 +51,37 @@ class EventType(models.Model):
     def save(self, *args, **kwargs):
         if self.description is not None and not self.description.strip():
             self.description = None
-        return super().save(*args, **kwargs)
 
-    def get_descendants(self):
-        descendants = list(self.children.all())
-        for child in self.children.all():
-            descendants.extend(child.get_descendants())
-        return descendants
+        parent_path = "/"
+        if self.parent_id:
+            parent_path = EventType.objects.values_list("path", flat=True).get(
+                pk=self.parent_id
+            )
+        if self.path and parent_path.startswith(self.path):
+            msg = "An event type cannot be moved under itself or its descendants"
+            raise ValueError(msg)
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.update_path(f"{parent_path}{self.pk}/")
+
+    def update_path(self, path: str):
+        if path == self.path:
+            return
+        if self.path:
+            # moves the subtree along with this event type
+            EventType.objects.filter(path__startswith=self.path).update(
+                path=Concat(Value(path), Substr("path", len(self.path) + 1))
+            )
+        else:
+            EventType.objects.filter(pk=self.pk).update(path=path)
+        self.path = path
+
+    def get_ancestor_ids(self) -> list[int]:
+        return [int(pk) for pk in self.path.strip("/").split("/")[:-1]]
+
+    def get_descendants(self) -> models.QuerySet["EventType"]:
+        return EventType.objects.filter(path__startswith=self.path).exclude(pk=self.pk)
 
 
 class PatientConsultationEvent(models.Model):
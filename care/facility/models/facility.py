@@ -7,7 +7,6 @@ from django.db.models import IntegerChoices
 from django.db.models.constraints import CheckConstraint, UniqueConstraint
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
-from simple_history.models import HistoricalRecords
 
 from care.facility.models import FacilityBaseModel, reverse_choices
 from care.facility.models.facility_flag import FacilityFlag
@@ -17,6 +16,7 @@ from care.facility.models.mixins.permissions.facility import (
 )
 from care.users.models import District, LocalBody, State, Ward
 from care.utils.models.base import BaseModel
+from care.utils.models.history import ChangedHistoricalRecords
 from care.utils.models.validators import mobile_or_landline_number_validator
 
 User = get_user_model()
@@ -452,7 +452,7 @@ class FacilityCapacity(FacilityBaseModel, FacilityRelatedPermissionMixin):
     total_capacity = models.IntegerField(default=0, validators=[MinValueValidator(0)])
     current_capacity = models.IntegerField(default=0, validators=[MinValueValidator(0)])
 
-    history = HistoricalRecords()
+    history = ChangedHistoricalRecords()
 
     class Meta:
         constraints = [
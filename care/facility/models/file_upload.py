@@ -2,11 +2,11 @@ import time
 import uuid
 from uuid import uuid4
 
-import boto3
 from django.contrib.auth import get_user_model
 from django.db import models
 
-from care.utils.csp.config import BucketType, get_client_config
+from care.utils.csp.client import TRANSFER_CONFIG, get_client
+from care.utils.csp.config import BucketType
 from care.utils.models.base import BaseManager
 
 User = get_user_model()
@@ -64,14 +64,16 @@ class BaseFileUpload(models.Model):
         parts = self.internal_name.split(".")
         return f".{parts[-1]}" if len(parts) > 1 else ""
 
+    def get_object_key(self):
+        return f"{self.FileType(self.file_type).name}/{self.internal_name}"
+
     def signed_url(
         self, duration=60 * 60, mime_type=None, bucket_type=BucketType.PATIENT
     ):
-        config, bucket_name = get_client_config(bucket_type, external=True)
-        s3 = boto3.client("s3", **config)
+        s3, bucket_name = get_client(bucket_type, external=True)
         params = {
             "Bucket": bucket_name,
-            "Key": f"{self.FileType(self.file_type).name}/{self.internal_name}",
+            "Key": self.get_object_key(),
         }
         if mime_type:
             params["ContentType"] = mime_type
@@ -82,36 +84,69 @@ class BaseFileUpload(models.Model):
         )
 
     def read_signed_url(self, duration=60 * 60, bucket_type=BucketType.PATIENT):
-        config, bucket_name = get_client_config(bucket_type, external=True)
-        s3 = boto3.client("s3", **config)
+        s3, bucket_name = get_client(bucket_type, external=True)
         return s3.generate_presigned_url(
             "get_object",
             Params={
                 "Bucket": bucket_name,
-                "Key": f"{self.FileType(self.file_type).name}/{self.internal_name}",
+                "Key": self.get_object_key(),
             },
             ExpiresIn=duration,  # seconds
         )
 
+    @classmethod
+    def read_signed_urls(
+        cls, files, duration=60 * 60, bucket_type=BucketType.PATIENT
+    ) -> dict:
+        """
+        Signs read urls for many files at once, returns a mapping of
+        external_id to url. Signing happens locally, no requests are made.
+        """
+        s3, bucket_name = get_client(bucket_type, external=True)
+        return {
+            file.external_id: s3.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": bucket_name, "Key": file.get_object_key()},
+                ExpiresIn=duration,  # seconds
+            )
+            for file in files
+        }
+
     def put_object(self, file, bucket_type=BucketType.PATIENT, **kwargs):
-        config, bucket_name = get_client_config(bucket_type)
-        s3 = boto3.client("s3", **config)
-        return s3.put_object(
-            Body=file,
-            Bucket=bucket_name,
-            Key=f"{self.FileType(self.file_type).name}/{self.internal_name}",
-            **kwargs,
+        """
+        Streams the file object to the bucket, using a multipart upload for
+        large files. kwargs are passed as extra args (eg: ContentType).
+        """
+        s3, bucket_name = get_client(bucket_type)
+        return s3.upload_fileobj(
+            file,
+            bucket_name,
+            self.get_object_key(),
+            ExtraArgs=kwargs or None,
+            Config=TRANSFER_CONFIG,
         )
 
     def get_object(self, bucket_type=BucketType.PATIENT, **kwargs):
-        config, bucket_name = get_client_config(bucket_type)
-        s3 = boto3.client("s3", **config)
+        s3, bucket_name = get_client(bucket_type)
         return s3.get_object(
             Bucket=bucket_name,
-            Key=f"{self.FileType(self.file_type).name}/{self.internal_name}",
+            Key=self.get_object_key(),
             **kwargs,
         )
 
+    def download_object(self, file, bucket_type=BucketType.PATIENT):
+        """
+        Streams the object into a writable binary file object in chunks
+        """
+        s3, bucket_name = get_client(bucket_type)
+        s3.download_fileobj(
+            bucket_name, self.get_object_key(), file, Config=TRANSFER_CONFIG
+        )
+
+    def iter_contents(self, chunk_size=1024 * 1024, bucket_type=BucketType.PATIENT):
+        response = self.get_object(bucket_type=bucket_type)
+        yield from response["Body"].iter_chunks(chunk_size)
+
     def file_contents(self):
         response = self.get_object()
         content_type = response["ContentType"]
@@ -197,3 +197,36 @@ class FacilityInventoryBurnRate(FacilityBaseModel, FacilityRelatedPermissionMixi
                 )
             )
         ]
+
+
+class FacilityInventoryDailyRollup(FacilityBaseModel):
+    """
+    Per day totals of an item in a facility, maintained along with each inventory log so that
+    burn rates and daily summaries do not have to be recalculated from the logs.
+
+    incoming and outgoing exclude logs flagged as probable accidents, end_stock is the stock after
+    the last log of the day.
+    """
+
+    facility = models.ForeignKey(
+        "Facility", on_delete=models.CASCADE, null=False, blank=False
+    )
+    item = models.ForeignKey(
+        FacilityInventoryItem, on_delete=models.CASCADE, null=False, blank=False
+    )
+    date = models.DateField()
+    incoming = models.FloatField(default=0)
+    outgoing = models.FloatField(default=0)
+    end_stock = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["facility", "item", "date"],
+                name="unique_facility_item_daily_rollup",
+            )
+        ]
+
+    @property
+    def start_stock(self):
+        return self.end_stock - self.incoming + self.outgoing
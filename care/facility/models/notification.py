@@ -2,6 +2,7 @@ import enum
 
 from django.db import models
 from django.db.models import JSONField
+from django.utils import timezone
 
 from care.facility.models import FacilityBaseModel
 from care.users.models import User
@@ -66,3 +67,39 @@ class Notification(FacilityBaseModel):
     event = models.IntegerField(choices=EventChoices, default=Event.MESSAGE.value)
     message = models.TextField(max_length=2000, null=True, default=None)
     caused_objects = JSONField(null=True, blank=True, default=dict)
+
+
+class SMSMessage(models.Model):
+    """
+    Outbox of SMS messages, delivered by the deliver_sms task. Messages that
+    failed SMS_MAX_ATTEMPTS times are kept as failed for inspection.
+
+    Rows are written in bulk for every recipient of a notification, so the
+    model does not carry the columns of the base models.
+    """
+
+    class Status(models.IntegerChoices):
+        PENDING = 0
+        SENT = 1
+        FAILED = 2
+
+    created_date = models.DateTimeField(default=timezone.now, db_index=True)
+    phone_number = models.CharField(max_length=14)
+    message = models.TextField()
+    status = models.IntegerField(choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(status=0),
+                name="sms_message_pending_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.phone_number} - {self.get_status_display()}"
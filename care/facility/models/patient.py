@@ -10,7 +10,6 @@ from django.db.models.functions import Coalesce, Now
 from django.template.defaultfilters import pluralize
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from simple_history.models import HistoricalRecords
 
 from care.facility.models import (
     DISEASE_CHOICES,
@@ -42,6 +41,7 @@ from care.facility.models.patient_consultation import PatientConsultation
 from care.facility.static_data.icd11 import get_icd11_diagnoses_objects_by_ids
 from care.users.models import GENDER_CHOICES, REVERSE_GENDER_CHOICES, User
 from care.utils.models.base import BaseManager, BaseModel
+from care.utils.models.history import ChangedHistoricalRecords
 from care.utils.models.validators import mobile_or_landline_number_validator
 
 
@@ -425,7 +425,7 @@ class PatientRegistration(PatientBaseModel, PatientPermissionMixin):
         related_name="root_patient_assigned_to",
     )
 
-    history = HistoricalRecords(excluded_fields=["meta_info"])
+    history = ChangedHistoricalRecords(excluded_fields=["meta_info"])
 
     objects = BaseManager()
 
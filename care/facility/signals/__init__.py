@@ -1 +1,2 @@
 from .asset_updates import *  # noqa
+from .cache_invalidation import *  # noqa
@@ -1,51 +1,107 @@
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from care.facility.api.serializers.asset import AssetConfigSerializer
-from care.facility.models.asset import Asset
-from care.facility.tasks.push_asset_config import (
-    delete_asset_from_middleware_task,
-    push_config_to_middleware_task,
-)
+from care.facility.models.asset import Asset, AssetLocation
+from care.facility.models.facility import Facility
+from care.facility.tasks.push_asset_config import enqueue_asset_config_sync
+
+# fields of an asset that its configuration on the middleware depends on
+ASSET_CONFIG_FIELDS = {
+    "name",
+    "description",
+    "asset_class",
+    "meta",
+    "current_location",
+    "deleted",
+}
+
+
+def get_asset_middleware(asset: Asset) -> tuple[int, str] | None:
+    if asset.resolved_middleware is None:
+        return None
+    return (
+        asset.current_location.facility_id,
+        asset.resolved_middleware["hostname"],
+    )
+
+
+def has_config_fields(update_fields, fields) -> bool:
+    return not update_fields or bool(set(update_fields) & set(fields))
 
 
 @receiver(pre_save, sender=Asset)
-def save_asset_fields_before_update(
+def save_asset_middleware_before_update(
     sender, instance, raw, using, update_fields, **kwargs
 ):
-    if raw or instance.resolved_middleware is None:
+    if (
+        raw
+        or not instance.pk
+        or not has_config_fields(update_fields, ASSET_CONFIG_FIELDS)
+    ):
         return
-
-    if instance.pk:
-        instance._previous_values = {  # noqa: SLF001
-            "hostname": instance.resolved_middleware.get("hostname"),
-        }
+    # the middleware the asset was on, its location may have changed since
+    previous = (
+        Asset.objects.filter(pk=instance.pk)
+        .select_related("current_location__facility")
+        .first()
+    )
+    instance._previous_middleware = (  # noqa: SLF001
+        get_asset_middleware(previous) if previous else None
+    )
 
 
 @receiver(post_save, sender=Asset)
 def update_asset_config_on_middleware(
     sender, instance, created, raw, using, update_fields, **kwargs
 ):
-    if (
-        raw
-        or (update_fields and "meta" not in update_fields)
-        or (instance.resolved_middleware is None)
-    ):
+    if raw or not has_config_fields(update_fields, ASSET_CONFIG_FIELDS):
         return
-
-    new_hostname = instance.resolved_middleware.get("hostname")
-    old_hostname = getattr(instance, "_previous_values", {}).get("hostname")
-    push_config_to_middleware_task.s(
-        new_hostname,
-        instance.external_id,
-        AssetConfigSerializer(instance).data,
-        old_hostname,
+    previous = instance.__dict__.pop("_previous_middleware", None)
+    enqueue_asset_config_sync(
+        middleware
+        for middleware in (previous, get_asset_middleware(instance))
+        if middleware
     )
 
 
 @receiver(post_delete, sender=Asset)
 def delete_asset_on_middleware(sender, instance, using, **kwargs):
-    if instance.resolved_middleware is None:
+    if middleware := get_asset_middleware(instance):
+        enqueue_asset_config_sync([middleware])
+
+
+@receiver(pre_save, sender=AssetLocation)
+@receiver(pre_save, sender=Facility)
+def save_middleware_address_before_update(
+    sender, instance, raw, using, update_fields, **kwargs
+):
+    if raw or not instance.pk:
+        return
+    if not has_config_fields(update_fields, ["middleware_address"]):
+        return
+    instance._previous_middleware_address = (  # noqa: SLF001
+        sender.objects.filter(pk=instance.pk)
+        .values_list("middleware_address", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=AssetLocation)
+@receiver(post_save, sender=Facility)
+def update_middleware_address_on_middleware(
+    sender, instance, created, raw, using, update_fields, **kwargs
+):
+    if raw or created or "_previous_middleware_address" not in instance.__dict__:
+        return
+    previous = instance.__dict__.pop("_previous_middleware_address")
+    if previous == instance.middleware_address:
         return
-    hostname = instance.resolved_middleware.get("hostname")
-    delete_asset_from_middleware_task.s(hostname, instance.external_id)
+    # the assets of a location without an address of its own fall back to
+    # the address of the facility
+    if isinstance(instance, AssetLocation):
+        facility = instance.facility
+        hostnames = {previous, instance.middleware_address, facility.middleware_address}
+    else:
+        facility = instance
+        hostnames = {previous, instance.middleware_address}
+    enqueue_asset_config_sync((facility.id, hostname) for hostname in hostnames)
@@ -0,0 +1,8 @@
+from care.facility.models import DistrictScopedSummary, FacilityRelatedSummary
+from care.facility.models.events import EventType
+from care.utils.cache.response import invalidate_on_change
+
+# cached summary responses are scoped by the summary type
+invalidate_on_change(FacilityRelatedSummary, scopes=["s_type"])
+invalidate_on_change(DistrictScopedSummary, scopes=["s_type"])
+invalidate_on_change(EventType)
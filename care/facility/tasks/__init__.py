@@ -3,10 +3,15 @@ from celery.schedules import crontab
 from django.conf import settings
 
 from care.facility.tasks.asset_monitor import check_asset_status
-from care.facility.tasks.cleanup import delete_old_notifications
+from care.facility.tasks.cleanup import (
+    apply_retention_policies,
+    compact_availability_records,
+    create_history_partitions,
+)
 from care.facility.tasks.location_monitor import check_location_status
 from care.facility.tasks.plausible_stats import capture_goals
 from care.facility.tasks.redis_index import load_redis_index
+from care.facility.tasks.sms import deliver_sms
 from care.facility.tasks.summarisation import (
     summarize_district_patient,
     summarize_facility_capacity,
@@ -20,8 +25,18 @@ from care.facility.tasks.summarisation import (
 def setup_periodic_tasks(sender, **kwargs):
     sender.add_periodic_task(
         crontab(hour="0", minute="0"),
-        delete_old_notifications.s(),
-        name="delete_old_notifications",
+        apply_retention_policies.s(),
+        name="apply_retention_policies",
+    )
+    sender.add_periodic_task(
+        crontab(hour="1", minute="0"),
+        compact_availability_records.s(),
+        name="compact_availability_records",
+    )
+    sender.add_periodic_task(
+        crontab(hour="2", minute="0"),
+        create_history_partitions.s(),
+        name="create_history_partitions",
     )
     if settings.TASK_SUMMARIZE_TRIAGE:
         sender.add_periodic_task(
@@ -74,3 +89,10 @@ def setup_periodic_tasks(sender, **kwargs):
         check_location_status.s(),
         name="check_location_status",
     )
+    if settings.USE_SMS or settings.SEND_SMS_NOTIFICATION:
+        # retries failed messages, new messages are delivered when queued
+        sender.add_periodic_task(
+            crontab(minute="*"),
+            deliver_sms.s(),
+            name="deliver_sms",
+        )
@@ -7,7 +7,8 @@ from django.contrib.contenttypes.models import ContentType
 from django.db.models import Q
 from django.utils import timezone
 
-from care.facility.models.asset import Asset, AvailabilityRecord, AvailabilityStatus
+from care.facility.models.asset import Asset, AvailabilityStatus
+from care.facility.utils.availability.history import get_latest_records, record_status
 from care.utils.assetintegration.asset_classes import AssetClasses
 
 if TYPE_CHECKING:
@@ -35,6 +36,7 @@ def check_asset_status():  # noqa: PLR0912
         )
     )
     asset_content_type = ContentType.objects.get_for_model(Asset)
+    latest_records = get_latest_records(asset_content_type)
 
     for asset in assets:
         # Skipping if local IP address is not present
@@ -111,16 +113,6 @@ def check_asset_status():  # noqa: PLR0912
                 else:
                     asset_status = "down"
 
-                # Fetching the last record of the asset
-                last_record = (
-                    AvailabilityRecord.objects.filter(
-                        content_type=asset_content_type,
-                        object_external_id=asset.external_id,
-                    )
-                    .order_by("-timestamp")
-                    .first()
-                )
-
                 # Setting new status based on the status returned by the device
                 if asset_status == "up":
                     new_status = AvailabilityStatus.OPERATIONAL
@@ -128,16 +120,14 @@ def check_asset_status():  # noqa: PLR0912
                     new_status = AvailabilityStatus.UNDER_MAINTENANCE
 
                 # Creating a new record if the status has changed
-                if not last_record or (
-                    datetime.fromisoformat(status_record.get("time"))
-                    > last_record.timestamp
-                    and last_record.status != new_status.value
-                ):
-                    AvailabilityRecord.objects.create(
-                        content_type=asset_content_type,
-                        object_external_id=asset.external_id,
-                        status=new_status.value,
-                        timestamp=status_record.get("time", timezone.now()),
-                    )
+                latest_records[asset.external_id] = record_status(
+                    asset_content_type,
+                    asset.external_id,
+                    new_status.value,
+                    datetime.fromisoformat(status_record["time"])
+                    if status_record.get("time")
+                    else timezone.now(),
+                    latest=latest_records.get(asset.external_id),
+                )
         except Exception as e:
             logger.error("Error in Asset Status Check: %s", e)
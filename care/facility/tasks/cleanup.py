@@ -1,15 +1,99 @@
 from datetime import timedelta
 
 from celery import shared_task
+from django.apps import apps
 from django.conf import settings
 from django.utils import timezone
+from simple_history.models import registered_models
 
-from care.facility.models.notification import Notification
+from care.facility.utils.availability.history import compact_records
+from care.utils.partitions import add_months, ensure_partitions
+from care.utils.retention import RetentionPolicy, apply_retention_policy
+
+# models whose history tables are partitioned by month on history_date
+PARTITIONED_HISTORY_MODELS = (
+    "facility.PatientRegistration",
+    "facility.FacilityCapacity",
+)
+
+
+def get_retention_policies() -> dict[str, RetentionPolicy]:
+    archive = settings.RETENTION_ARCHIVE
+    policies = [
+        RetentionPolicy(
+            "notifications",
+            "facility.Notification",
+            settings.NOTIFICATION_RETENTION_DAYS,
+        ),
+        RetentionPolicy(
+            "facility_summaries",
+            "facility.FacilityRelatedSummary",
+            settings.SUMMARY_RETENTION_DAYS,
+            archive=archive,
+        ),
+        RetentionPolicy(
+            "district_summaries",
+            "facility.DistrictScopedSummary",
+            settings.SUMMARY_RETENTION_DAYS,
+            archive=archive,
+        ),
+        RetentionPolicy(
+            "sms_messages",
+            "facility.SMSMessage",
+            settings.SMS_RETENTION_DAYS,
+        ),
+        # only superseded events, the latest event of each kind is kept
+        RetentionPolicy(
+            "consultation_events",
+            "facility.PatientConsultationEvent",
+            settings.CONSULTATION_EVENT_RETENTION_DAYS,
+            filters={"is_latest": False},
+            archive=archive,
+        ),
+    ]
+    policies.extend(
+        RetentionPolicy(
+            f"history_{model._meta.model_name}",  # noqa: SLF001
+            model.history.model._meta.label,  # noqa: SLF001
+            settings.HISTORY_RETENTION_DAYS,
+            date_field="history_date",
+            archive=archive,
+        )
+        for model in registered_models.values()
+    )
+    return {policy.name: policy for policy in policies}
 
 
 @shared_task
 def delete_old_notifications():
-    retention_days = settings.NOTIFICATION_RETENTION_DAYS
+    apply_retention_policy(get_retention_policies()["notifications"])
+
+
+@shared_task
+def apply_retention_policies():
+    for policy in get_retention_policies().values():
+        apply_retention_policy(policy)
+
 
-    threshold_date = timezone.now() - timedelta(days=retention_days)
-    Notification.objects.filter(created_date__lte=threshold_date).delete()
+@shared_task
+def compact_availability_records():
+    threshold_date = timezone.now() - timedelta(
+        days=settings.AVAILABILITY_COMPACTION_DAYS
+    )
+    compact_records(before=threshold_date)
+
+
+def get_partitioned_history_tables() -> list[str]:
+    return [
+        apps.get_model(label).history.model._meta.db_table  # noqa: SLF001
+        for label in PARTITIONED_HISTORY_MODELS
+    ]
+
+
+@shared_task
+def create_history_partitions():
+    until = add_months(
+        timezone.now().date().replace(day=1), settings.HISTORY_PARTITION_MONTHS_AHEAD
+    )
+    for table in get_partitioned_history_tables():
+        ensure_partitions(table, "history_date", until)
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from celery import shared_task
+from django.apps import apps
+
+from care.facility.events.handler import create_consultation_events
+
+
+@shared_task
+def create_consultation_events_task(
+    consultation_id: int,
+    objects: list[tuple[str, int]],
+    caused_by: int,
+    created_date: str,
+):
+    """
+    Creates the events of objects saved by a request once it commits, the
+    objects are given as (model label, pk) pairs and loaded with a query per
+    model
+    """
+    pks_by_label: dict[str, list[int]] = {}
+    for label, pk in objects:
+        pks_by_label.setdefault(label, []).append(pk)
+    instances = {
+        label: apps.get_model(label)._default_manager.in_bulk(pks)  # noqa: SLF001
+        for label, pks in pks_by_label.items()
+    }
+    create_consultation_events(
+        consultation_id,
+        [instances[label][pk] for label, pk in objects if pk in instances[label]],
+        caused_by,
+        datetime.fromisoformat(created_date),
+    )
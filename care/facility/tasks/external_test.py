@@ -0,0 +1,17 @@
+from logging import Logger
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+
+from care.facility.utils.external_tests.bulk_upsert import run_bulk_upsert_job
+
+logger: Logger = get_task_logger(__name__)
+
+
+@shared_task
+def bulk_upsert_external_tests_task(job_id: str, rows: list[dict]):
+    """
+    Validate and insert a large external test result upload
+    """
+    logger.info("Processing external test bulk upsert %s (%s rows)", job_id, len(rows))
+    return run_bulk_upsert_job(job_id, rows)
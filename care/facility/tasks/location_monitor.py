@@ -5,11 +5,8 @@ from celery import shared_task
 from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
 
-from care.facility.models.asset import (
-    AssetLocation,
-    AvailabilityRecord,
-    AvailabilityStatus,
-)
+from care.facility.models.asset import AssetLocation, AvailabilityStatus
+from care.facility.utils.availability.history import get_latest_records, record_status
 from care.utils.assetintegration.base import BaseAssetIntegration
 
 logger = logging.getLogger(__name__)
@@ -20,6 +17,7 @@ def check_location_status():
     location_content_type = ContentType.objects.get_for_model(AssetLocation)
     logger.info("Checking Location Status: %s", timezone.now())
     locations = AssetLocation.objects.all()
+    latest_records = get_latest_records(location_content_type)
 
     for location in locations:
         try:
@@ -57,24 +55,14 @@ def check_location_status():
             except Exception as e:
                 logger.warning("Middleware %s is down: %s", resolved_middleware, e)
 
-            # Fetching the last record of the location
-            last_record = (
-                AvailabilityRecord.objects.filter(
-                    content_type=location_content_type,
-                    object_external_id=location.external_id,
-                )
-                .order_by("-timestamp")
-                .first()
-            )
-
             # Creating a new record if the status has changed
-            if not last_record or last_record.status != new_status.value:
-                AvailabilityRecord.objects.create(
-                    content_type=location_content_type,
-                    object_external_id=location.external_id,
-                    status=new_status.value,
-                    timestamp=timezone.now(),
-                )
+            record_status(
+                location_content_type,
+                location.external_id,
+                new_status.value,
+                timezone.now(),
+                latest=latest_records.get(location.external_id),
+            )
             logger.info(
                 "Location %s status: %s", location.external_id, new_status.value
             )
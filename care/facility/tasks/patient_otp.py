@@ -0,0 +1,21 @@
+from celery import shared_task
+
+from care.facility.models.patient import PatientMobileOTP
+
+
+@shared_task
+def save_patient_mobile_otp(external_id, phone_number):
+    # the OTP itself is only kept hashed in Redis
+    PatientMobileOTP.objects.get_or_create(
+        external_id=external_id, defaults={"phone_number": phone_number}
+    )
+
+
+@shared_task
+def mark_patient_mobile_otp_used(external_id, phone_number):
+    # may run before the row is saved, the tasks run in any order
+    PatientMobileOTP.objects.update_or_create(
+        external_id=external_id,
+        defaults={"is_used": True},
+        create_defaults={"phone_number": phone_number, "is_used": True},
+    )
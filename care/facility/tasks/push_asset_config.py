@@ -1,17 +1,38 @@
 """
-This module provides helper functions to push changes in asset configuration to the middleware.
+This module pushes changes in asset configuration to the middlewares.
+
+Changes are enqueued once their transaction commits and coalesced per
+middleware hostname over ASSET_CONFIG_SYNC_DEBOUNCE seconds. A push sends the
+assets whose configuration differs from the one last acknowledged by the
+middleware, over a single connection.
 """
 
+from collections.abc import Iterable
 from logging import Logger
 
 import requests
 from celery import shared_task
 from celery.utils.log import get_task_logger
-
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+
+from care.facility.api.serializers.asset import AssetConfigSerializer
+from care.facility.models.asset import Asset, AssetConfigSync
+from care.utils.cache.response import invalidate_cache_tags, model_tag
 from care.utils.jwks.token_generator import generate_jwt
+from care.utils.lock import Lock, ObjectLocked
+from care.utils.profiling import profile_span
+from care.utils.queryset.asset import get_middleware_asset_queryset
 
 logger: Logger = get_task_logger(__name__)
 
+SYNC_KEY_PREFIX = "asset_config_sync:"
+# pushes failing for longer than this are left to the next change
+SYNC_MAX_RETRIES = 5
+
 
 def _get_headers() -> dict:
     return {
@@ -20,75 +41,155 @@ def _get_headers() -> dict:
     }
 
 
-def create_asset_on_middleware(hostname: str, data: dict) -> dict:
-    if not data.get("ip_address"):
-        logger.error("IP Address is required")
-    try:
-        response = requests.post(
-            f"https://{hostname}/api/assets",
-            json=data,
-            headers=_get_headers(),
-            timeout=25,
+def get_asset_config_tag(facility_id: int, hostname: str) -> str:
+    """
+    Returns the tag of the asset configuration pulled by the middleware at
+    `hostname` for a facility
+    """
+    return model_tag(Asset, facility_id=facility_id, middleware_hostname=hostname)
+
+
+def enqueue_asset_config_sync(middlewares: Iterable[tuple[int, str]]):
+    """
+    Once the transaction commits, invalidates the configuration pulled by the
+    given (facility id, hostname) middlewares and schedules a push to each
+    hostname, unless one is already scheduled
+    """
+    middlewares = {
+        (facility, hostname) for facility, hostname in middlewares if hostname
+    }
+    if not middlewares:
+        return
+
+    def enqueue():
+        invalidate_cache_tags(
+            *(get_asset_config_tag(*middleware) for middleware in middlewares)
         )
-        response.raise_for_status()
-        response_json = response.json()
-        logger.info("Pushed Asset Configuration to Middleware: %s", response_json)
-        return response_json
-    except Exception as e:
-        logger.error("Error Pushing Asset Configuration to Middleware: %s", e)
-        return {"error": str(e)}
+        debounce = settings.ASSET_CONFIG_SYNC_DEBOUNCE
+        for hostname in {hostname for _, hostname in middlewares}:
+            # the key expires in case the task is lost, so that later changes
+            # are still pushed
+            if cache.add(SYNC_KEY_PREFIX + hostname, 1, timeout=debounce + 60):
+                sync_asset_config_task.apply_async((hostname,), countdown=debounce)
 
+    transaction.on_commit(enqueue)
 
-def delete_asset_from_middleware(hostname: str, asset_id: str) -> dict:
+
+def get_middleware_url(hostname: str, path: str, insecure_connection: bool) -> str:
+    protocol = "http"
+    if not insecure_connection or settings.IS_PRODUCTION:
+        protocol += "s"
+    return f"{protocol}://{hostname}/{path}"
+
+
+def push_asset_config(
+    session: requests.Session, hostname: str, insecure: bool, asset_id: str, data: dict
+) -> bool:
+    url = get_middleware_url(hostname, f"api/assets/{asset_id}", insecure)
     try:
-        response = requests.delete(
-            f"https://{hostname}/api/assets/{asset_id}",
-            headers=_get_headers(),
-            timeout=25,
-        )
+        with profile_span("middleware"):
+            response = session.put(url, json=data, timeout=25)
+            if response.status_code == status.HTTP_404_NOT_FOUND:
+                response = session.post(
+                    get_middleware_url(hostname, "api/assets", insecure),
+                    json=data,
+                    timeout=25,
+                )
         response.raise_for_status()
-        response_json = response.json()
-        logger.info("Deleted Asset from Middleware: %s", response_json)
-        return response_json
-    except Exception as e:
-        logger.error("Error Deleting Asset from Middleware: %s", e)
-        return {"error": str(e)}
+    except requests.RequestException as e:
+        logger.error("Error Pushing Asset Configuration to Middleware: %s", e)
+        return False
+    return True
 
 
-def update_asset_on_middleware(hostname: str, asset_id: str, data: dict) -> dict:
-    if not data.get("ip_address"):
-        logger.error("IP Address is required")
-        return {"error": "IP Address is required"}
+def delete_asset_config(
+    session: requests.Session, hostname: str, insecure: bool, asset_id: str
+) -> bool:
+    url = get_middleware_url(hostname, f"api/assets/{asset_id}", insecure)
+    try:
+        with profile_span("middleware"):
+            response = session.delete(url, timeout=25)
+        if response.status_code != status.HTTP_404_NOT_FOUND:
+            response.raise_for_status()
+    except requests.RequestException as e:
+        logger.error("Error Deleting Asset from Middleware: %s", e)
+        return False
+    return True
+
+
+def sync_asset_config(hostname: str) -> bool:
+    """
+    Pushes the assets of the middleware at `hostname` that differ from the
+    configuration it last acknowledged and deletes the ones it no longer
+    has, returning whether every change was acknowledged. Raises
+    ObjectLocked if the middleware is being synced already.
+    """
+    # pushes to a middleware are serialized by a lock on its hostname rather
+    # than by its row, so that no transaction stays open over the requests
+    with Lock(SYNC_KEY_PREFIX + hostname, auto_renew=True):
+        state, _ = AssetConfigSync.objects.get_or_create(hostname=hostname)
+        assets = list(get_middleware_asset_queryset(hostname))
+        configs = {
+            data["id"]: data for data in AssetConfigSerializer(assets, many=True).data
+        }
+        if assets:
+            state.insecure_connection = any(
+                asset.meta.get("insecure_connection") for asset in assets
+            )
+        acknowledged = dict(state.acknowledged)
+        changed = [
+            asset_id
+            for asset_id, data in configs.items()
+            if acknowledged.get(asset_id) != data
+        ]
+        removed = acknowledged.keys() - configs.keys()
+
+        synced = True
+        if changed or removed:
+            with requests.Session() as session:
+                session.headers.update(_get_headers())
+                for asset_id in changed:
+                    if push_asset_config(
+                        session,
+                        hostname,
+                        state.insecure_connection,
+                        asset_id,
+                        configs[asset_id],
+                    ):
+                        acknowledged[asset_id] = configs[asset_id]
+                    else:
+                        synced = False
+                for asset_id in removed:
+                    if delete_asset_config(
+                        session, hostname, state.insecure_connection, asset_id
+                    ):
+                        del acknowledged[asset_id]
+                    else:
+                        synced = False
+            logger.info(
+                "Pushed %s and deleted %s assets on %s",
+                len(changed),
+                len(removed),
+                hostname,
+            )
+
+        state.acknowledged = acknowledged
+        state.synced_date = timezone.now()
+        state.save(update_fields=["acknowledged", "insecure_connection", "synced_date"])
+    return synced
+
+
+@shared_task(bind=True, max_retries=SYNC_MAX_RETRIES)
+def sync_asset_config_task(self, hostname: str):
+    # changes made from here on schedule another push
+    cache.delete(SYNC_KEY_PREFIX + hostname)
     try:
-        response = requests.put(
-            f"https://{hostname}/api/assets/{asset_id}",
-            json=data,
-            headers=_get_headers(),
-            timeout=25,
+        synced = sync_asset_config(hostname)
+    except ObjectLocked:
+        # pushed by a running sync, which may have read the assets before
+        # the changes that scheduled this one
+        synced = False
+    if not synced:
+        raise self.retry(
+            countdown=settings.ASSET_CONFIG_SYNC_DEBOUNCE * 2**self.request.retries
         )
-        response.raise_for_status()
-        response_json = response.json()
-        logger.info("Updated Asset Configuration on Middleware: %s", response_json)
-        return response_json
-    except Exception as e:
-        logger.error("Error Updating Asset Configuration on Middleware: %s", e)
-        return {"error": str(e)}
-
-
-@shared_task
-def push_config_to_middleware_task(
-    hostname: str,
-    asset_id: str,
-    data: dict,
-    old_hostname: str | None = None,
-) -> dict:
-    if not old_hostname:
-        create_asset_on_middleware(hostname, data)
-    if old_hostname != hostname:
-        delete_asset_from_middleware(old_hostname, asset_id)
-    return update_asset_on_middleware(hostname, asset_id, data)
-
-
-@shared_task
-def delete_asset_from_middleware_task(hostname: str, asset_id: str) -> dict:
-    return delete_asset_from_middleware(hostname, asset_id)
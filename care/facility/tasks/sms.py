@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from care.utils.sms.outbox import deliver_pending
+
+
+@shared_task
+def deliver_sms():
+    deliver_pending()
@@ -0,0 +1,233 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from care.facility.models.asset import AssetConfigSync
+from care.facility.tasks.push_asset_config import SYNC_KEY_PREFIX, sync_asset_config
+from care.utils.assetintegration.asset_classes import AssetClasses
+from care.utils.lock import Lock, ObjectLocked
+from care.utils.tests.test_utils import OverrideCache, TestUtils
+from config.authentication import MiddlewareUser
+
+
+class StubMiddlewareHandler(BaseHTTPRequestHandler):
+    # keeps the connection open between the requests of a push
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def respond(self, status_code: int, body: dict | None = None):
+        content = json.dumps(body or {}).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def handle_request(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        server = self.server
+        server.requests.append(
+            {
+                "method": self.command,
+                "path": self.path,
+                "body": body,
+                "client": self.client_address,
+            }
+        )
+        if server.failing:
+            return self.respond(status.HTTP_500_INTERNAL_SERVER_ERROR)
+        asset_id = self.path.removeprefix("/api/assets").strip("/")
+        if self.command == "POST":
+            server.assets[body["id"]] = body
+            return self.respond(status.HTTP_201_CREATED, body)
+        if asset_id not in server.assets:
+            return self.respond(status.HTTP_404_NOT_FOUND)
+        if self.command == "PUT":
+            server.assets[asset_id] = body
+            return self.respond(status.HTTP_200_OK, body)
+        del server.assets[asset_id]
+        return self.respond(status.HTTP_200_OK)
+
+    do_PUT = do_POST = do_DELETE = handle_request  # noqa: N815
+
+
+class StubMiddleware(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubMiddlewareHandler)
+        self.requests = []
+        self.assets = {}
+        self.failing = False
+
+    @property
+    def hostname(self) -> str:
+        return f"127.0.0.1:{self.server_address[1]}"
+
+
+class AssetConfigSyncTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.middleware = StubMiddleware()
+        threading.Thread(target=cls.middleware.serve_forever, daemon=True).start()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        cls.middleware.shutdown()
+        cls.middleware.server_close()
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.super_user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(
+            cls.super_user,
+            cls.district,
+            cls.local_body,
+            middleware_address=cls.middleware.hostname,
+        )
+        cls.location = cls.create_asset_location(cls.facility)
+        cls.other_location = cls.create_asset_location(
+            cls.facility, middleware_address="other-middleware.com"
+        )
+
+    def setUp(self) -> None:
+        self.middleware.requests.clear()
+        self.middleware.assets.clear()
+        self.middleware.failing = False
+
+    def create_monitor(self, name="monitor", **meta):
+        return self.create_asset(
+            self.location,
+            name=name,
+            asset_class=AssetClasses.HL7MONITOR.name,
+            meta={
+                "local_ip_address": "192.168.1.14",
+                "insecure_connection": True,
+                **meta,
+            },
+        )
+
+    def sync(self) -> list[tuple[str, str]]:
+        self.middleware.requests.clear()
+        self.assertTrue(sync_asset_config(self.middleware.hostname))
+        return [(r["method"], r["path"]) for r in self.middleware.requests]
+
+    def test_changes_are_coalesced_per_middleware(self):
+        with (
+            OverrideCache(self),
+            patch(
+                "care.facility.tasks.push_asset_config.sync_asset_config_task.apply_async"
+            ) as apply_async,
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                assets = [self.create_monitor(f"monitor {i}") for i in range(3)]
+                assets[0].name = "renamed"
+                assets[0].save()
+            with self.captureOnCommitCallbacks(execute=True):
+                assets[1].save(update_fields=["name"])
+                # not part of the configuration
+                assets[2].save(update_fields=["serial_number"])
+
+        apply_async.assert_called_once()
+        self.assertEqual(apply_async.call_args.args[0], (self.middleware.hostname,))
+
+    def test_sync_pushes_the_difference(self):
+        first = self.create_monitor("first")
+        second = self.create_monitor("second")
+
+        # unknown to the middleware, created over a single connection
+        requests = self.sync()
+        self.assertCountEqual(
+            requests,
+            [
+                ("PUT", f"/api/assets/{first.external_id}"),
+                ("POST", "/api/assets"),
+                ("PUT", f"/api/assets/{second.external_id}"),
+                ("POST", "/api/assets"),
+            ],
+        )
+        self.assertEqual(len({r["client"] for r in self.middleware.requests}), 1)
+        self.assertEqual(
+            self.middleware.assets[str(first.external_id)]["name"], "first"
+        )
+
+        self.assertEqual(self.sync(), [])
+
+        first.name = "renamed"
+        first.save()
+        self.assertEqual(self.sync(), [("PUT", f"/api/assets/{first.external_id}")])
+        self.assertEqual(
+            self.middleware.assets[str(first.external_id)]["name"], "renamed"
+        )
+
+        first.delete()
+        second.current_location = self.other_location
+        second.save()
+        self.assertCountEqual(
+            self.sync(),
+            [
+                ("DELETE", f"/api/assets/{first.external_id}"),
+                ("DELETE", f"/api/assets/{second.external_id}"),
+            ],
+        )
+        self.assertEqual(self.middleware.assets, {})
+        state = AssetConfigSync.objects.get(hostname=self.middleware.hostname)
+        self.assertEqual(state.acknowledged, {})
+
+    def test_failed_pushes_are_not_acknowledged(self):
+        asset = self.create_monitor()
+        self.middleware.failing = True
+        self.assertFalse(sync_asset_config(self.middleware.hostname))
+        state = AssetConfigSync.objects.get(hostname=self.middleware.hostname)
+        self.assertEqual(state.acknowledged, {})
+
+        self.middleware.failing = False
+        self.assertEqual(
+            self.sync(),
+            [("PUT", f"/api/assets/{asset.external_id}"), ("POST", "/api/assets")],
+        )
+
+    def test_middleware_is_synced_once_at_a_time(self):
+        self.create_monitor()
+        with (
+            OverrideCache(self),
+            Lock(SYNC_KEY_PREFIX + self.middleware.hostname),
+            self.assertRaises(ObjectLocked),
+        ):
+            sync_asset_config(self.middleware.hostname)
+        self.assertEqual(self.middleware.requests, [])
+
+    def test_config_is_revalidated(self):
+        self.client.force_authenticate(user=MiddlewareUser(facility=self.facility))
+        asset = self.create_monitor()
+        url = f"/api/v1/asset_config/?middleware_hostname={self.middleware.hostname}"
+
+        with (
+            OverrideCache(self),
+            patch(
+                "care.facility.tasks.push_asset_config.sync_asset_config_task.apply_async"
+            ),
+        ):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            etag = response["ETag"]
+
+            response = self.client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                asset.name = "renamed"
+                asset.save()
+            response = self.client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data[0]["name"], "renamed")
@@ -1,10 +1,23 @@
+from datetime import timedelta
+
 from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from care.facility.models import AvailabilityRecord
-from care.facility.models.asset import Asset, AssetLocation, AvailabilityStatus
+from care.facility.models.asset import (
+    Asset,
+    AssetLocation,
+    AvailabilityInterval,
+    AvailabilityStatus,
+    LatestAvailabilityRecord,
+)
+from care.facility.utils.availability.history import (
+    compact_records,
+    get_latest_records,
+    record_status,
+)
 from care.utils.tests.test_utils import TestUtils
 
 
@@ -71,3 +84,150 @@ class AvailabilityViewSetTestCase(TestUtils, APITestCase):
             "You do not have access to this asset location's availability records",
         )
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AvailabilityHistoryTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.content_type = ContentType.objects.get_for_model(Asset)
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.super_user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.super_user, cls.district, cls.local_body)
+        cls.user = cls.create_user("staff1", cls.district, home_facility=cls.facility)
+        cls.asset_location = cls.create_asset_location(cls.facility)
+        cls.asset = cls.create_asset(cls.asset_location)
+
+    def record(self, status, timestamp):
+        latest = get_latest_records(self.content_type, [self.asset.external_id])
+        return record_status(
+            self.content_type,
+            self.asset.external_id,
+            status,
+            timestamp,
+            latest=latest.get(self.asset.external_id),
+        )
+
+    def test_record_status_only_stores_changes(self):
+        now = timezone.now()
+        self.record(AvailabilityStatus.OPERATIONAL, now - timedelta(hours=3))
+        self.record(AvailabilityStatus.OPERATIONAL, now - timedelta(hours=2))
+        self.record(AvailabilityStatus.DOWN, now - timedelta(hours=1))
+        # older than the latest record
+        self.record(AvailabilityStatus.OPERATIONAL, now - timedelta(hours=4))
+
+        self.assertEqual(
+            AvailabilityRecord.objects.filter(
+                object_external_id=self.asset.external_id
+            ).count(),
+            2,
+        )
+        latest = LatestAvailabilityRecord.objects.get(
+            object_external_id=self.asset.external_id
+        )
+        self.assertEqual(latest.status, AvailabilityStatus.DOWN)
+        self.assertEqual(latest.timestamp, now - timedelta(hours=1))
+
+    def test_compact_records(self):
+        now = timezone.now()
+        for hours, status_ in [
+            (10, AvailabilityStatus.OPERATIONAL),
+            (8, AvailabilityStatus.DOWN),
+            (6, AvailabilityStatus.OPERATIONAL),
+            (4, AvailabilityStatus.DOWN),
+            (1, AvailabilityStatus.OPERATIONAL),
+        ]:
+            self.record(status_, now - timedelta(hours=hours))
+
+        self.assertEqual(compact_records(now - timedelta(hours=5)), 2)
+        self.assertEqual(
+            list(
+                AvailabilityInterval.objects.order_by("start").values_list(
+                    "status", "start", "end"
+                )
+            ),
+            [
+                (
+                    AvailabilityStatus.OPERATIONAL,
+                    now - timedelta(hours=10),
+                    now - timedelta(hours=8),
+                ),
+                (
+                    AvailabilityStatus.DOWN,
+                    now - timedelta(hours=8),
+                    now - timedelta(hours=6),
+                ),
+            ],
+        )
+        # the record at -6h is kept until a newer record is compacted
+        self.assertEqual(compact_records(now), 2)
+        self.assertEqual(AvailabilityInterval.objects.count(), 4)
+        self.assertEqual(
+            AvailabilityRecord.objects.get(
+                object_external_id=self.asset.external_id
+            ).timestamp,
+            now - timedelta(hours=1),
+        )
+
+    def test_list_includes_compacted_records(self):
+        now = timezone.now()
+        changes = [
+            (AvailabilityStatus.OPERATIONAL, now - timedelta(days=10)),
+            (AvailabilityStatus.DOWN, now - timedelta(days=9)),
+            (AvailabilityStatus.OPERATIONAL, now - timedelta(days=8)),
+            (AvailabilityStatus.DOWN, now - timedelta(hours=1)),
+        ]
+        for status_, timestamp in changes:
+            self.record(status_, timestamp)
+        compact_records(now - timedelta(days=7))
+        self.assertEqual(AvailabilityInterval.objects.count(), 2)
+
+        response = self.client.get(
+            f"/api/v1/asset/{self.asset.external_id}/availability/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(
+            [
+                (change["status"], change["timestamp"])
+                for change in response.data["results"]
+            ],
+            [
+                (
+                    status_,
+                    timestamp.astimezone(timezone.get_current_timezone()).isoformat(),
+                )
+                for status_, timestamp in reversed(changes)
+            ],
+        )
+        self.assertEqual(
+            response.data["results"][-1]["linked_id"], str(self.asset.external_id)
+        )
+        self.assertEqual(response.data["results"][-1]["linked_model"], "asset")
+
+    def test_uptime(self):
+        now = timezone.now()
+        self.record(AvailabilityStatus.OPERATIONAL, now - timedelta(hours=10))
+        self.record(AvailabilityStatus.DOWN, now - timedelta(hours=7))
+        self.record(AvailabilityStatus.OPERATIONAL, now - timedelta(hours=6))
+        compact_records(now - timedelta(hours=6, minutes=30))
+
+        response = self.client.get(
+            f"/api/v1/asset/{self.asset.external_id}/availability/uptime/",
+            {
+                "start": (now - timedelta(hours=8)).isoformat(),
+                "end": (now - timedelta(hours=4)).isoformat(),
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["uptime_percentage"], 75)
+        self.assertEqual(response.data["durations"][AvailabilityStatus.DOWN], 60 * 60)
+
+    def test_uptime_invalid_range(self):
+        now = timezone.now()
+        response = self.client.get(
+            f"/api/v1/asset/{self.asset.external_id}/availability/uptime/",
+            {"start": now.isoformat(), "end": (now - timedelta(hours=1)).isoformat()},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from config.celery_app import app
+
+
+class CeleryTaskRoutingTestCase(SimpleTestCase):
+    def get_queue(self, task_name):
+        return app.amqp.router.route({}, task_name)["queue"].name
+
+    def test_task_routes(self):
+        expected = {
+            "care.utils.notification_handler.notification_task_generator": settings.CELERY_QUEUE_NOTIFICATIONS,
+            "care.utils.notification_handler.send_webpush": settings.CELERY_QUEUE_NOTIFICATIONS,
+            "care.facility.tasks.sms.deliver_sms": settings.CELERY_QUEUE_NOTIFICATIONS,
+            "care.facility.tasks.discharge_summary.generate_discharge_summary_task": settings.CELERY_QUEUE_REPORTS,
+            "care.facility.tasks.discharge_summary.email_discharge_summary_task": settings.CELERY_QUEUE_REPORTS,
+            "care.facility.tasks.external_test.bulk_upsert_external_tests_task": settings.CELERY_QUEUE_REPORTS,
+            "care.facility.tasks.push_asset_config.sync_asset_config_task": settings.CELERY_QUEUE_INTERACTIVE,
+            "care.facility.tasks.consultation_events.create_consultation_events_task": settings.CELERY_QUEUE_INTERACTIVE,
+            "care.facility.tasks.summarisation.summarize_patient": settings.CELERY_QUEUE_MAINTENANCE,
+            "care.facility.tasks.asset_monitor.check_asset_status": settings.CELERY_QUEUE_MAINTENANCE,
+            "care.facility.tasks.redis_index.load_redis_index": settings.CELERY_QUEUE_MAINTENANCE,
+            "care.facility.tasks.cleanup.delete_old_notifications": settings.CELERY_QUEUE_MAINTENANCE,
+            "care.facility.tasks.cleanup.compact_availability_records": settings.CELERY_QUEUE_MAINTENANCE,
+            "care.facility.tasks.cleanup.apply_retention_policies": settings.CELERY_QUEUE_MAINTENANCE,
+        }
+        for task_name, queue in expected.items():
+            with self.subTest(task_name):
+                self.assertEqual(self.get_queue(task_name), queue)
+
+    def test_unrouted_task_uses_default_queue(self):
+        self.assertEqual(
+            self.get_queue("plugin.tasks.some_task"), settings.CELERY_QUEUE_DEFAULT
+        )
+
+    def test_all_queues_declared(self):
+        self.assertEqual(
+            {queue.name for queue in app.conf.task_queues}, set(settings.CELERY_QUEUES)
+        )
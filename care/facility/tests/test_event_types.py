@@ -0,0 +1,129 @@
+from unittest.mock import patch
+
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from care.facility.events.tree import get_event_type_tree
+from care.facility.models.events import EventType, PatientConsultationEvent
+from care.utils.tests.test_utils import OverrideCache, TestUtils
+
+
+class EventTypeTreeTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.user, cls.district, cls.local_body)
+        cls.patient = cls.create_patient(cls.district, cls.facility)
+        cls.consultation = cls.create_consultation(cls.patient, cls.facility)
+
+        cls.root = cls.create_event_type("TEST_ROOT")
+        cls.child = cls.create_event_type("TEST_CHILD", cls.root)
+        cls.grandchild = cls.create_event_type("TEST_GRANDCHILD", cls.child)
+        cls.other_root = cls.create_event_type("TEST_OTHER_ROOT")
+
+    @classmethod
+    def create_event_type(cls, name, parent=None):
+        return EventType.objects.create(name=name, parent=parent, model="DailyRound")
+
+    def create_event(self, event_type):
+        return PatientConsultationEvent.objects.create(
+            consultation=self.consultation,
+            caused_by=self.user,
+            created_date=timezone.now(),
+            taken_at=timezone.now(),
+            object_model="DailyRound",
+            object_id=1,
+            event_type=event_type,
+        )
+
+    def test_paths_are_maintained_on_save(self):
+        self.assertEqual(self.root.path, f"/{self.root.id}/")
+        self.assertEqual(
+            self.grandchild.path,
+            f"/{self.root.id}/{self.child.id}/{self.grandchild.id}/",
+        )
+        self.assertEqual(
+            self.grandchild.get_ancestor_ids(), [self.root.id, self.child.id]
+        )
+
+        self.child.parent = self.other_root
+        self.child.save()
+        self.grandchild.refresh_from_db()
+        self.assertEqual(
+            self.grandchild.path,
+            f"/{self.other_root.id}/{self.child.id}/{self.grandchild.id}/",
+        )
+
+    def test_cannot_move_under_descendant(self):
+        self.root.parent = self.grandchild
+        with self.assertRaises(ValueError):
+            self.root.save()
+
+    def test_descendants_in_a_single_query(self):
+        with self.assertNumQueries(1):
+            descendants = set(self.root.get_descendants())
+        self.assertEqual(descendants, {self.child, self.grandchild})
+
+    def test_tree_snapshot(self):
+        tree = get_event_type_tree()
+        self.assertEqual(
+            tree.get_descendant_ids(self.root.id), {self.child.id, self.grandchild.id}
+        )
+        self.assertEqual(tree.get_subtree_ids(self.grandchild.id), {self.grandchild.id})
+        self.assertEqual(tree.get_children(self.child.id), [self.grandchild])
+
+    def test_tree_snapshot_is_reloaded_on_change(self):
+        with OverrideCache(self):
+            tree = get_event_type_tree()
+            with self.assertNumQueries(0):
+                self.assertIs(get_event_type_tree(), tree)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                leaf = self.create_event_type("TEST_LEAF", self.grandchild)
+            self.assertIn(
+                leaf.id, get_event_type_tree().get_descendant_ids(self.root.id)
+            )
+
+    def test_descendants_api(self):
+        response = self.client.get(f"/api/v1/event_types/{self.root.id}/descendants/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {event_type["id"] for event_type in response.json()},
+            {self.child.id, self.grandchild.id},
+        )
+
+    def test_roots_api(self):
+        response = self.client.get("/api/v1/event_types/roots/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        (root,) = (r for r in response.json() if r["id"] == self.root.id)
+        self.assertEqual(root["children"][0]["id"], self.child.id)
+        self.assertEqual(root["children"][0]["children"][0]["id"], self.grandchild.id)
+        self.assertIsNone(root["children"][0]["children"][0]["children"])
+
+    def test_roots_api_resolves_the_tree_once(self):
+        with patch(
+            "care.facility.api.serializers.events.get_event_type_tree",
+            wraps=get_event_type_tree,
+        ) as tree:
+            response = self.client.get("/api/v1/event_types/roots/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        tree.assert_called_once()
+
+    def test_filter_events_by_event_type_subtree(self):
+        child_event = self.create_event(self.child)
+        grandchild_event = self.create_event(self.grandchild)
+        self.create_event(self.other_root)
+
+        response = self.client.get(
+            f"/api/v1/consultation/{self.consultation.external_id}/events/",
+            {"event_type_subtree": self.child.id},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {event["id"] for event in response.json()["results"]},
+            {str(child_event.external_id), str(grandchild_event.external_id)},
+        )
@@ -1,8 +1,11 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from care.facility.models import PatientExternalTest
-from care.utils.tests.test_utils import TestUtils
+from care.utils.tests.test_utils import OverrideCache, TestUtils
 
 
 class PatientExternalTestViewSetTestCase(TestUtils, APITestCase):
@@ -144,3 +147,122 @@ class PatientExternalTestViewSetTestCase(TestUtils, APITestCase):
             "/api/v1/external_result/bulk_upsert/", sample_data, format="json"
         )
         self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+
+class PatientExternalTestBulkUpsertTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.ward = cls.create_ward(cls.local_body)
+        cls.user = cls.create_super_user("su", cls.district)
+
+    def get_rows(self, count, **kwargs):
+        rows = []
+        for index in range(count):
+            row = self.get_patient_external_test_data(
+                str(self.district), str(self.local_body.name), self.ward.number
+            ).copy()
+            row.update(
+                {
+                    "local_body_type": "municipality",
+                    "srf_id": f"00/EKM/{index:04}",
+                    "name": f"Patient {index}",
+                }
+            )
+            row.update(kwargs)
+            rows.append(row)
+        return rows
+
+    def upload(self, rows):
+        return self.client.post(
+            "/api/v1/external_result/bulk_upsert/",
+            {"sample_tests": rows},
+            format="json",
+        )
+
+    def test_upload_queries_do_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as single:
+            response = self.upload(self.get_rows(1))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        PatientExternalTest.objects.all().delete()
+
+        with CaptureQueriesContext(connection) as many:
+            response = self.upload(self.get_rows(20))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(len(many.captured_queries), len(single.captured_queries))
+        self.assertEqual(PatientExternalTest.objects.count(), 20)
+
+        test = PatientExternalTest.objects.get(srf_id="00/EKM/0003")
+        self.assertEqual(test.district, self.district)
+        self.assertEqual(test.local_body, self.local_body)
+        self.assertEqual(test.ward, self.ward)
+
+    def test_upload_marks_existing_patients(self):
+        self.create_patient(
+            self.district,
+            self.create_facility(self.user, self.district, self.local_body),
+            srf_id="00/ekm/0001",
+        )
+        response = self.upload(self.get_rows(3))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(
+            set(
+                PatientExternalTest.objects.filter(patient_created=True).values_list(
+                    "srf_id", flat=True
+                )
+            ),
+            {"00/EKM/0001"},
+        )
+
+    def test_upload_with_invalid_rows_creates_nothing(self):
+        rows = self.get_rows(3)
+        rows[1]["ward"] = 999
+        response = self.upload(rows)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, [{"ward": ["Ward Does not Exist"]}])
+        self.assertFalse(PatientExternalTest.objects.exists())
+
+    def test_large_upload_runs_as_job(self):
+        with (
+            OverrideCache(self),
+            self.settings(EXTERNAL_TEST_BULK_UPSERT_ASYNC_THRESHOLD=2),
+        ):
+            response = self.upload(self.get_rows(5))
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            job_id = response.data["job_id"]
+
+            response = self.client.get(f"/api/v1/external_result/bulk_upsert/{job_id}/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["status"], "COMPLETED")
+            self.assertEqual(response.data["total"], 5)
+            self.assertEqual(response.data["created"], 5)
+            self.assertEqual(PatientExternalTest.objects.count(), 5)
+
+    def test_large_upload_reports_row_errors(self):
+        with (
+            OverrideCache(self),
+            self.settings(EXTERNAL_TEST_BULK_UPSERT_ASYNC_THRESHOLD=2),
+        ):
+            rows = self.get_rows(5)
+            rows[3]["ward"] = 999
+            response = self.upload(rows)
+            job_id = response.data["job_id"]
+
+            response = self.client.get(f"/api/v1/external_result/bulk_upsert/{job_id}/")
+            self.assertEqual(response.data["status"], "FAILED")
+            self.assertEqual(
+                response.data["errors"],
+                [{"row": 3, "errors": {"ward": ["Ward Does not Exist"]}}],
+            )
+            self.assertFalse(PatientExternalTest.objects.exists())
+
+    def test_job_status_of_other_user(self):
+        with OverrideCache(self):
+            other_user = self.create_super_user("su2", self.district)
+            with override_settings(EXTERNAL_TEST_BULK_UPSERT_ASYNC_THRESHOLD=2):
+                job_id = self.upload(self.get_rows(3)).data["job_id"]
+            self.client.force_login(other_user)
+            response = self.client.get(f"/api/v1/external_result/bulk_upsert/{job_id}/")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -91,3 +91,65 @@ class ConsentFileUploadApiTestCase(TestUtils, APITestCase):
         self.assertEqual(all_files.status_code, status.HTTP_200_OK)
         self.assertEqual(all_files.data["count"], 1)
         self.assertEqual(all_files.data["results"][0]["name"], "Test File")
+
+
+class FileUploadListPermissionTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.super_user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.super_user, cls.district, cls.local_body)
+        cls.other_facility = cls.create_facility(
+            cls.super_user, cls.district, cls.local_body, name="Other Facility"
+        )
+        cls.user = cls.create_user("nurse", cls.district, home_facility=cls.facility)
+        cls.patient = cls.create_patient(
+            cls.district, cls.facility, local_body=cls.local_body
+        )
+        cls.consultations = [
+            cls.create_consultation(cls.patient, cls.facility) for _ in range(3)
+        ]
+        for consultation in cls.consultations:
+            FileUpload.objects.create(
+                name="Test File",
+                internal_name="test.pdf",
+                associating_id=consultation.id,
+                file_type=FileUpload.FileType.CONSULTATION,
+                upload_completed=True,
+            )
+        other_patient = cls.create_patient(
+            cls.district, cls.other_facility, local_body=cls.local_body
+        )
+        cls.other_consultation = cls.create_consultation(
+            other_patient, cls.other_facility
+        )
+
+    def list_files(self, consultations):
+        ids = ",".join(str(c.external_id) for c in consultations)
+        return self.client.get(
+            f"/api/v1/files/?associating_id={ids}&file_type=CONSULTATION"
+        )
+
+    def test_list_files_of_multiple_consultations(self):
+        response = self.list_files(self.consultations)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+
+    def test_permission_queries_do_not_grow_with_ids(self):
+        with self.assertNumQueries(6):
+            self.list_files(self.consultations[:1])
+        with self.assertNumQueries(6):
+            self.list_files(self.consultations)
+
+    def test_list_files_denied_for_any_inaccessible_id(self):
+        response = self.list_files([*self.consultations, self.other_consultation])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["permission"], "denied")
+
+    def test_list_files_denied_for_unknown_id(self):
+        response = self.client.get(
+            "/api/v1/files/?associating_id=invalid&file_type=CONSULTATION"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,177 @@
+import csv
+import gzip
+import tempfile
+from datetime import date
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from care.facility.models import PatientRegistration
+from care.facility.tasks.cleanup import create_history_partitions
+from care.utils.models.history import ChangedHistoricalRecords
+from care.utils.partitions import add_months, ensure_partitions, get_partitions
+from care.utils.tests.test_utils import TestUtils
+
+HISTORY_TABLE = "facility_historicalpatientregistration"
+
+
+class PatientHistoryTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.user, cls.district, cls.local_body)
+        cls.patient = cls.create_patient(cls.district, cls.facility)
+
+    def get_partitions(self):
+        with connection.cursor() as cursor:
+            return get_partitions(cursor, HISTORY_TABLE)
+
+    def test_unchanged_saves_are_not_recorded(self):
+        self.assertEqual(self.patient.history.count(), 1)
+
+        patient = PatientRegistration.objects.get(id=self.patient.id)
+        patient.save()
+        self.assertEqual(patient.history.count(), 1)
+
+        patient.name = "Changed"
+        patient.save()
+        patient.save()
+        self.assertEqual(
+            list(patient.history.values_list("name", flat=True)),
+            ["Changed", self.patient.name],
+        )
+
+    def test_deferred_fields_are_not_loaded(self):
+        patient = PatientRegistration.objects.only("id", "name").get(id=self.patient.id)
+        patient.name = "Changed"
+        patient.save(update_fields=["name", "modified_date"])
+        self.assertEqual(patient.history.first().name, "Changed")
+
+    def test_partitions_are_created_ahead(self):
+        month = timezone.now().date().replace(day=1)
+        with self.settings(HISTORY_PARTITION_MONTHS_AHEAD=6):
+            create_history_partitions()
+        months = set(self.get_partitions().values())
+        self.assertTrue({add_months(month, i) for i in range(7)} <= months)
+
+    def test_rows_are_moved_out_of_the_default_partition(self):
+        with freeze_time("2020-01-15"):
+            self.patient.name = "Old"
+            self.patient.save()
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT count(*) FROM {HISTORY_TABLE}_default"  # noqa: S608
+            )
+            self.assertEqual(cursor.fetchone(), (1,))
+
+        created = ensure_partitions(
+            HISTORY_TABLE, "history_date", date(2020, 1, 1), start=date(2020, 1, 1)
+        )
+        self.assertEqual(created, [f"{HISTORY_TABLE}_p202001"])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT name FROM {HISTORY_TABLE}_p202001"  # noqa: S608
+            )
+            self.assertEqual(cursor.fetchall(), [("Old",)])
+        self.assertEqual(self.patient.history.count(), 2)
+
+    def test_archive_old_partitions(self):
+        with freeze_time("2020-01-15"):
+            self.patient.name = "Old"
+            self.patient.save()
+        ensure_partitions(
+            HISTORY_TABLE, "history_date", date(2020, 1, 1), start=date(2020, 1, 1)
+        )
+        # the deferred foreign key checks of the rows written by the test would
+        # otherwise prevent dropping the partition in the same transaction
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+        with tempfile.TemporaryDirectory() as directory:
+            call_command(
+                "archive_history_partitions",
+                months=1,
+                directory=directory,
+                stdout=StringIO(),
+            )
+            path = Path(directory) / HISTORY_TABLE / f"{HISTORY_TABLE}_p202001.csv.gz"
+            with gzip.open(path, "rt") as archive:
+                rows = list(csv.DictReader(archive))
+
+        self.assertEqual([row["name"] for row in rows], ["Old"])
+        self.assertNotIn(f"{HISTORY_TABLE}_p202001", self.get_partitions())
+        self.assertEqual(self.patient.history.count(), 1)
+
+    def test_history_api_keyset_pagination(self):
+        original_name = self.patient.name
+        for i in range(20):
+            self.patient.name = f"Name {i}"
+            self.patient.save()
+
+        self.client.force_authenticate(self.user)
+        url = f"/api/v1/patient/{self.patient.external_id}/history/"
+        names = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            names.extend(row["name"] for row in response.data["results"])
+            url = response.data["next"]
+
+        self.assertEqual(
+            names, [f"Name {i}" for i in reversed(range(20))] + [original_name]
+        )
+
+
+class HistoryWriteAmplificationTestCase(TestUtils, APITestCase):
+    """
+    Compares the history written for a series of patient saves, most of
+    which (like the saves of consultation updates) leave the patient as it
+    was, with every save recorded as before and with change-only history.
+    """
+
+    saves = 50
+    changing_saves = 5
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.user, cls.district, cls.local_body)
+
+    def measure_history_writes(self) -> tuple[int, int]:
+        patient = self.create_patient(self.district, self.facility)
+        for i in range(self.saves):
+            if i % (self.saves // self.changing_saves) == 0:
+                patient.name = f"Name {i}"
+            patient.save()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT count(*), sum(pg_column_size(history.*)) "  # noqa: S608
+                f"FROM {HISTORY_TABLE} history WHERE id = %s",
+                [patient.id],
+            )
+            return cursor.fetchone()
+
+    def test_write_amplification(self):
+        with patch.object(ChangedHistoricalRecords, "has_changes", return_value=True):
+            rows_before, bytes_before = self.measure_history_writes()
+        rows_after, bytes_after = self.measure_history_writes()
+
+        # one row per save before, one per change (and the creation) after
+        self.assertEqual(rows_before, self.saves + 1)
+        self.assertEqual(rows_after, self.changing_saves + 1)
+        self.assertLess(bytes_after * 5, bytes_before)
@@ -0,0 +1,143 @@
+from datetime import timedelta
+
+from django.utils.timezone import localdate, localtime, now
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from care.facility.models import (
+    FacilityInventoryBurnRate,
+    FacilityInventoryDailyRollup,
+    FacilityInventoryItem,
+    FacilityInventoryLog,
+    FacilityInventoryUnit,
+    FacilityRelatedSummary,
+)
+from care.facility.utils.inventory.rollup import get_burn_rates
+from care.facility.utils.summarization.facility_capacity import (
+    facility_capacity_summary,
+)
+from care.utils.tests.test_utils import TestUtils
+
+
+class FacilityInventoryRollupTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(
+            cls.user, cls.district, cls.local_body, features=[]
+        )
+        cls.unit = FacilityInventoryUnit.objects.create(name="Cylinder")
+        cls.item = FacilityInventoryItem.objects.create(
+            name="Oxygen", default_unit=cls.unit, min_quantity=10
+        )
+        cls.item.allowed_units.add(cls.unit)
+
+    def get_url(self, action=""):
+        return f"/api/v1/facility/{self.facility.external_id}/inventory/{action}"
+
+    def create_log(self, quantity, *, is_incoming):
+        response = self.client.post(
+            self.get_url(),
+            {
+                "item": self.item.id,
+                "unit": self.unit.id,
+                "quantity": quantity,
+                "is_incoming": is_incoming,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return FacilityInventoryLog.objects.get(external_id=response.data["id"])
+
+    def get_rollup(self):
+        return FacilityInventoryDailyRollup.objects.get(
+            facility=self.facility, item=self.item, date=localdate()
+        )
+
+    def test_logs_update_daily_rollup(self):
+        self.create_log(100, is_incoming=True)
+        self.create_log(30, is_incoming=False)
+        self.create_log(20, is_incoming=False)
+
+        rollup = self.get_rollup()
+        self.assertEqual(rollup.incoming, 100)
+        self.assertEqual(rollup.outgoing, 50)
+        self.assertEqual(rollup.end_stock, 50)
+        self.assertEqual(rollup.start_stock, 0)
+        self.assertAlmostEqual(
+            FacilityInventoryBurnRate.objects.get(
+                facility=self.facility, item=self.item
+            ).burn_rate,
+            50 / 24,
+        )
+
+    def test_flag_moves_log_out_of_rollup(self):
+        self.create_log(100, is_incoming=True)
+        log = self.create_log(30, is_incoming=False)
+
+        response = self.client.put(self.get_url(f"{log.external_id}/flag/"))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.get_rollup().outgoing, 0)
+        self.assertEqual(
+            FacilityInventoryBurnRate.objects.get(
+                facility=self.facility, item=self.item
+            ).burn_rate,
+            0,
+        )
+
+        self.client.put(self.get_url(f"{log.external_id}/flag/"))
+        self.assertEqual(self.get_rollup().outgoing, 30)
+
+    def test_delete_last_reverts_rollup(self):
+        self.create_log(100, is_incoming=True)
+        self.create_log(30, is_incoming=False)
+
+        response = self.client.delete(self.get_url(f"delete_last/?item={self.item.id}"))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        rollup = self.get_rollup()
+        self.assertEqual(rollup.incoming, 100)
+        self.assertEqual(rollup.outgoing, 0)
+        self.assertEqual(rollup.end_stock, 100)
+
+    def test_burn_rate_window_slides_over_yesterday(self):
+        today = localdate()
+        FacilityInventoryDailyRollup.objects.create(
+            facility=self.facility,
+            item=self.item,
+            date=today - timedelta(days=1),
+            outgoing=48,
+        )
+        FacilityInventoryDailyRollup.objects.create(
+            facility=self.facility, item=self.item, date=today, outgoing=24
+        )
+        noon = localtime(now()).replace(hour=12, minute=0, second=0, microsecond=0)
+        with self.assertNumQueries(1):
+            burn_rates = get_burn_rates(noon, facility_id=self.facility.id)
+        self.assertAlmostEqual(burn_rates[self.facility.id, self.item.id], 2)
+
+    def test_summary_reads_rollups(self):
+        self.create_log(100, is_incoming=True)
+        self.create_log(24, is_incoming=False)
+
+        response = self.client.get(
+            f"/api/v1/facility/{self.facility.external_id}/inventorysummary/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        summary = response.data["results"][0]
+        self.assertEqual(summary["quantity"], 76)
+        self.assertEqual(summary["total_added"], 100)
+        self.assertEqual(summary["total_consumed"], 24)
+        self.assertEqual(summary["start_stock"], 0)
+        self.assertGreater(summary["burn_rate"], 0)
+
+        facility_capacity_summary()
+        inventory = FacilityRelatedSummary.objects.get(
+            facility=self.facility, s_type="FacilityCapacity"
+        ).data["inventory"][str(self.item.id)]
+        self.assertEqual(inventory["end_stock"], 76)
+        self.assertEqual(inventory["start_stock"], 0)
+        self.assertEqual(inventory["total_added"], 100)
+        self.assertEqual(inventory["total_consumed"], 24)
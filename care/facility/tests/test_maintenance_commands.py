@@ -0,0 +1,65 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from care.facility.models import PatientRegistration
+from care.utils.tests.test_utils import OverrideCache, TestUtils
+
+
+class SyncPatientAgeTestCase(TestUtils, TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.other_district = cls.create_district(cls.create_state())
+        cls.super_user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.super_user, cls.district, cls.local_body)
+        cls.patients = [
+            cls.create_patient(cls.district, cls.facility, local_body=cls.local_body)
+            for _ in range(5)
+        ]
+
+    def setUp(self) -> None:
+        # save() keeps the derived fields in sync, break them with update()
+        PatientRegistration.objects.filter(id__in=[p.id for p in self.patients]).update(
+            year_of_birth=1900,
+            district=self.other_district,
+            state=self.other_district.state,
+        )
+
+    def call_command(self, *args, **kwargs):
+        out = StringIO()
+        call_command("sync_patient_age", *args, stdout=out, **kwargs)
+        return out.getvalue()
+
+    def test_sync_patient_age(self):
+        with OverrideCache(self):
+            history_count = PatientRegistration.history.count()
+            output = self.call_command(batch_size=2)
+
+            self.assertIn("Successfully Synced Age", output)
+            for patient in self.patients:
+                patient.refresh_from_db()
+                self.assertEqual(patient.year_of_birth, 1992)
+                self.assertEqual(patient.district, self.district)
+                self.assertEqual(patient.state, self.state)
+            self.assertEqual(PatientRegistration.history.count(), history_count)
+            self.assertIsNone(cache.get("maintenance_checkpoint:sync_patient_age"))
+
+    def test_updates_batch_in_sql(self):
+        with self.assertNumQueries(6):
+            self.call_command(batch_size=len(self.patients))
+
+    def test_resume_from_checkpoint(self):
+        with OverrideCache(self):
+            checkpoint = self.patients[2].id
+            cache.set("maintenance_checkpoint:sync_patient_age", checkpoint)
+            self.call_command("--resume")
+
+            for patient in self.patients:
+                patient.refresh_from_db()
+                expected = 1900 if patient.id <= checkpoint else 1992
+                self.assertEqual(patient.year_of_birth, expected)
@@ -1,6 +1,8 @@
 import datetime
 from unittest.mock import patch
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import make_aware, now
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -8,11 +10,13 @@ from rest_framework.test import APITestCase
 from care.facility.api.serializers.patient_consultation import MIN_ENCOUNTER_DATE
 from care.facility.models.bed import Bed
 from care.facility.models.encounter_symptom import Symptom
+from care.facility.models.events import EventType, PatientConsultationEvent
 from care.facility.models.file_upload import FileUpload
 from care.facility.models.icd11_diagnosis import (
     ConditionVerificationStatus,
     ICD11Diagnosis,
 )
+from care.facility.models.notification import Notification
 from care.facility.models.patient_base import NewDischargeReasonEnum, SuggestionChoices
 from care.facility.models.patient_consultation import (
     CATEGORY_CHOICES,
@@ -665,3 +669,90 @@ class TestPatientConsultation(TestUtils, APITestCase):
         )
 
         self.assertEqual(consultation.current_bed.bed, bed)
+
+    def create_consultation_with(self, count):
+        diagnoses = ICD11Diagnosis.objects.order_by("id")[:count]
+        symptoms = [symptom for symptom in Symptom if symptom != Symptom.OTHERS]
+        return self.call_create_admission_consultation_api(
+            create_diagnoses=[
+                {
+                    "diagnosis": diagnosis.id,
+                    "is_principal": False,
+                    "verification_status": ConditionVerificationStatus.CONFIRMED,
+                }
+                for diagnosis in diagnoses
+            ],
+            create_symptoms=[
+                {"symptom": symptom, "onset_date": now()}
+                for symptom in symptoms[:count]
+            ],
+        )
+
+    def test_create_consultation_query_budget(self):
+        counts = []
+        for count in (1, 10):
+            with CaptureQueriesContext(connection) as context:
+                res = self.create_consultation_with(count)
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            consultation = PatientConsultation.objects.get(external_id=res.data["id"])
+            self.assertEqual(consultation.diagnoses.count(), count)
+            self.assertEqual(consultation.symptoms.count(), count)
+            counts.append(len(context.captured_queries))
+
+        # diagnoses and symptoms do not add queries, and events and
+        # notifications are not created before responding
+        self.assertEqual(counts[0], counts[1])
+        self.assertLessEqual(counts[1], 50)
+
+    def test_create_consultation_defers_events_and_notifications(self):
+        EventType.objects.create(
+            name="TEST_DIAGNOSIS",
+            model="ConsultationDiagnosis",
+            fields=["verification_status", "is_principal"],
+        )
+        with self.captureOnCommitCallbacks() as callbacks:
+            res = self.create_consultation_with(10)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        consultation = PatientConsultation.objects.get(external_id=res.data["id"])
+        self.assertFalse(
+            PatientConsultationEvent.objects.filter(consultation=consultation).exists()
+        )
+
+        for callback in callbacks:
+            callback()
+        self.assertTrue(
+            PatientConsultationEvent.objects.filter(
+                consultation=consultation, object_model="ConsultationDiagnosis"
+            ).exists()
+        )
+        self.assertTrue(
+            Notification.objects.filter(
+                event=Notification.Event.PATIENT_CONSULTATION_CREATED.value,
+                caused_objects__consultation=str(consultation.external_id),
+            ).exists()
+        )
+
+    def test_deferred_events_do_not_replace_newer_events(self):
+        event_type = EventType.objects.create(
+            name="TEST_TREATMENT_PLAN",
+            model="PatientConsultation",
+            fields=["treatment_plan"],
+        )
+        with self.captureOnCommitCallbacks() as callbacks:
+            res = self.call_create_admission_consultation_api()
+        consultation = PatientConsultation.objects.get(external_id=res.data["id"])
+
+        # updated before the worker creates the events of the creation
+        res = self.update_consultation(consultation, treatment_plan="updated plan")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        for callback in callbacks:
+            callback()
+
+        events = PatientConsultationEvent.objects.filter(
+            consultation=consultation, event_type=event_type
+        )
+        self.assertEqual(events.count(), 2)
+        self.assertEqual(
+            [event.value for event in events.filter(is_latest=True)],
+            [{"treatment_plan": "updated plan"}],
+        )
@@ -0,0 +1,98 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from care.facility.models.notification import Notification
+from care.facility.models.patient_investigation import InvestigationValue
+from care.utils.tests.test_utils import TestUtils
+
+
+class InvestigationValueBatchUpdateTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.super_user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.super_user, cls.district, cls.local_body)
+        cls.user = cls.create_user(
+            "doctor", cls.district, home_facility=cls.facility, user_type=15
+        )
+        cls.patient = cls.create_patient(
+            cls.district, cls.facility, local_body=cls.local_body
+        )
+        cls.consultation = cls.create_consultation(cls.patient, cls.facility)
+        cls.group = cls.create_patient_investigation_group()
+        cls.session = cls.create_patient_investigation_session(cls.user)
+        cls.values = [
+            cls.create_investigation_value(
+                cls.create_patient_investigation(cls.group, name=f"Investigation {i}"),
+                cls.consultation,
+                cls.session,
+                cls.group,
+            )
+            for i in range(10)
+        ]
+
+    def get_url(self):
+        return f"/api/v1/consultation/{self.consultation.external_id}/investigation/batchUpdate/"
+
+    def batch_update(self, values):
+        return self.client.put(
+            self.get_url(),
+            {
+                "investigations": [
+                    {"external_id": str(value.external_id), "value": 10.0 + i}
+                    for i, value in enumerate(values)
+                ]
+            },
+            format="json",
+        )
+
+    def test_batch_update(self):
+        response = self.batch_update(self.values)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        for i, value in enumerate(self.values):
+            value.refresh_from_db()
+            self.assertEqual(value.value, 10.0 + i)
+            self.assertEqual(value.notes, "Sample notes")
+
+    def test_batch_update_queries_do_not_grow_with_values(self):
+        with CaptureQueriesContext(connection) as single:
+            self.batch_update(self.values[:1])
+        with CaptureQueriesContext(connection) as many:
+            self.batch_update(self.values)
+        self.assertEqual(len(many.captured_queries), len(single.captured_queries))
+
+    def test_batch_update_creates_single_notification(self):
+        self.batch_update(self.values)
+        self.assertEqual(
+            Notification.objects.filter(
+                event=Notification.Event.INVESTIGATION_UPDATED.value
+            ).count(),
+            1,
+        )
+
+    def test_batch_update_unknown_value(self):
+        response = self.client.put(
+            self.get_url(),
+            {
+                "investigations": [
+                    {"external_id": str(self.values[0].external_id), "value": 1},
+                    {"external_id": str(self.session.external_id), "value": 1},
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.values[0].refresh_from_db()
+        self.assertEqual(self.values[0].value, 5.0)
+
+    def test_batch_update_discharged_consultation(self):
+        self.consultation.discharge_date = now()
+        self.consultation.save()
+        response = self.batch_update(self.values)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(InvestigationValue.objects.filter(value=10.0).exists())
@@ -0,0 +1,275 @@
+import asyncio
+import json
+from copy import copy
+from unittest import skipUnless
+from unittest.mock import patch
+
+import redis
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from care.facility.api.viewsets.patient_notes_feed import (
+    EMPTY_CURSOR,
+    RECONNECT_DELAY,
+    long_poll_notes,
+    parse_cursor,
+)
+from care.facility.events.handler import create_consultation_events
+from care.facility.models import PatientNotes, PatientNoteThreadChoices
+from care.facility.models.events import EventType, PatientConsultationEvent
+from care.utils.pubsub import RedisBroker
+from care.utils.tests.test_pubsub import redis_available
+from care.utils.tests.test_utils import TestUtils
+
+
+class PatientNotesFeedTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.super_user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.super_user, cls.district, cls.local_body)
+        cls.user = cls.create_user(
+            "doctor1", cls.district, home_facility=cls.facility, user_type=15
+        )
+        cls.facility2 = cls.create_facility(
+            cls.super_user, cls.district, cls.local_body
+        )
+        cls.user2 = cls.create_user(
+            "doctor2", cls.district, home_facility=cls.facility2, user_type=15
+        )
+        cls.patient = cls.create_patient(cls.district, cls.facility)
+        cls.consultation = cls.create_consultation(
+            patient_no="IP5678",
+            patient=cls.patient,
+            facility=cls.facility,
+            created_by=cls.user,
+            suggestion="A",
+            encounter_date=now(),
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.feed_url = f"/api/v1/patient/{self.patient.external_id}/notes/feed/"
+        self.headers = {
+            "authorization": f"Bearer {RefreshToken.for_user(self.user).access_token}"
+        }
+
+    def create_note(self, note: str) -> PatientNotes:
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/v1/patient/{self.patient.external_id}/notes/",
+                data={"note": note, "thread": PatientNoteThreadChoices.DOCTORS},
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return PatientNotes.objects.get(external_id=response.data["id"])
+
+    def poll(self, *, etag=None, **params):
+        headers = {"HTTP_AUTHORIZATION": self.headers["authorization"]}
+        if etag:
+            headers["HTTP_IF_NONE_MATCH"] = etag
+        return self.client.get(
+            self.feed_url,
+            {"thread": PatientNoteThreadChoices.DOCTORS, **params},
+            **headers,
+        )
+
+    async def open_stream(self, **params):
+        response = await self.async_client.get(
+            self.feed_url,
+            {"thread": PatientNoteThreadChoices.DOCTORS, **params},
+            headers={**self.headers, "accept": "text/event-stream"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        # sent once subscribed
+        self.assertEqual(await anext(stream), f"retry: {RECONNECT_DELAY}\n\n".encode())
+        return stream
+
+    def parse_event(self, chunk: bytes) -> tuple[str, dict]:
+        fields = dict(
+            line.split(": ", 1) for line in chunk.decode().strip().splitlines()
+        )
+        self.assertEqual(fields["event"], "note")
+        return fields["id"], json.loads(fields["data"])
+
+    def test_stream_replays_then_streams_notes(self):
+        first = self.create_note("first")
+
+        async def read():
+            stream = await self.open_stream(since=EMPTY_CURSOR)
+            replayed = await anext(stream)
+            await sync_to_async(self.create_note)("second")
+            return replayed, await anext(stream)
+
+        replayed, live = async_to_sync(read)()
+        cursor, data = self.parse_event(replayed)
+        self.assertEqual(cursor, first.modified_date.isoformat())
+        self.assertEqual(data["id"], str(first.external_id))
+        self.assertEqual(data["note"], "first")
+        self.assertEqual(self.parse_event(live)[1]["note"], "second")
+
+    def test_stream_sends_edits(self):
+        note = self.create_note("first")
+
+        async def read():
+            stream = await self.open_stream()
+            await sync_to_async(self.edit_note)(note, "edited")
+            return await anext(stream)
+
+        cursor, data = self.parse_event(async_to_sync(read)())
+        note.refresh_from_db()
+        self.assertEqual(cursor, note.modified_date.isoformat())
+        self.assertEqual(data["note"], "edited")
+
+    def edit_note(self, note: PatientNotes, text: str):
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(
+                f"/api/v1/patient/{self.patient.external_id}/notes/{note.external_id}/",
+                data={"note": text},
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_idle_stream_does_not_query(self):
+        def count_queries(ticks: int) -> int:
+            async def read():
+                stream = await self.open_stream(since=EMPTY_CURSOR)
+                for _ in range(ticks):
+                    self.assertEqual(await anext(stream), b": keep-alive\n\n")
+
+            with CaptureQueriesContext(connection) as queries:
+                async_to_sync(read)()
+            return len(queries)
+
+        with self.settings(PATIENT_NOTES_FEED_HEARTBEAT=0.01):
+            # the permission check and the replay, whatever the idle time
+            self.assertEqual(count_queries(1), count_queries(10))
+
+    @skipUnless(redis_available(), "needs a Redis server at REDIS_URL")
+    def test_stream_over_redis(self):
+        with patch(
+            "care.facility.api.viewsets.patient_notes_feed.get_broker",
+            return_value=RedisBroker(settings.REDIS_URL),
+        ):
+            self.test_stream_replays_then_streams_notes()
+            self.test_idle_stream_does_not_query()
+
+    def test_notes_are_saved_when_publishing_fails(self):
+        with (
+            patch(
+                "care.facility.api.viewsets.patient_notes_feed.get_broker"
+            ) as get_broker,
+            self.assertLogs(level="ERROR"),
+        ):
+            get_broker.return_value.publish.side_effect = redis.ConnectionError
+            note = self.create_note("first")
+        self.assertEqual(note.note, "first")
+
+    def test_deferred_note_events_do_not_replace_newer_events(self):
+        event_type = EventType.objects.create(
+            name="TEST_NOTE", model="PatientNotes", fields=["note"]
+        )
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(
+                f"/api/v1/patient/{self.patient.external_id}/notes/",
+                data={"note": "first", "thread": PatientNoteThreadChoices.DOCTORS},
+            )
+        note = PatientNotes.objects.get(external_id=response.data["id"])
+
+        # recorded before the worker creates the event of the creation
+        old_note = copy(note)
+        note.note = "edited"
+        note.save()
+        create_consultation_events(
+            note.consultation_id, note, self.user.id, note.modified_date, old=old_note
+        )
+        for callback in callbacks:
+            callback()
+
+        events = PatientConsultationEvent.objects.filter(event_type=event_type)
+        self.assertEqual(events.count(), 2)
+        self.assertEqual(
+            [event.value for event in events.filter(is_latest=True)],
+            [{"note": "edited"}],
+        )
+
+    def test_long_poll(self):
+        response = self.poll()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"results": []})
+        self.assertEqual(response["ETag"], f'"{EMPTY_CURSOR}"')
+        etag = response["ETag"]
+
+        with self.settings(PATIENT_NOTES_LONG_POLL_TIMEOUT=0.01):
+            response = self.poll(etag=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+        note = self.create_note("first")
+        response = self.poll(etag=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([n["note"] for n in response.json()["results"]], ["first"])
+        self.assertEqual(response["ETag"], f'"{note.modified_date.isoformat()}"')
+
+        response = self.poll()
+        self.assertEqual(response["ETag"], f'"{note.modified_date.isoformat()}"')
+
+    def test_long_poll_waits_for_notes(self):
+        since = parse_cursor(self.poll()["ETag"])
+
+        async def wait():
+            # through the client the wait would hold the thread the synchronous
+            # middlewares run the request in, which is the thread of the test
+            poll = asyncio.create_task(
+                long_poll_notes(self.patient, PatientNoteThreadChoices.DOCTORS, since)
+            )
+            await asyncio.sleep(0.1)
+            await sync_to_async(self.create_note)("first")
+            return await poll
+
+        with self.settings(PATIENT_NOTES_LONG_POLL_TIMEOUT=5):
+            response = async_to_sync(wait)()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [n["note"] for n in json.loads(response.content)["results"]], ["first"]
+        )
+
+    def test_feed_permissions(self):
+        self.client.logout()
+        response = self.client.get(self.feed_url, {"thread": 10})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.headers = {
+            "authorization": f"Bearer {RefreshToken.for_user(self.user2).access_token}"
+        }
+        self.assertEqual(self.poll().status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_wsgi_does_not_stream_or_wait(self):
+        response = self.client.get(
+            self.feed_url,
+            {"thread": PatientNoteThreadChoices.DOCTORS},
+            headers={**self.headers, "accept": "text/event-stream"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+
+        etag = self.poll()["ETag"]
+        with self.settings(PATIENT_NOTES_LONG_POLL_TIMEOUT=60):
+            response = self.poll(etag=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_invalid_parameters(self):
+        response = self.poll(thread=30)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.poll(since="yesterday")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
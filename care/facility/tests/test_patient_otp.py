@@ -0,0 +1,187 @@
+import time
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from care.facility.models.patient import PatientMobileOTP
+from care.facility.utils import patient_otp
+
+PHONE_NUMBER = "+919876543210"
+OTP = "45612"
+
+
+class FakeRedis:
+    """
+    In process stand in for the few Redis commands used by RedisOTPStore,
+    running a Python port of the sliding window script.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.sorted_sets = {}
+
+    def register_script(self, script):
+        return self.sliding_window
+
+    def sliding_window(self, keys, args):
+        now, window, member, *limits = args
+        for i, key in enumerate(keys, start=1):
+            entries = self.sorted_sets.setdefault(key, {})
+            for expired in [m for m, score in entries.items() if score <= now - window]:
+                del entries[expired]
+            if len(entries) >= limits[i - 1]:
+                return i
+        for key in keys:
+            self.sorted_sets[key][member] = now
+        return 0
+
+    def set(self, key, value, ex):
+        self.values[key] = (value.encode(), time.time() + ex.total_seconds())
+
+    def getdel(self, key):
+        value, expiry = self.values.pop(key, (None, 0))
+        return value if expiry > time.time() else None
+
+
+class PatientMobileOTPTestCase(APITestCase):
+    def request_otp(self, phone_number=PHONE_NUMBER, ip="10.0.0.1"):
+        return self.client.post(
+            "/api/v1/otp/token/", {"phone_number": phone_number}, REMOTE_ADDR=ip
+        )
+
+    def login(self, otp=OTP, phone_number=PHONE_NUMBER):
+        return self.client.post(
+            "/api/v1/otp/token/login/", {"phone_number": phone_number, "otp": otp}
+        )
+
+    def test_otp_login(self):
+        response = self.request_otp()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {"phone_number": PHONE_NUMBER})
+
+        self.assertEqual(self.login("00000").status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.data)
+        self.assertEqual(self.login().status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(OTP_MAX_REPEATS_WINDOW=2)
+    def test_otp_requests_are_limited_per_phone_number(self):
+        for _ in range(2):
+            self.assertEqual(self.request_otp().status_code, status.HTTP_201_CREATED)
+        response = self.request_otp()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("phone_number", response.data)
+
+
+@mock.patch.object(patient_otp, "get_redis_client")
+class RedisPatientMobileOTPTestCase(PatientMobileOTPTestCase):
+    def setUp(self) -> None:
+        self.redis = FakeRedis()
+
+    def test_otp_login(self, get_redis_client):
+        get_redis_client.return_value = self.redis
+        with self.captureOnCommitCallbacks(execute=True):
+            super().test_otp_login()
+
+        otp = PatientMobileOTP.objects.get()
+        self.assertEqual(otp.phone_number, PHONE_NUMBER)
+        self.assertTrue(otp.is_used)
+        # only a keyed hash of the OTP is stored
+        self.assertEqual(otp.otp, "")
+        self.assertNotIn(OTP, str(self.redis.values))
+
+    @override_settings(OTP_MAX_REPEATS_WINDOW=2)
+    def test_otp_requests_are_limited_per_phone_number(self, get_redis_client):
+        get_redis_client.return_value = self.redis
+        super().test_otp_requests_are_limited_per_phone_number()
+        # other numbers are not affected
+        self.assertEqual(
+            self.request_otp("+919876543211").status_code, status.HTTP_201_CREATED
+        )
+
+    @override_settings(OTP_MAX_REPEATS_IP_WINDOW=2)
+    def test_otp_requests_are_limited_per_ip(self, get_redis_client):
+        get_redis_client.return_value = self.redis
+        for phone_number in ("+919876543210", "+919876543211"):
+            response = self.request_otp(phone_number)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.request_otp("+919876543212")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.request_otp("+919876543212", ip="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @override_settings(OTP_MAX_REPEATS_IP_WINDOW=1)
+    @override_settings(OTP_CLIENT_IP_HEADER="X-Forwarded-For")
+    def test_client_ip_is_read_from_proxy_header(self, get_redis_client):
+        get_redis_client.return_value = self.redis
+
+        def request_otp(phone_number, forwarded_for):
+            return self.client.post(
+                "/api/v1/otp/token/",
+                {"phone_number": phone_number},
+                REMOTE_ADDR="10.0.0.1",
+                HTTP_X_FORWARDED_FOR=forwarded_for,
+            )
+
+        response = request_otp("+919876543210", "1.1.1.1, 192.168.0.1")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # the addresses before the one added by the proxy are not trusted
+        response = request_otp("+919876543211", "2.2.2.2, 192.168.0.1")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = request_otp("+919876543211", "192.168.0.2")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_ip_limit_is_opt_in(self, get_redis_client):
+        get_redis_client.return_value = self.redis
+        for i in range(3):
+            response = self.request_otp(f"+91987654321{i}")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(any(":ip:" in key for key in self.redis.sorted_sets))
+
+    @override_settings(OTP_MAX_REPEATS_WINDOW=1)
+    def test_rejected_requests_do_not_count(self, get_redis_client):
+        get_redis_client.return_value = self.redis
+        self.request_otp()
+        for _ in range(3):
+            self.request_otp()
+        key = patient_otp.RATE_LIMIT_KEY.format(
+            scope="phone_number", value=PHONE_NUMBER
+        )
+        self.assertEqual(len(self.redis.sorted_sets[key]), 1)
+
+    def test_expired_otp_is_rejected(self, get_redis_client):
+        get_redis_client.return_value = self.redis
+        self.request_otp()
+        with mock.patch.object(time, "time", return_value=time.time() + 7 * 3600):
+            self.assertEqual(self.login().status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_counts_under_load(self, get_redis_client):
+        """
+        Issues and verifies OTPs for many numbers with each store, the Redis
+        store keeps every query off the request path.
+        """
+        requests = 20
+
+        def run(offset):
+            with CaptureQueriesContext(connection) as context:
+                for i in range(offset, offset + requests):
+                    phone_number = f"+9198765{i:05d}"
+                    self.request_otp(phone_number, ip=f"10.0.{i // 250}.{i % 250}")
+                    self.login(phone_number=phone_number)
+            return len(context.captured_queries)
+
+        get_redis_client.return_value = None
+        database_queries = run(0)
+        get_redis_client.return_value = self.redis
+        with self.captureOnCommitCallbacks() as callbacks:
+            redis_queries = run(requests)
+
+        # a count and an insert per OTP request, an update per login
+        self.assertGreaterEqual(database_queries, requests * 3)
+        self.assertEqual(redis_queries, 0)
+        self.assertEqual(len(callbacks), requests * 2)
@@ -3,22 +3,27 @@ import subprocess
 import tempfile
 from datetime import date
 from pathlib import Path
+from unittest.mock import patch
 
 from django.conf import settings
+from django.db import connection
 from django.template.loader import render_to_string
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from PIL import Image
 from rest_framework.test import APIClient
 
 from care.facility.models import (
     ConditionVerificationStatus,
     ICD11Diagnosis,
+    PatientConsultation,
     PrescriptionDosageType,
     PrescriptionType,
 )
+from care.facility.models.file_upload import FileUpload
 from care.facility.utils.reports import discharge_summary
 from care.facility.utils.reports.discharge_summary import compile_typ
-from care.utils.tests.test_utils import TestUtils
+from care.utils.tests.test_utils import OverrideCache, TestUtils
 
 
 def compare_images(image1_path: Path, image2_path: Path) -> bool:
@@ -203,3 +208,109 @@ class TestGenerateDischargeSummaryPDF(TestCase, TestUtils):
 
         # This sorting is test's specific and done in order to keep the values in order
         self.assertTrue(test_compile_typ(data))
+
+
+class TestDischargeSummaryCache(TestCase, TestUtils):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.user, cls.district, cls.local_body)
+        cls.location = cls.create_asset_location(cls.facility)
+        cls.patient = cls.create_patient(
+            cls.district, cls.facility, local_body=cls.local_body
+        )
+        cls.consultation = cls.create_consultation(
+            cls.patient, cls.facility, suggestion="A"
+        )
+        cls.investigation_group = cls.create_patient_investigation_group()
+        cls.investigation_session = cls.create_patient_investigation_session(cls.user)
+        cls.add_summary_entries(1)
+
+    @classmethod
+    def add_summary_entries(cls, n: int):
+        bed = cls.create_bed(cls.facility, cls.location, name=f"Bed {n}", bed_type=n)
+        cls.create_consultation_bed(cls.consultation, bed)
+        cls.create_prescription(cls.consultation, cls.user)
+        cls.create_prescription(
+            cls.consultation, cls.user, prescription_type=PrescriptionType.DISCHARGE
+        )
+        investigation = cls.create_patient_investigation(
+            cls.investigation_group, name=f"Investigation {n}"
+        )
+        cls.create_investigation_value(
+            investigation,
+            cls.consultation,
+            cls.investigation_session,
+            cls.investigation_group,
+        )
+        cls.create_consultation_diagnosis(
+            cls.consultation,
+            ICD11Diagnosis.objects.all()[n],
+            verification_status=ConditionVerificationStatus.CONFIRMED,
+        )
+
+    def render_summary(self) -> int:
+        consultation = PatientConsultation.objects.get(id=self.consultation.id)
+        with CaptureQueriesContext(connection) as context:
+            data = discharge_summary.get_discharge_summary_data(consultation)
+            discharge_summary.render_typ(data)
+        return len(context.captured_queries)
+
+    def test_summary_data_query_count_is_fixed(self):
+        queries = self.render_summary()
+        self.add_summary_entries(2)
+        self.add_summary_entries(3)
+        self.assertEqual(self.render_summary(), queries)
+
+    def test_content_hash_ignores_generation_date(self):
+        data = discharge_summary.get_discharge_summary_data(self.consultation)
+        content_hash = discharge_summary.get_content_hash(data)
+        data["date"] = date(2020, 1, 1)
+        self.assertEqual(discharge_summary.get_content_hash(data), content_hash)
+
+    def test_unchanged_summary_is_reused(self):
+        with (
+            OverrideCache(self),
+            patch.object(FileUpload, "put_object") as put_object,
+            patch(
+                "care.facility.utils.reports.discharge_summary.generate_discharge_summary_pdf"
+            ) as generate_pdf,
+        ):
+            first = discharge_summary.generate_and_upload_discharge_summary(
+                self.consultation
+            )
+            second = discharge_summary.generate_and_upload_discharge_summary(
+                self.consultation
+            )
+            self.assertEqual(first.id, second.id)
+            self.assertEqual(generate_pdf.call_count, 1)
+            self.assertEqual(put_object.call_count, 1)
+
+            self.create_prescription(self.consultation, self.user)
+            third = discharge_summary.generate_and_upload_discharge_summary(
+                self.consultation
+            )
+            self.assertNotEqual(first.id, third.id)
+            self.assertEqual(put_object.call_count, 2)
+
+    def test_archived_summary_is_regenerated(self):
+        with (
+            OverrideCache(self),
+            patch.object(FileUpload, "put_object"),
+            patch(
+                "care.facility.utils.reports.discharge_summary.generate_discharge_summary_pdf"
+            ) as generate_pdf,
+        ):
+            first = discharge_summary.generate_and_upload_discharge_summary(
+                self.consultation
+            )
+            first.is_archived = True
+            first.save()
+            second = discharge_summary.generate_and_upload_discharge_summary(
+                self.consultation
+            )
+            self.assertNotEqual(first.id, second.id)
+            self.assertEqual(generate_pdf.call_count, 2)
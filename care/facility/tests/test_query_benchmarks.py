@@ -0,0 +1,110 @@
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from care.facility.tasks.summarisation import (
+    summarize_district_patient,
+    summarize_facility_capacity,
+    summarize_patient,
+)
+from care.utils.tests.benchmark import BenchmarkMixin, get_benchmark_scale
+from care.utils.tests.test_utils import TestUtils
+
+
+class QueryBenchmarkTestCase(BenchmarkMixin, TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facilities = cls.create_benchmark_dataset(
+            cls.user, cls.district, cls.local_body, scale=get_benchmark_scale()
+        )
+        cls.facility = cls.facilities[0]
+        cls.consultation = (
+            cls.facility.patientregistration_set.first().last_consultation
+        )
+
+    def setUp(self) -> None:
+        self.client.force_authenticate(user=self.user)
+
+    def get(self, url):
+        def _get():
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return _get
+
+    def test_patient_list(self):
+        self.assertBenchmark("patient_list", self.get("/api/v1/patient/"))
+
+    def test_facility_list(self):
+        self.assertBenchmark("facility_list", self.get("/api/v1/facility/"))
+
+    def test_patient_asset_bed_list(self):
+        self.assertBenchmark(
+            "patient_asset_bed_list",
+            self.get(
+                f"/api/v1/facility/{self.facility.external_id}/patient_asset_beds/"
+            ),
+        )
+
+    def test_daily_round_list(self):
+        self.assertBenchmark(
+            "daily_round_list",
+            self.get(
+                f"/api/v1/consultation/{self.consultation.external_id}/daily_rounds/"
+            ),
+        )
+
+    def test_daily_round_create(self):
+        def create():
+            response = self.client.post(
+                f"/api/v1/consultation/{self.consultation.external_id}/daily_rounds/",
+                {
+                    "rounds_type": "NORMAL",
+                    "taken_at": timezone.now().isoformat(),
+                    "bp": {"systolic": 120, "diastolic": 80},
+                    "infusions": [{"name": "Adrenalin", "quantity": 10}],
+                    "iv_fluids": [{"name": "RL", "quantity": 100}],
+                    "feeds": [{"name": "Normal Feed", "quantity": 200}],
+                    "output": [{"name": "Urine", "quantity": 150}],
+                    "nursing": [{"procedure": "oral_care", "description": ""}],
+                    "pressure_sore": [
+                        {"region": "AnteriorHead", "length": 2, "width": 1}
+                    ],
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertBenchmark("daily_round_create", create)
+
+    def test_consultation_event_list(self):
+        self.assertBenchmark(
+            "consultation_event_list",
+            self.get(f"/api/v1/consultation/{self.consultation.external_id}/events/"),
+        )
+
+    def test_patient_save_unchanged(self):
+        patient = self.consultation.patient
+        # records no history, a save only bumping modified_date is an UPDATE
+        self.assertBenchmark("patient_save_unchanged", patient.save)
+
+    def test_patient_history(self):
+        self.assertBenchmark(
+            "patient_history",
+            self.get(
+                f"/api/v1/patient/{self.consultation.patient.external_id}/history/"
+            ),
+        )
+
+    def test_summarize_facility_capacity_task(self):
+        self.assertBenchmark("summarize_facility_capacity", summarize_facility_capacity)
+
+    def test_summarize_patient_task(self):
+        self.assertBenchmark("summarize_patient", summarize_patient)
+
+    def test_summarize_district_patient_task(self):
+        self.assertBenchmark("summarize_district_patient", summarize_district_patient)
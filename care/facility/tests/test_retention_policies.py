@@ -0,0 +1,80 @@
+import gzip
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from freezegun import freeze_time
+
+from care.facility.models import FacilityRelatedSummary
+from care.facility.models.notification import Notification
+from care.facility.tasks.cleanup import apply_retention_policies
+from care.utils.retention import RetentionPolicy, apply_retention_policy
+
+
+class RetentionPolicyTestCase(TestCase):
+    def create_summaries(self, days_ago, count):
+        with freeze_time(timezone.now() - timedelta(days=days_ago)):
+            return [
+                FacilityRelatedSummary.objects.create(
+                    s_type="FacilityCapacity", data={"n": i}
+                )
+                for i in range(count)
+            ]
+
+    def test_deletes_in_batches(self):
+        with freeze_time(timezone.now() - timedelta(days=40)):
+            old = [Notification.objects.create() for _ in range(5)]
+        recent = Notification.objects.create()
+
+        progress = []
+        result = apply_retention_policy(
+            RetentionPolicy("notifications", "facility.Notification", 30),
+            batch_size=2,
+            pause=0,
+            progress=lambda r: progress.append(r.deleted),
+        )
+
+        self.assertEqual(result.deleted, 5)
+        self.assertEqual(result.batches, 3)
+        self.assertEqual(progress, [2, 4, 5])
+        self.assertFalse(Notification.objects.filter(id__in=[n.id for n in old]))
+        self.assertTrue(Notification.objects.filter(id=recent.id).exists())
+
+    def test_batch_size_bounds_queries(self):
+        self.create_summaries(400, 4)
+        policy = RetentionPolicy("summaries", "facility.FacilityRelatedSummary", 365)
+        # one select and one delete per batch, and a final empty select
+        with self.assertNumQueries(5):
+            apply_retention_policy(policy, batch_size=2, pause=0)
+
+    @override_settings(SUMMARY_RETENTION_DAYS=0, RETENTION_BATCH_PAUSE=0)
+    def test_zero_days_keeps_rows(self):
+        self.create_summaries(4000, 2)
+        apply_retention_policies()
+        self.assertEqual(FacilityRelatedSummary.objects.count(), 2)
+
+    @override_settings(
+        SUMMARY_RETENTION_DAYS=365, RETENTION_ARCHIVE=True, RETENTION_BATCH_PAUSE=0
+    )
+    def test_archives_before_deleting(self):
+        old = self.create_summaries(400, 3)
+        self.create_summaries(10, 1)
+        client = MagicMock()
+
+        with patch("care.utils.retention.get_client", return_value=(client, "b")):
+            out = StringIO()
+            call_command("apply_retention_policies", "facility_summaries", stdout=out)
+
+        self.assertIn("facility_summaries: deleted 3 rows in 1 batches", out.getvalue())
+        self.assertEqual(FacilityRelatedSummary.objects.count(), 1)
+        kwargs = client.put_object.call_args.kwargs
+        self.assertTrue(kwargs["Key"].startswith("retention/facility_summaries/"))
+        rows = [
+            json.loads(line)
+            for line in gzip.decompress(kwargs["Body"]).decode().splitlines()
+        ]
+        self.assertEqual({row["id"] for row in rows}, {str(s.id) for s in old})
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from freezegun import freeze_time
+
+from care.facility.models.notification import SMSMessage
+from care.utils.sms.backends import BaseSmsBackend
+from care.utils.sms.backends.locmem import outbox
+from care.utils.sms.outbox import CLAIM_TIMEOUT, deliver_pending
+from care.utils.sms.send_sms import send_sms
+from care.utils.tests.benchmark import BenchmarkMixin, get_benchmark_scale
+
+FAILING_NUMBER = "+919999999999"
+
+
+class FailingSmsBackend(BaseSmsBackend):
+    def send(self, phone_number, message):
+        if phone_number == FAILING_NUMBER:
+            msg = "Throttled"
+            raise RuntimeError(msg)
+        outbox.append((phone_number, message))
+
+
+class WorkerDied(BaseException):
+    pass
+
+
+class DyingSmsBackend(BaseSmsBackend):
+    def send(self, phone_number, message):
+        raise WorkerDied
+
+
+class SMSOutboxTestCase(TestCase):
+    def setUp(self) -> None:
+        outbox.clear()
+
+    def test_send_sms_is_delivered_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            send_sms(
+                ["+919876543210", "+919876543210", "+919876543211", "invalid"],
+                "Hello",
+                many=True,
+            )
+        self.assertEqual(SMSMessage.objects.count(), 2)
+        self.assertEqual(outbox, [])
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(
+            sorted(outbox), [("+919876543210", "Hello"), ("+919876543211", "Hello")]
+        )
+        self.assertEqual(
+            SMSMessage.objects.filter(status=SMSMessage.Status.SENT).count(), 2
+        )
+
+    @override_settings(
+        SMS_BACKEND=f"{__name__}.FailingSmsBackend",
+        SMS_MAX_ATTEMPTS=2,
+        SMS_RETRY_DELAY=60,
+    )
+    def test_failed_messages_are_retried(self):
+        send_sms([FAILING_NUMBER, "+919876543210"], "Hello", many=True)
+
+        result = deliver_pending(batch_size=1)
+        self.assertEqual((result.sent, result.retried, result.failed), (1, 1, 0))
+        sms = SMSMessage.objects.get(phone_number=FAILING_NUMBER)
+        self.assertEqual(sms.status, SMSMessage.Status.PENDING)
+        self.assertIn("Throttled", sms.last_error)
+
+        # not due yet
+        self.assertEqual(deliver_pending().retried, 0)
+
+        with freeze_time(timezone.now() + timedelta(seconds=61)):
+            result = deliver_pending()
+        self.assertEqual(result.failed, 1)
+        sms.refresh_from_db()
+        self.assertEqual(sms.status, SMSMessage.Status.FAILED)
+        self.assertEqual(sms.attempts, 2)
+        self.assertEqual(outbox, [("+919876543210", "Hello")])
+
+    def test_claimed_messages_are_sent_again_when_the_claim_expires(self):
+        send_sms(["+919876543210"], "Hello", many=True)
+        with (
+            override_settings(SMS_BACKEND=f"{__name__}.DyingSmsBackend"),
+            self.assertRaises(WorkerDied),
+        ):
+            deliver_pending()
+
+        # claimed by the worker that died
+        self.assertEqual(deliver_pending().sent, 0)
+        with freeze_time(timezone.now() + CLAIM_TIMEOUT):
+            self.assertEqual(deliver_pending().sent, 1)
+        self.assertEqual(outbox, [("+919876543210", "Hello")])
+
+
+class SMSFanOutBenchmarkTestCase(BenchmarkMixin, TestCase):
+    """
+    Queues and delivers a message to 1000 numbers per BENCHMARK_SCALE, run
+    with BENCHMARK_SCALE=10 for the fan-out to 10k numbers.
+    """
+
+    benchmark_iterations = 3
+
+    def test_sms_fan_out(self):
+        count = 1000 * get_benchmark_scale()
+        phone_numbers = [f"+9198{i:08d}" for i in range(count)]
+
+        def fan_out():
+            outbox.clear()
+            send_sms(phone_numbers, "Hello", many=True)
+            deliver_pending()
+            self.assertEqual(len(outbox), count)
+
+        self.assertBenchmark("sms_fan_out", fan_out)
@@ -0,0 +1,210 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import datetime
+from itertools import groupby, pairwise
+from uuid import UUID
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from care.facility.models.asset import (
+    AvailabilityInterval,
+    AvailabilityRecord,
+    AvailabilityStatus,
+    LatestAvailabilityRecord,
+)
+
+COMPACTION_BATCH_SIZE = 1000
+
+
+def get_latest_records(
+    content_type: ContentType, external_ids: Iterable[UUID] | None = None
+) -> dict[UUID, LatestAvailabilityRecord]:
+    queryset = LatestAvailabilityRecord.objects.filter(content_type=content_type)
+    if external_ids is not None:
+        queryset = queryset.filter(object_external_id__in=external_ids)
+    return {record.object_external_id: record for record in queryset}
+
+
+@transaction.atomic
+def record_status(
+    content_type: ContentType,
+    external_id: UUID,
+    status: AvailabilityStatus,
+    timestamp: datetime,
+    latest: LatestAvailabilityRecord | None,
+) -> LatestAvailabilityRecord:
+    """
+    Records the status of an object if it changed since its latest record
+    (as loaded by get_latest_records), returning the new latest record.
+    """
+    if latest and (latest.status == status or timestamp <= latest.timestamp):
+        return latest
+
+    AvailabilityRecord.objects.create(
+        content_type=content_type,
+        object_external_id=external_id,
+        status=status,
+        timestamp=timestamp,
+    )
+    latest, _ = LatestAvailabilityRecord.objects.update_or_create(
+        object_external_id=external_id,
+        defaults={
+            "content_type": content_type,
+            "status": status,
+            "timestamp": timestamp,
+        },
+    )
+    return latest
+
+
+def compact_records(before: datetime) -> int:
+    """
+    Collapses the availability records older than `before` into intervals,
+    merging consecutive records with the same status. The latest record of
+    each object before `before` is kept, as the end of its interval is only
+    known once a newer record exists. Returns the number of records removed.
+    """
+    # the records are not partitioned by month like the history tables: the
+    # latest record of each object outlives its month, so old partitions could
+    # never be dropped whole, and the unique external_id of BaseModel would
+    # have to include the timestamp
+    records = (
+        AvailabilityRecord.objects.filter(timestamp__lt=before)
+        .order_by("object_external_id", "timestamp")
+        .only("content_type_id", "object_external_id", "status", "timestamp")
+    )
+    compacted = 0
+    by_object = groupby(records.iterator(), key=lambda r: r.object_external_id)
+    while chunk := [
+        (external_id, list(group))
+        for _, (external_id, group) in zip(
+            range(COMPACTION_BATCH_SIZE), by_object, strict=False
+        )
+    ]:
+        compacted += compact_chunk(chunk)
+    return compacted
+
+
+@transaction.atomic
+def compact_chunk(chunk: list[tuple[UUID, list[AvailabilityRecord]]]) -> int:
+    last_intervals = {
+        interval.object_external_id: interval
+        for interval in AvailabilityInterval.objects.filter(
+            object_external_id__in=[external_id for external_id, _ in chunk]
+        )
+        .order_by("object_external_id", "-end")
+        .distinct("object_external_id")
+    }
+    new_intervals, extended_intervals, compacted_ids = [], [], []
+    for external_id, records in chunk:
+        interval = last_intervals.get(external_id)
+        for record, next_record in pairwise(records):
+            if (
+                interval
+                and interval.status == record.status
+                and interval.end == record.timestamp
+            ):
+                interval.end = next_record.timestamp
+                if interval.pk:
+                    extended_intervals.append(interval)
+            else:
+                interval = AvailabilityInterval(
+                    content_type_id=record.content_type_id,
+                    object_external_id=external_id,
+                    status=record.status,
+                    start=record.timestamp,
+                    end=next_record.timestamp,
+                )
+                new_intervals.append(interval)
+            compacted_ids.append(record.id)
+
+    AvailabilityInterval.objects.bulk_create(new_intervals)
+    AvailabilityInterval.objects.bulk_update(set(extended_intervals), ["end"])
+    AvailabilityRecord.objects.filter(id__in=compacted_ids).delete()
+    return len(compacted_ids)
+
+
+def get_status_changes(model: str, external_id: UUID):
+    """
+    Returns the status changes of an object, newest first, read from the
+    records and from the intervals they were compacted into, each interval
+    starting with the record it was compacted from.
+    """
+    linked = {
+        "linked_id": F("object_external_id"),
+        "linked_model": F("content_type__model"),
+    }
+    records = AvailabilityRecord.objects.filter(
+        content_type__model=model, object_external_id=external_id
+    ).values("status", "timestamp", **linked)
+    intervals = AvailabilityInterval.objects.filter(
+        content_type__model=model, object_external_id=external_id
+    ).values("status", timestamp=F("start"), **linked)
+    return records.union(intervals, all=True).order_by("-timestamp")
+
+
+def get_status_durations(
+    external_id: UUID, start: datetime, end: datetime
+) -> dict[str, float]:
+    """
+    Returns the seconds spent in each status between start and end, read from
+    the compacted intervals and the records that are not compacted yet.
+    """
+    end = min(end, timezone.now())
+    periods = [
+        (interval.status, interval.start, interval.end)
+        for interval in AvailabilityInterval.objects.filter(
+            object_external_id=external_id, start__lt=end, end__gt=start
+        )
+    ]
+
+    records = list(
+        AvailabilityRecord.objects.filter(
+            object_external_id=external_id, timestamp__gte=start, timestamp__lt=end
+        ).order_by("timestamp")
+    )
+    # the status at `start` is set by the latest record before it
+    previous = (
+        AvailabilityRecord.objects.filter(
+            object_external_id=external_id, timestamp__lt=start
+        )
+        .order_by("-timestamp")
+        .first()
+    )
+    if previous:
+        records.insert(0, previous)
+    ends = [record.timestamp for record in records[1:]] + [end]
+    periods.extend(
+        (record.status, record.timestamp, period_end)
+        for record, period_end in zip(records, ends, strict=True)
+    )
+
+    durations = defaultdict(float)
+    for status, period_start, period_end in periods:
+        overlap = min(period_end, end) - max(period_start, start)
+        if overlap.total_seconds() > 0:
+            durations[status] += overlap.total_seconds()
+    return dict(durations)
+
+
+def get_uptime(external_id: UUID, start: datetime, end: datetime) -> dict:
+    durations = get_status_durations(external_id, start, end)
+    monitored = sum(
+        seconds
+        for status, seconds in durations.items()
+        if status != AvailabilityStatus.NOT_MONITORED
+    )
+    uptime = None
+    if monitored:
+        uptime = round(
+            durations.get(AvailabilityStatus.OPERATIONAL, 0) / monitored * 100, 2
+        )
+    return {
+        "start": start,
+        "end": end,
+        "uptime_percentage": uptime,
+        "durations": durations,
+    }
@@ -0,0 +1,134 @@
+import enum
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from care.facility.api.serializers.patient_external_test import (
+    GeographyLookup,
+    PatientExternalTestSerializer,
+)
+from care.facility.models import PatientExternalTest
+from care.facility.models.patient import PatientRegistration
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+JOB_DURATION = 24 * 60 * 60  # 1 day
+
+
+class JobStatus(enum.Enum):
+    QUEUED = "QUEUED"
+    VALIDATING = "VALIDATING"
+    INSERTING = "INSERTING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+def job_key(job_id: str):
+    return f"external_test_bulk_upsert_{job_id}"
+
+
+def get_job(job_id: str):
+    return cache.get(job_key(job_id))
+
+
+def set_job(job_id: str, **job):
+    cache.set(job_key(job_id), job, timeout=JOB_DURATION)
+
+
+def update_job(job_id: str, **changes):
+    job = get_job(job_id) or {}
+    job.update(changes)
+    set_job(job_id, **job)
+
+
+def pretty_errors(errors):
+    pretty_errors = defaultdict(list)
+    for attribute in PatientExternalTest.HEADER_CSV_MAPPING:
+        if attribute in errors:
+            for error in errors.get(attribute, ""):
+                pretty_errors[attribute].append(str(error))
+    return dict(pretty_errors)
+
+
+def validate_external_tests(
+    rows: list[dict], on_progress: Callable[[int], None] | None = None
+) -> tuple[list[dict], list[dict]]:
+    """
+    Validates the uploaded rows, resolving geography from lookups shared by
+    all rows. Returns the validated data and the errors of invalid rows as
+    {"row": index, "errors": {...}}.
+    """
+    geography = GeographyLookup()
+    validated, errors = [], []
+    for index, row in enumerate(rows):
+        serializer = PatientExternalTestSerializer(
+            data=row, context={"geography": geography}
+        )
+        if serializer.is_valid():
+            validated.append(serializer.validated_data)
+        else:
+            errors.append(
+                {
+                    "row": index,
+                    "errors": pretty_errors(serializer.errors) or serializer.errors,
+                }
+            )
+        if on_progress and (index + 1) % BATCH_SIZE == 0:
+            on_progress(index + 1)
+    return validated, errors
+
+
+def create_external_tests(
+    validated: list[dict], on_progress: Callable[[int], None] | None = None
+) -> int:
+    """
+    Inserts validated rows in batches, marking tests whose srf id already
+    belongs to a patient. All rows are inserted or none are.
+    """
+    srf_ids = {data["srf_id"].lower() for data in validated if data.get("srf_id")}
+    existing_srf_ids = set(
+        PatientRegistration.objects.annotate(srf_id_lower=Lower("srf_id"))
+        .filter(srf_id_lower__in=srf_ids)
+        .values_list("srf_id_lower", flat=True)
+    )
+    with transaction.atomic():
+        for start in range(0, len(validated), BATCH_SIZE):
+            PatientExternalTest.objects.bulk_create(
+                [
+                    PatientExternalTest(
+                        **data,
+                        patient_created=data.get("srf_id", "").lower()
+                        in existing_srf_ids,
+                    )
+                    for data in validated[start : start + BATCH_SIZE]
+                ]
+            )
+            if on_progress:
+                on_progress(min(start + BATCH_SIZE, len(validated)))
+    return len(validated)
+
+
+def run_bulk_upsert_job(job_id: str, rows: list[dict]):
+    update_job(job_id, status=JobStatus.VALIDATING.value)
+    validated, errors = validate_external_tests(
+        rows, on_progress=lambda n: update_job(job_id, validated=n)
+    )
+    if errors:
+        logger.info("Bulk upsert %s failed with %s invalid rows", job_id, len(errors))
+        update_job(
+            job_id, status=JobStatus.FAILED.value, validated=len(rows), errors=errors
+        )
+        return 0
+
+    update_job(job_id, status=JobStatus.INSERTING.value, validated=len(rows))
+    created = create_external_tests(
+        validated, on_progress=lambda n: update_job(job_id, created=n)
+    )
+    update_job(job_id, status=JobStatus.COMPLETED.value, created=created)
+    logger.info("Bulk upsert %s created %s external tests", job_id, created)
+    return created
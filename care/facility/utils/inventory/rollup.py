@@ -0,0 +1,91 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.db.models import F
+from django.utils.timezone import localdate, localtime, now
+
+from care.facility.models.inventory import (
+    FacilityInventoryDailyRollup,
+    FacilityInventoryLog,
+)
+
+BURN_RATE_WINDOW_HOURS = 24
+
+
+def get_rollup_field(log: FacilityInventoryLog):
+    return "incoming" if log.is_incoming else "outgoing"
+
+
+def record_inventory_log(log: FacilityInventoryLog):
+    """
+    Adds a new inventory log to the daily rollup of its item, should be called
+    in the transaction that creates the log so that the rollup and the logs
+    never disagree.
+    """
+    rollup, _ = FacilityInventoryDailyRollup.objects.select_for_update().get_or_create(
+        facility_id=log.facility_id,
+        item_id=log.item_id,
+        date=localdate(log.created_date),
+    )
+    if not log.probable_accident:
+        field = get_rollup_field(log)
+        setattr(rollup, field, getattr(rollup, field) + log.quantity_in_default_unit)
+    rollup.end_stock = log.current_stock
+    rollup.save()
+
+
+def record_inventory_log_flag(log: FacilityInventoryLog):
+    """
+    Moves a log in or out of the totals of its day after probable_accident
+    has been toggled on it.
+    """
+    field = get_rollup_field(log)
+    quantity = log.quantity_in_default_unit
+    if log.probable_accident:
+        quantity = -quantity
+    FacilityInventoryDailyRollup.objects.filter(
+        facility_id=log.facility_id,
+        item_id=log.item_id,
+        date=localdate(log.created_date),
+    ).update(**{field: F(field) + quantity, "modified_date": now()})
+
+
+def get_daily_rollups(
+    date=None, **filters
+) -> dict[tuple[int, int], FacilityInventoryDailyRollup]:
+    """
+    Returns the rollups of the day (today by default) matching the filters,
+    keyed by (facility id, item id).
+    """
+    rollups = FacilityInventoryDailyRollup.objects.filter(
+        date=date or localdate(), **filters
+    )
+    return {(rollup.facility_id, rollup.item_id): rollup for rollup in rollups}
+
+
+def get_burn_rates(
+    at: datetime | None = None, **filters
+) -> dict[tuple[int, int], float]:
+    """
+    Returns the hourly usage of items over the 24 hours before `at`, keyed by
+    (facility id, item id).
+
+    The window covers today's rollup and the part of yesterday's that has not
+    slid out of it yet, assuming yesterday's usage was spread evenly over the
+    day.
+    """
+    at = localtime(at or now())
+    today = at.date()
+    yesterday = today - timedelta(days=1)
+    elapsed = at - at.replace(hour=0, minute=0, second=0, microsecond=0)
+    yesterday_weight = max(1 - elapsed / timedelta(days=1), 0)
+
+    rollups = FacilityInventoryDailyRollup.objects.filter(
+        date__range=(yesterday, today), **filters
+    ).values_list("facility_id", "item_id", "date", "outgoing")
+
+    burn_rates = defaultdict(float)
+    for facility_id, item_id, date, outgoing in rollups:
+        weight = 1 if date == today else yesterday_weight
+        burn_rates[facility_id, item_id] += outgoing * weight / BURN_RATE_WINDOW_HOURS
+    return dict(burn_rates)
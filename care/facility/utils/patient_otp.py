@@ -0,0 +1,158 @@
+import hashlib
+import hmac
+import time
+from datetime import timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from care.facility.models.patient import PatientMobileOTP
+from care.facility.tasks.patient_otp import (
+    mark_patient_mobile_otp_used,
+    save_patient_mobile_otp,
+)
+from care.utils.cache.client import get_redis_client
+
+RATE_LIMIT_KEY = "patient_otp:rate:{scope}:{value}"
+OTP_KEY = "patient_otp:code:{digest}"
+
+# Sliding window log of the OTPs sent per key, as a sorted set of request ids
+# scored by their timestamp. The request is only counted once it is allowed
+# by every key, and the 1-based index of the first key over its limit is
+# returned otherwise.
+#
+# KEYS: the sorted set of each limited scope
+# ARGV: now (ms), window (ms), request id, followed by the limit of each key
+SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+for i, key in ipairs(KEYS) do
+    redis.call("ZREMRANGEBYSCORE", key, "-inf", now - window)
+    if redis.call("ZCARD", key) >= tonumber(ARGV[i + 3]) then
+        return i
+    end
+end
+for _, key in ipairs(KEYS) do
+    redis.call("ZADD", key, now, ARGV[3])
+    redis.call("PEXPIRE", key, window)
+end
+return 0
+"""
+
+
+def get_otp_window() -> timedelta:
+    return timedelta(hours=settings.OTP_REPEAT_WINDOW)
+
+
+def get_client_ip(request) -> str | None:
+    """
+    Returns the IP of the client, read from the OTP_CLIENT_IP_HEADER header
+    when the application is behind a proxy. Only the last address of the
+    header is used, as it is the one added by the proxy.
+    """
+    if header := settings.OTP_CLIENT_IP_HEADER:
+        return request.headers.get(header, "").rsplit(",", 1)[-1].strip() or None
+    return request.META.get("REMOTE_ADDR")
+
+
+def get_otp_digest(phone_number: str, otp: str) -> str:
+    return hmac.new(
+        settings.SECRET_KEY.encode(), f"{phone_number}:{otp}".encode(), hashlib.sha256
+    ).hexdigest()
+
+
+class DatabaseOTPStore:
+    """
+    Keeps the OTPs in PatientMobileOTP rows, used when the default cache is
+    not backed by Redis.
+    """
+
+    def get_rate_limited_scope(
+        self, phone_number: str, client_ip: str | None
+    ) -> str | None:
+        sent_otps = PatientMobileOTP.objects.filter(
+            created_date__gte=timezone.now() - get_otp_window(),
+            is_used=False,
+            phone_number=phone_number,
+        )
+        if sent_otps.count() >= settings.OTP_MAX_REPEATS_WINDOW:
+            return "phone_number"
+        return None
+
+    def save(self, phone_number: str, otp: str):
+        PatientMobileOTP.objects.create(phone_number=phone_number, otp=otp)
+
+    def verify(self, phone_number: str, otp: str) -> bool:
+        return bool(
+            PatientMobileOTP.objects.filter(
+                phone_number=phone_number, otp=otp, is_used=False
+            ).update(is_used=True)
+        )
+
+
+class RedisOTPStore:
+    """
+    Rate limits and verifies OTPs in Redis without touching the database on
+    the request path. OTPs are stored as a keyed hash expiring with the OTP
+    window, and the PatientMobileOTP audit rows are written by tasks once
+    the request commits.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.sliding_window = client.register_script(SLIDING_WINDOW_SCRIPT)
+
+    def get_rate_limited_scope(
+        self, phone_number: str, client_ip: str | None
+    ) -> str | None:
+        limits = {("phone_number", phone_number): settings.OTP_MAX_REPEATS_WINDOW}
+        if client_ip and settings.OTP_MAX_REPEATS_IP_WINDOW:
+            limits[("ip", client_ip)] = settings.OTP_MAX_REPEATS_IP_WINDOW
+        scopes = list(limits)
+        exceeded = self.sliding_window(
+            keys=[
+                RATE_LIMIT_KEY.format(scope=scope, value=value)
+                for scope, value in scopes
+            ],
+            args=[
+                time.time_ns() // 1_000_000,
+                int(get_otp_window().total_seconds() * 1000),
+                uuid4().hex,
+                *limits.values(),
+            ],
+        )
+        if exceeded:
+            return scopes[exceeded - 1][0]
+        return None
+
+    def save(self, phone_number: str, otp: str):
+        external_id = str(uuid4())
+        self.client.set(
+            OTP_KEY.format(digest=get_otp_digest(phone_number, otp)),
+            external_id,
+            ex=get_otp_window(),
+        )
+        transaction.on_commit(
+            lambda: save_patient_mobile_otp.delay(external_id, phone_number)
+        )
+
+    def verify(self, phone_number: str, otp: str) -> bool:
+        # deleted as it is read, so that an OTP is only accepted once
+        external_id = self.client.getdel(
+            OTP_KEY.format(digest=get_otp_digest(phone_number, otp))
+        )
+        if external_id is None:
+            return False
+        external_id = external_id.decode()
+        transaction.on_commit(
+            lambda: mark_patient_mobile_otp_used.delay(external_id, phone_number)
+        )
+        return True
+
+
+def get_otp_store() -> DatabaseOTPStore | RedisOTPStore:
+    if client := get_redis_client():
+        return RedisOTPStore(client)
+    return DatabaseOTPStore()
@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import subprocess
 import tempfile
@@ -8,7 +9,7 @@ from uuid import uuid4
 from django.conf import settings
 from django.core.cache import cache
 from django.core.mail import EmailMessage
-from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models import Case, IntegerField, Prefetch, Q, Value, When
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -19,6 +20,7 @@ from care.facility.models import (
     EncounterSymptom,
     InvestigationValue,
     PatientConsultation,
+    PatientInvestigationGroup,
     PatientSample,
     Prescription,
     PrescriptionDosageType,
@@ -30,11 +32,11 @@ from care.facility.models.icd11_diagnosis import (
     ACTIVE_CONDITION_VERIFICATION_STATUSES,
     ConditionVerificationStatus,
 )
-from care.facility.static_data.icd11 import get_icd11_diagnosis_object_by_id
 
 logger = logging.getLogger(__name__)
 
 LOCK_DURATION = 2 * 60  # 2 minutes
+SUMMARY_CACHE_DURATION = 7 * 24 * 60 * 60  # 7 days
 
 
 def lock_key(consultation_ext_id: str):
@@ -53,33 +55,53 @@ def clear_lock(consultation_ext_id: str):
     cache.delete(lock_key(consultation_ext_id))
 
 
+def summary_cache_key(consultation_ext_id: str):
+    return f"discharge_summary_file_{consultation_ext_id}"
+
+
+def get_cached_summary_file(consultation_ext_id: str, content_hash: str):
+    """
+    Returns the previously uploaded summary of the consultation if it was
+    generated from the same template input
+    """
+    cached = cache.get(summary_cache_key(consultation_ext_id))
+    if not cached or cached["hash"] != content_hash:
+        return None
+    return FileUpload.objects.filter(
+        id=cached["file_id"],
+        associating_id=consultation_ext_id,
+        file_type=FileUpload.FileType.DISCHARGE_SUMMARY.value,
+        upload_completed=True,
+        is_archived=False,
+    ).first()
+
+
+def set_cached_summary_file(
+    consultation_ext_id: str, content_hash: str, summary_file: FileUpload
+):
+    cache.set(
+        summary_cache_key(consultation_ext_id),
+        {"hash": content_hash, "file_id": summary_file.id},
+        timeout=SUMMARY_CACHE_DURATION,
+    )
+
+
 def get_diagnoses_data(consultation: PatientConsultation):
     entries = (
         consultation.diagnoses.filter(
             verification_status__in=ACTIVE_CONDITION_VERIFICATION_STATUSES
         )
+        .select_related("diagnosis")
         .order_by("-created_date")
-        .values_list(
-            "diagnosis_id",
-            "verification_status",
-            "is_principal",
-        )
     )
 
-    # retrieve diagnosis objects
-    diagnoses = []
-    for entry in entries:
-        diagnose = get_icd11_diagnosis_object_by_id(entry[0])
-        if diagnose:
-            diagnoses.append(diagnose)
     principal, unconfirmed, provisional, differential, confirmed = [], [], [], [], []
 
-    for diagnosis, record in zip(diagnoses, entries, strict=False):
-        _, verification_status, is_principal = record
-
-        diagnosis.verification_status = verification_status
+    for entry in entries:
+        diagnosis = entry.diagnosis
+        verification_status = diagnosis.verification_status = entry.verification_status
 
-        if is_principal:
+        if entry.is_principal:
             principal.append(diagnosis)
         if verification_status == ConditionVerificationStatus.UNCONFIRMED:
             unconfirmed.append(diagnosis)
@@ -113,22 +135,31 @@ def format_duration(duration):
 
 def get_discharge_summary_data(consultation: PatientConsultation):
     logger.info("fetching discharge summary data for %s", consultation.external_id)
-    samples = PatientSample.objects.filter(
-        patient=consultation.patient, consultation=consultation
-    )
+    patient = consultation.patient
+    samples = PatientSample.objects.filter(patient=patient, consultation=consultation)
     symptoms = EncounterSymptom.objects.filter(
         consultation=consultation, onset_date__lt=consultation.encounter_date
     ).exclude(clinical_impression_status=ClinicalImpressionStatus.ENTERED_IN_ERROR)
     diagnoses = get_diagnoses_data(consultation)
-    investigations = InvestigationValue.objects.filter(
-        Q(consultation=consultation.id)
-        & (Q(value__isnull=False) | Q(notes__isnull=False))
+    investigations = (
+        InvestigationValue.objects.filter(
+            Q(consultation=consultation.id)
+            & (Q(value__isnull=False) | Q(notes__isnull=False))
+        )
+        .select_related("investigation")
+        .prefetch_related(
+            Prefetch(
+                "investigation__groups",
+                queryset=PatientInvestigationGroup.objects.order_by("id"),
+            )
+        )
     )
-    medical_history = Disease.objects.filter(patient=consultation.patient)
+    medical_history = Disease.objects.filter(patient=patient)
     prescriptions = (
         Prescription.objects.filter(
             consultation=consultation, prescription_type=PrescriptionType.REGULAR.value
         )
+        .select_related("medicine")
         .annotate(
             order_priority=Case(
                 When(dosage_type=PrescriptionDosageType.PRN.value, then=Value(2)),
@@ -144,6 +175,7 @@ def get_discharge_summary_data(consultation: PatientConsultation):
             consultation=consultation,
             prescription_type=PrescriptionType.DISCHARGE.value,
         )
+        .select_related("medicine")
         .annotate(
             order_priority=Case(
                 When(dosage_type=PrescriptionDosageType.PRN.value, then=Value(2)),
@@ -160,13 +192,13 @@ def get_discharge_summary_data(consultation: PatientConsultation):
         upload_completed=True,
         is_archived=False,
     )
-    admitted_to = set()
-    if ConsultationBed.objects.filter(consultation=consultation).exists():
-        for bed in ConsultationBed.objects.filter(consultation=consultation).order_by(
-            "-created_date"
-        ):
-            admitted_to.add(BedType(bed.bed.bed_type).name)
-        admitted_to = list(admitted_to)
+    # ordered de-duplication keeps the rendered summary (and its hash) stable
+    bed_types = (
+        ConsultationBed.objects.filter(consultation=consultation)
+        .order_by("-created_date")
+        .values_list("bed__bed_type", flat=True)
+    )
+    admitted_to = list(dict.fromkeys(BedType(bed_type).name for bed_type in bed_types))
     if not admitted_to:
         admitted_to = None
 
@@ -177,7 +209,7 @@ def get_discharge_summary_data(consultation: PatientConsultation):
     )
 
     return {
-        "patient": consultation.patient,
+        "patient": patient,
         "samples": samples,
         "symptoms": symptoms,
         "admitted_to": admitted_to,
@@ -196,21 +228,28 @@ def get_discharge_summary_data(consultation: PatientConsultation):
     }
 
 
-def compile_typ(output_file, data):
-    try:
-        logo_path = (
-            Path(settings.BASE_DIR)
-            / "staticfiles"
-            / "images"
-            / "logos"
-            / "black-logo.svg"
-        )
+def render_typ(data) -> str:
+    logo_path = (
+        Path(settings.BASE_DIR) / "staticfiles" / "images" / "logos" / "black-logo.svg"
+    )
+    data["logo_path"] = str(logo_path)
+    return render_to_string(
+        "reports/patient_discharge_summary_pdf_template.typ", context=data
+    )
 
-        data["logo_path"] = str(logo_path)
 
-        content = render_to_string(
-            "reports/patient_discharge_summary_pdf_template.typ", context=data
-        )
+def get_content_hash(data) -> str:
+    """
+    Hash of the rendered template input, ignoring the generation date, used to
+    detect summaries that have not changed since they were last generated
+    """
+    content = render_typ({**data, "date": None})
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def compile_typ(output_file, data):
+    try:
+        content = render_typ(data)
 
         subprocess.run(  # noqa: S603
             [  # noqa: S607
@@ -265,6 +304,16 @@ def generate_and_upload_discharge_summary(consultation: PatientConsultation):
 
         set_lock(consultation.external_id, 10)
         data = get_discharge_summary_data(consultation)
+        content_hash = get_content_hash(data)
+        if cached_file := get_cached_summary_file(
+            str(consultation.external_id), content_hash
+        ):
+            logger.info(
+                "Discharge Summary for %s is unchanged, reusing file id: %s",
+                consultation.external_id,
+                cached_file.id,
+            )
+            return cached_file
         data["date"] = current_date
 
         set_lock(consultation.external_id, 50)
@@ -274,6 +323,9 @@ def generate_and_upload_discharge_summary(consultation: PatientConsultation):
             summary_file.put_object(file, ContentType="application/pdf")
             summary_file.upload_completed = True
             summary_file.save()
+            set_cached_summary_file(
+                str(consultation.external_id), content_hash, summary_file
+            )
             logger.info(
                 "Uploaded Discharge Summary for %s, file id: %s",
                 consultation.external_id,
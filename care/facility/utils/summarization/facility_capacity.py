@@ -1,4 +1,3 @@
-from django.db.models import Sum
 from django.utils.timezone import localtime, now
 
 from care.facility.api.serializers.facility import FacilitySerializer
@@ -9,17 +8,16 @@ from care.facility.models import (
     FacilityRelatedSummary,
     PatientRegistration,
 )
-from care.facility.models.inventory import (
-    FacilityInventoryBurnRate,
-    FacilityInventoryLog,
-    FacilityInventorySummary,
-)
+from care.facility.models.inventory import FacilityInventorySummary
+from care.facility.utils.inventory.rollup import get_burn_rates, get_daily_rollups
 
 
 def facility_capacity_summary():
     capacity_objects = FacilityCapacity.objects.all()
     capacity_summary = {}
     current_date = localtime(now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    rollups = get_daily_rollups()
+    burn_rates = get_burn_rates()
 
     for facility_obj in Facility.objects.all():
         # Calculate Actual Patients Discharged and Live in this Facility
@@ -42,38 +40,19 @@ def facility_capacity_summary():
         temp_inventory_summary_obj = {}
         summary_objs = FacilityInventorySummary.objects.filter(
             facility_id=facility_obj.id
-        )
+        ).select_related("item__default_unit")
         for summary_obj in summary_objs:
-            burn_rate = FacilityInventoryBurnRate.objects.filter(
-                facility_id=facility_obj.id, item_id=summary_obj.item.id
-            ).first()
-            log_query = FacilityInventoryLog.objects.filter(
-                facility_id=facility_obj.id,
-                item_id=summary_obj.item.id,
-                created_date__gte=current_date,
-                probable_accident=False,
-            )
-            end_log = log_query.order_by("-created_date").first()
             end_stock = summary_obj.quantity
-            if end_log:
-                end_stock = end_log.current_stock
             total_consumed = 0
-            temp1 = log_query.filter(is_incoming=False).aggregate(
-                Sum("quantity_in_default_unit")
-            )
-            if temp1:
-                total_consumed = temp1.get("quantity_in_default_unit__sum", 0) or 0
             total_added = 0
-            temp2 = log_query.filter(is_incoming=True).aggregate(
-                Sum("quantity_in_default_unit")
-            )
-            if temp2:
-                total_added = temp2.get("quantity_in_default_unit__sum", 0) or 0
+            if rollup := rollups.get((facility_obj.id, summary_obj.item_id)):
+                end_stock = rollup.end_stock
+                total_consumed = rollup.outgoing
+                total_added = rollup.incoming
 
             start_stock = end_stock - total_added + total_consumed
+            burn_rate = burn_rates.get((facility_obj.id, summary_obj.item_id), 0)
 
-            if burn_rate:
-                burn_rate = burn_rate.burn_rate
             temp_inventory_summary_obj[summary_obj.item.id] = {
                 "item_name": summary_obj.item.name,
                 "stock": summary_obj.quantity,
@@ -1,3 +1,5 @@
+from dataclasses import dataclass, field
+
 from django.core.management import BaseCommand
 from django.db import transaction
 
@@ -7,6 +9,153 @@ from care.security.roles.role import RoleController
 from care.utils.lock import Lock
 
 
+@dataclass
+class SyncPlan:
+    """
+    The rows to write for the database to match the permissions and roles
+    defined in code, rows to create and update are saved together
+    """
+
+    permissions: list[PermissionModel] = field(default_factory=list)
+    roles: list[RoleModel] = field(default_factory=list)
+    role_permissions: list[tuple[tuple[str, str], str]] = field(default_factory=list)
+    stale_permission_ids: list[int] = field(default_factory=list)
+    stale_role_ids: list[int] = field(default_factory=list)
+    stale_role_permission_ids: list[int] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return "\n".join(
+            (
+                f"Permissions: {len(self.permissions)} to save, "
+                f"{len(self.stale_permission_ids)} to delete",
+                f"Roles: {len(self.roles)} to save, "
+                f"{len(self.stale_role_ids)} to delete",
+                f"Role permissions: {len(self.role_permissions)} to create, "
+                f"{len(self.stale_role_permission_ids)} to delete",
+            )
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not any(
+            (
+                self.permissions,
+                self.roles,
+                self.role_permissions,
+                self.stale_permission_ids,
+                self.stale_role_ids,
+                self.stale_role_permission_ids,
+            )
+        )
+
+
+def plan_sync(permissions: dict, roles: list) -> SyncPlan:
+    """
+    Diffs the permissions and roles defined in code against the database,
+    loading each table once
+    """
+    plan = SyncPlan()
+
+    # soft deleted rows are restored instead of conflicting with new ones
+    existing_permissions = {
+        permission.slug: permission
+        for permission in PermissionModel._base_manager.all()  # noqa: SLF001
+    }
+    for slug, metadata in permissions.items():
+        values = {
+            "name": metadata.name,
+            "description": metadata.description,
+            "context": metadata.context.value,
+            "deleted": False,
+        }
+        permission = existing_permissions.pop(slug, None)
+        if permission is None or any(
+            getattr(permission, key) != value for key, value in values.items()
+        ):
+            plan.permissions.append(PermissionModel(slug=slug, **values))
+    plan.stale_permission_ids = [
+        permission.id
+        for permission in existing_permissions.values()
+        if not permission.deleted
+    ]
+
+    existing_roles = {
+        (role.name, role.context): role
+        for role in RoleModel._base_manager.all()  # noqa: SLF001
+    }
+    for role in roles:
+        values = {"description": role.description, "is_system": True, "deleted": False}
+        key = (role.name, role.context.value)
+        role_obj = existing_roles.pop(key, None)
+        if role_obj is None or any(
+            getattr(role_obj, name) != value for name, value in values.items()
+        ):
+            plan.roles.append(RoleModel(name=key[0], context=key[1], **values))
+    plan.stale_role_ids = [
+        role.id for role in existing_roles.values() if not role.deleted
+    ]
+
+    existing_role_permissions = {
+        (role_name, role_context, slug): pk
+        for pk, role_name, role_context, slug in RolePermission.objects.filter(
+            role__deleted=False, permission__deleted=False
+        ).values_list("id", "role__name", "role__context", "permission__slug")
+    }
+    for slug, metadata in permissions.items():
+        for role in metadata.roles:
+            key = (role.name, role.context.value, slug)
+            if existing_role_permissions.pop(key, None) is None:
+                plan.role_permissions.append(((role.name, role.context.value), slug))
+    plan.stale_role_permission_ids = list(existing_role_permissions.values())
+    return plan
+
+
+def apply_sync(plan: SyncPlan):
+    """
+    Writes the plan with a statement per table and operation, whatever the
+    number of permissions and roles
+    """
+    # deleting cascades to the role permissions of the deleted rows
+    if plan.stale_role_permission_ids:
+        RolePermission.objects.filter(id__in=plan.stale_role_permission_ids).delete()
+    if plan.stale_permission_ids:
+        PermissionModel.objects.filter(id__in=plan.stale_permission_ids).delete()
+    if plan.stale_role_ids:
+        RoleModel.objects.filter(id__in=plan.stale_role_ids).delete()
+
+    PermissionModel.objects.bulk_create(
+        plan.permissions,
+        update_conflicts=True,
+        unique_fields=["slug"],
+        update_fields=["name", "description", "context", "deleted", "modified_date"],
+    )
+    RoleModel.objects.bulk_create(
+        plan.roles,
+        update_conflicts=True,
+        unique_fields=["name", "context"],
+        update_fields=["description", "is_system", "deleted", "modified_date"],
+    )
+
+    if plan.role_permissions:
+        slugs = {slug for _, slug in plan.role_permissions}
+        role_keys = {role_key for role_key, _ in plan.role_permissions}
+        permission_ids = dict(
+            PermissionModel.objects.filter(slug__in=slugs).values_list("slug", "id")
+        )
+        role_ids = {
+            (name, context): pk
+            for pk, name, context in RoleModel.objects.filter(
+                name__in={name for name, _ in role_keys}
+            ).values_list("id", "name", "context")
+        }
+        RolePermission.objects.bulk_create(
+            RolePermission(
+                role_id=role_ids[role_key], permission_id=permission_ids[slug]
+            )
+            for role_key, slug in plan.role_permissions
+        )
+
+
 class Command(BaseCommand):
     """
     This command syncs roles, permissions and role-permission mapping to the database.
@@ -16,50 +165,21 @@ class Command(BaseCommand):
 
     help = "Syncs permissions and roles to database"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print the changes without writing them",
+        )
+
     def handle(self, *args, **options):
         permissions = PermissionController.get_permissions()
         roles = RoleController.get_roles()
-        with transaction.atomic(), Lock("sync_permissions_roles", 900):
-            # Create, update permissions and delete old permissions
-            PermissionModel.objects.all().update(temp_deleted=True)
-            for permission, metadata in permissions.items():
-                permission_obj = PermissionModel.objects.filter(slug=permission).first()
-                if not permission_obj:
-                    permission_obj = PermissionModel(slug=permission)
-                permission_obj.name = metadata.name
-                permission_obj.description = metadata.description
-                permission_obj.context = metadata.context.value
-                permission_obj.temp_deleted = False
-                permission_obj.save()
-            PermissionModel.objects.filter(temp_deleted=True).delete()
-            # Create, update roles and delete old roles
-            RoleModel.objects.all().update(temp_deleted=True)
-            for role in roles:
-                role_obj = RoleModel.objects.filter(
-                    name=role.name, context=role.context.value
-                ).first()
-                if not role_obj:
-                    role_obj = RoleModel(name=role.name, context=role.context.value)
-                role_obj.description = role.description
-                role_obj.is_system = True
-                role_obj.temp_deleted = False
-                role_obj.save()
-            RoleModel.objects.filter(temp_deleted=True).delete()
-            # Sync permissions to role
-            RolePermission.objects.all().update(temp_deleted=True)
-            role_cache = {}
-            for permission, metadata in permissions.items():
-                permission_obj = PermissionModel.objects.filter(slug=permission).first()
-                for role in metadata.roles:
-                    if role.name not in role_cache:
-                        role_cache[role.name] = RoleModel.objects.get(name=role.name)
-                    obj = RolePermission.objects.filter(
-                        role=role_cache[role.name], permission=permission_obj
-                    ).first()
-                    if not obj:
-                        obj = RolePermission(
-                            role=role_cache[role.name], permission=permission_obj
-                        )
-                    obj.temp_deleted = False
-                    obj.save()
-            RolePermission.objects.filter(temp_deleted=True).delete()
+        # held until the transaction commits, and renewed while the sync runs
+        with Lock("sync_permissions_roles", 60, auto_renew=True), transaction.atomic():
+            plan = plan_sync(permissions, roles)
+            self.stdout.write(str(plan))
+            if options["dry_run"] or plan.is_empty:
+                return
+            apply_sync(plan)
+        self.stdout.write(self.style.SUCCESS("Synced permissions and roles"))
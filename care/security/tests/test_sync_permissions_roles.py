@@ -0,0 +1,95 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from care.security.models import PermissionModel, RoleModel, RolePermission
+from care.security.permissions.base import (
+    Permission,
+    PermissionContext,
+    PermissionController,
+)
+from care.security.roles.role import DOCTOR_ROLE, STAFF_ROLE
+
+
+def get_permissions(count):
+    return {
+        f"can_test_{i}": Permission(
+            f"Can Test {i}",
+            "Test permission",
+            PermissionContext.FACILITY,
+            [STAFF_ROLE, DOCTOR_ROLE] if i % 2 else [STAFF_ROLE],
+        )
+        for i in range(count)
+    }
+
+
+class SyncPermissionsRolesTestCase(TestCase):
+    def sync(self, permissions, *args):
+        out = StringIO()
+        with mock.patch.object(
+            PermissionController, "get_permissions", return_value=permissions
+        ):
+            call_command("sync_permissions_roles", *args, stdout=out)
+        return out.getvalue()
+
+    def assert_synced(self, permissions):
+        self.assertEqual(
+            set(PermissionModel.objects.values_list("slug", flat=True)),
+            set(permissions),
+        )
+        self.assertEqual(
+            set(RolePermission.objects.values_list("role__name", "permission__slug")),
+            {
+                (role.name, slug)
+                for slug, permission in permissions.items()
+                for role in permission.roles
+            },
+        )
+
+    def test_sync(self):
+        permissions = get_permissions(4)
+        self.sync(permissions)
+        self.assert_synced(permissions)
+        self.assertEqual(
+            set(RoleModel.objects.values_list("name", "is_system")),
+            {(DOCTOR_ROLE.name, True), (STAFF_ROLE.name, True)},
+        )
+
+        # renamed, removed and remapped permissions
+        permissions = get_permissions(3)
+        permissions["can_test_0"].name = "Renamed"
+        permissions["can_test_2"].roles = [DOCTOR_ROLE]
+        self.sync(permissions)
+        self.assert_synced(permissions)
+        self.assertEqual(PermissionModel.objects.get(slug="can_test_0").name, "Renamed")
+
+    def test_soft_deleted_permission_is_restored(self):
+        permissions = get_permissions(1)
+        self.sync(permissions)
+        PermissionModel.objects.update(deleted=True)
+        self.sync(permissions)
+        self.assert_synced(permissions)
+
+    def test_dry_run(self):
+        output = self.sync(get_permissions(4), "--dry-run")
+        self.assertIn("Permissions: 4 to save, 0 to delete", output)
+        self.assertIn("Role permissions: 6 to create, 0 to delete", output)
+        self.assertFalse(PermissionModel.objects.exists())
+
+    def test_constant_queries(self):
+        query_counts = []
+        for count in (5, 50):
+            RolePermission.objects.all().delete()
+            PermissionModel.objects.all().delete()
+            RoleModel.objects.all().delete()
+            with CaptureQueriesContext(connection) as context:
+                self.sync(get_permissions(count))
+            query_counts.append(len(context.captured_queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+
+        with self.assertNumQueries(3 + 2):  # the tables and a savepoint
+            self.sync(get_permissions(50))
@@ -11,7 +11,7 @@ from care.users.api.serializers.lsg import (
     StateSerializer,
 )
 from care.users.api.serializers.skill import UserSkillSerializer
-from care.users.models import GENDER_CHOICES, User
+from care.users.models import GENDER_CHOICES, User, UserFlag
 from care.utils.file_uploads.cover_image import upload_cover_image
 from care.utils.models.validators import (
     cover_image_validator,
@@ -19,6 +19,7 @@ from care.utils.models.validators import (
 )
 from care.utils.queryset.facility import get_home_facility_queryset
 from care.utils.serializers.fields import ChoiceField, ExternalIdSerializerField
+from care.utils.serializers.flags import FlagListSerializer, FlagsSerializerMixin
 
 
 class SignUpSerializer(serializers.ModelSerializer):
@@ -278,7 +279,7 @@ class UserCreateSerializer(SignUpSerializer):
             return user
 
 
-class UserSerializer(SignUpSerializer):
+class UserSerializer(FlagsSerializerMixin, SignUpSerializer):
     user_type = ChoiceField(choices=User.TYPE_CHOICES, read_only=True)
     created_by = serializers.CharField(source="created_by_user", read_only=True)
     is_superuser = serializers.BooleanField(read_only=True)
@@ -297,12 +298,14 @@ class UserSerializer(SignUpSerializer):
     date_of_birth = serializers.DateField(required=True)
 
     user_flags = serializers.SerializerMethodField()
+    flag_model = UserFlag
 
     def get_user_flags(self, user) -> tuple[str]:
-        return user.get_all_flags()
+        return self.get_flags(user)
 
     class Meta:
         model = User
+        list_serializer_class = FlagListSerializer
         fields = (
             "id",
             "username",
@@ -1,5 +1,3 @@
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django_filters import rest_framework as filters
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import mixins
@@ -16,6 +14,7 @@ from care.users.api.serializers.lsg import (
 )
 from care.users.models import District, LocalBody, State, Ward
 from care.utils.cache.mixin import ListCacheResponseMixin, RetrieveCacheResponseMixin
+from care.utils.cache.response import cache_response, model_tag
 
 
 class PaginataionOverrideClass(PageNumberPagination):
@@ -38,8 +37,8 @@ class StateViewSet(
     pagination_class = PaginataionOverrideClass
 
     @extend_schema(tags=["places"])
-    @method_decorator(cache_page(3600))
     @action(detail=True, methods=["get"])
+    @cache_response(3600, tags=lambda view, pk: [model_tag(District, state_id=pk)])
     def districts(self, *args, **kwargs):
         state = self.get_object()
         serializer = DistrictSerializer(
@@ -72,8 +71,8 @@ class DistrictViewSet(
     pagination_class = PaginataionOverrideClass
 
     @extend_schema(tags=["places"])
-    @method_decorator(cache_page(3600))
     @action(detail=True, methods=["get"])
+    @cache_response(3600, tags=lambda view, pk: [model_tag(LocalBody, district_id=pk)])
     def local_bodies(self, *args, **kwargs):
         district = self.get_object()
         serializer = LocalBodySerializer(
@@ -82,8 +81,14 @@ class DistrictViewSet(
         return Response(data=serializer.data)
 
     @extend_schema(tags=["places"])
-    @method_decorator(cache_page(3600))
     @action(detail=True, methods=["get"])
+    @cache_response(
+        3600,
+        tags=lambda view, pk: [
+            model_tag(LocalBody, district_id=pk),
+            model_tag(Ward),
+        ],
+    )
     def get_all_local_body(self, *args, **kwargs):
         district = self.get_object()
         data = []
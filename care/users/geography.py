@@ -0,0 +1,315 @@
+import json
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import batched
+from pathlib import Path
+
+from django.db import connections, transaction
+
+from care.users.models import LOCAL_BODY_CHOICES, District, LocalBody, State, Ward
+from care.utils.cache.response import invalidate_cache_tags, model_tag
+
+CHUNK_SIZE = 1000
+
+# Creates a map with first char of readable value as key
+LOCAL_BODY_TYPE_MAP = {c[1][0]: c[0] for c in LOCAL_BODY_CHOICES}
+
+
+def get_body_type(localbody_code: str | None) -> int:
+    """
+    localbody_code starts with G for Grama panchayath, etc. if not found, the
+    body type is the last item in the choices - "Others"
+    """
+    return LOCAL_BODY_TYPE_MAP.get(
+        (localbody_code or " ")[0], LOCAL_BODY_CHOICES[-1][0]
+    )
+
+
+def get_ward_number(ward: dict) -> int:
+    number = ward["ward_number"] if "ward_number" in ward else ward["ward_no"]
+    try:
+        return int(number)
+    except (TypeError, ValueError):
+        return 0
+
+
+def get_ward_name(ward: dict) -> str:
+    if "ward_name" in ward:
+        return ward["ward_name"]
+    return ward["name"]
+
+
+def iter_json_files(folder: str | Path) -> Iterator[dict]:
+    """
+    Yields the JSON files of a folder one at a time, so that only the files
+    of the chunk being imported are held in memory.
+    """
+    for path in sorted(Path(folder).glob("*.json")):
+        with path.open() as f:
+            yield json.load(f)
+
+
+@dataclass
+class ImportCount:
+    inserted: int = 0
+    updated: int = 0
+
+
+@dataclass
+class ImportSummary:
+    counts: dict[str, ImportCount] = field(
+        default_factory=lambda: defaultdict(ImportCount)
+    )
+    duration: float = 0
+
+    def merge(self, other: "ImportSummary"):
+        for name, count in other.counts.items():
+            self.counts[name].inserted += count.inserted
+            self.counts[name].updated += count.updated
+
+    def lines(self) -> list[str]:
+        lines = [
+            f"{name}: {count.inserted} inserted, {count.updated} updated"
+            for name, count in self.counts.items()
+        ]
+        lines.append(f"Took {self.duration:.2f}s")
+        return lines
+
+
+class GeographyImporter:
+    """
+    Imports states, districts, local bodies and wards in bulk.
+
+    Existing rows are loaded into in-memory maps once, so resolving the
+    parent of a row never hits the database, and each level is written with
+    one bulk query per chunk of rows. Bulk writes do not send signals, so the
+    tags of cached responses are invalidated once an import is done.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.summary = ImportSummary()
+        self.states: dict[str, State] = {}
+        for state in State.objects.order_by("-id"):
+            self.states[state.name.lower()] = state
+        self.districts: dict[tuple[int, str], District] = {}
+        for district in District.objects.order_by("-id"):
+            self.districts[district.state_id, district.name.lower()] = district
+        # (district id, body type, name) -> (local body id, localbody_code)
+        self.local_bodies: dict[tuple[int, int, str], tuple[int, str | None]] = {}
+        self.loaded_local_body_states: set[int] = set()
+        self.changed_tags: set[str] = set()
+
+    def get_states(self, names: Iterable[str]) -> dict[str, State]:
+        missing = {
+            name.lower(): State(name=name)
+            for name in names
+            if name.lower() not in self.states
+        }
+        if missing:
+            State.objects.bulk_create(missing.values())
+            self.states.update(missing)
+            self.summary.counts["States"].inserted += len(missing)
+            self.changed_tags.add(model_tag(State))
+        return self.states
+
+    def get_districts(
+        self, names: Iterable[tuple[str, str]]
+    ) -> dict[tuple[int, str], District]:
+        """
+        Returns the district map after creating the (state name, district
+        name) pairs that do not exist yet.
+        """
+        names = list(names)
+        states = self.get_states({state_name for state_name, _ in names})
+        missing = {}
+        for state_name, district_name in names:
+            state = states[state_name.lower()]
+            key = (state.id, district_name.lower())
+            if key not in self.districts and key not in missing:
+                missing[key] = District(state=state, name=district_name)
+        if missing:
+            District.objects.bulk_create(missing.values())
+            self.districts.update(missing)
+            self.summary.counts["Districts"].inserted += len(missing)
+            self.changed_tags.add(model_tag(District))
+            self.changed_tags.update(
+                model_tag(District, state_id=state_id) for state_id, _ in missing
+            )
+        return self.districts
+
+    def get_district(self, state_name: str, district_name: str) -> District | None:
+        state = self.states.get(state_name.lower())
+        if state is None:
+            return None
+        return self.districts.get((state.id, district_name.lower()))
+
+    def load_local_bodies(self, states: Iterable[State]):
+        state_ids = {state.id for state in states} - self.loaded_local_body_states
+        if not state_ids:
+            return
+        local_bodies = LocalBody.objects.filter(
+            district__state_id__in=state_ids
+        ).values_list("id", "district_id", "body_type", "name", "localbody_code")
+        for id, district_id, body_type, name, code in local_bodies:
+            self.local_bodies[district_id, body_type, name] = (id, code)
+        self.loaded_local_body_states |= state_ids
+
+    def import_states(self, data: list[dict], ignore: Iterable[str] = ()):
+        """
+        Imports states and their comma separated districts, skipping the
+        states in `ignore`.
+        """
+        ignore = {name.lower() for name in ignore}
+        districts = []
+        for item in data:
+            state_name = item["state"].strip()
+            if state_name.lower() in ignore:
+                continue
+            self.get_states([state_name])
+            districts.extend(
+                (state_name, d.strip()) for d in item["districts"].split(",")
+            )
+        self.get_districts(districts)
+        self.invalidate_cache()
+
+    def import_lsg_folder(
+        self, folder: str | Path, *, local_bodies=True, wards=True
+    ) -> ImportSummary:
+        """
+        Imports a folder of local body JSONs, each optionally with its wards.
+        When local_bodies is False only wards of existing local bodies are
+        imported.
+        """
+        start = time.perf_counter()
+        seen = set()
+        for chunk in batched(iter_json_files(folder), self.chunk_size):
+            with transaction.atomic():
+                resolved = self.resolve_local_bodies(chunk, seen, create=local_bodies)
+                if wards:
+                    self.upsert_wards(resolved)
+        self.invalidate_cache()
+        self.summary.duration += time.perf_counter() - start
+        return self.summary
+
+    def invalidate_cache(self):
+        if self.changed_tags:
+            invalidate_cache_tags(*self.changed_tags)
+            self.changed_tags.clear()
+
+    def resolve_local_bodies(
+        self, chunk: Iterable[dict], seen: set, *, create: bool
+    ) -> list[tuple[int, list[dict]]]:
+        """
+        Resolves the local bodies of a chunk of files, upserting them when
+        create is set. Returns the local body id and wards of every resolved
+        file.
+        """
+        rows = [lb for lb in chunk if lb.get("district")]
+        if create:
+            self.get_districts((lb["state"], lb["district"]) for lb in rows)
+        self.load_local_bodies(
+            self.states[lb["state"].lower()]
+            for lb in rows
+            if lb["state"].lower() in self.states
+        )
+
+        rows.sort(key=lambda lb: (lb["name"], lb.get("localbody_code") or ""))
+        upserts, pending = {}, []
+        for lb in rows:
+            district = self.get_district(lb["state"], lb["district"])
+            if district is None:
+                continue
+            code = lb.get("localbody_code")
+            key = (district.id, get_body_type(code), lb["name"])
+            pending.append((key, lb.get("wards") or []))
+            if not create or key in seen:
+                continue
+            seen.add(key)
+            existing = self.local_bodies.get(key)
+            if existing is None or existing[1] != code:
+                upserts[key] = LocalBody(
+                    district=district,
+                    body_type=key[1],
+                    name=key[2],
+                    localbody_code=code,
+                )
+
+        if upserts:
+            LocalBody.objects.bulk_create(
+                upserts.values(),
+                update_conflicts=True,
+                unique_fields=["district", "body_type", "name"],
+                update_fields=["localbody_code"],
+            )
+            count = self.summary.counts["Local Bodies"]
+            self.changed_tags.add(model_tag(LocalBody))
+            for key, local_body in upserts.items():
+                if key in self.local_bodies:
+                    count.updated += 1
+                else:
+                    count.inserted += 1
+                self.local_bodies[key] = (local_body.id, local_body.localbody_code)
+                self.changed_tags.add(model_tag(LocalBody, district_id=key[0]))
+
+        return [
+            (self.local_bodies[key][0], wards)
+            for key, wards in pending
+            if key in self.local_bodies
+        ]
+
+    def upsert_wards(self, resolved: list[tuple[int, list[dict]]]):
+        local_body_ids = {local_body_id for local_body_id, wards in resolved if wards}
+        if not local_body_ids:
+            return
+        existing = set(
+            Ward.objects.filter(local_body_id__in=local_body_ids).values_list(
+                "local_body_id", "name", "number"
+            )
+        )
+        new_wards = {}
+        for local_body_id, wards in resolved:
+            for ward in wards:
+                key = (local_body_id, get_ward_name(ward), get_ward_number(ward))
+                if key not in existing and key not in new_wards:
+                    new_wards[key] = Ward(
+                        local_body_id=key[0], name=key[1], number=key[2]
+                    )
+        # every column of a ward is part of its unique key, so there is
+        # nothing to update on conflicts
+        for batch in batched(new_wards.values(), self.chunk_size):
+            Ward.objects.bulk_create(batch, ignore_conflicts=True)
+        self.summary.counts["Wards"].inserted += len(new_wards)
+        if new_wards:
+            self.changed_tags.add(model_tag(Ward))
+
+
+def import_lsg_folders(
+    folders: list[str | Path], *, workers: int = 1, **options
+) -> ImportSummary:
+    """
+    Imports each folder with its own importer, running up to `workers`
+    folders in parallel, and returns the combined summary.
+    """
+    start = time.perf_counter()
+
+    def run(folder):
+        try:
+            return GeographyImporter().import_lsg_folder(folder, **options)
+        finally:
+            if workers > 1:
+                connections.close_all()
+
+    summary = ImportSummary()
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run, folders))
+    else:
+        results = [run(folder) for folder in folders]
+    for result in results:
+        summary.merge(result)
+    summary.duration = time.perf_counter() - start
+    return summary
@@ -1,6 +1,7 @@
-from django.core import management
 from django.core.management import BaseCommand, CommandParser
 
+from care.users.geography import import_lsg_folders
+
 
 class Command(BaseCommand):
     """
@@ -50,6 +51,12 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser: CommandParser) -> None:
         parser.add_argument("state", help="")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="number of states to import in parallel",
+        )
 
     def handle(self, *args, **options):
         state = options["state"]
@@ -62,7 +69,9 @@ class Command(BaseCommand):
                 raise Exception(error)
             states = [state]
 
-        for state in states:
-            current_state_data = self.BASE_URL + state + "/lsg/"
-            management.call_command("load_lsg_data", current_state_data)
-            management.call_command("load_ward_data", current_state_data)
+        summary = import_lsg_folders(
+            [self.BASE_URL + state + "/lsg/" for state in states],
+            workers=options["workers"],
+        )
+        for line in summary.lines():
+            self.stdout.write(line)
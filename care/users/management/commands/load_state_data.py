@@ -1,11 +1,12 @@
 import json
+import time
 from pathlib import Path
 
 from django.core.management import BaseCommand, CommandParser
 
-from care.users.models import District, State
+from care.users.geography import GeographyImporter
 
-states_to_ignore = [s.lower() for s in ["Kerala", "Lakshadweep (UT)"]]
+states_to_ignore = ["Kerala", "Lakshadweep (UT)"]
 
 
 class Command(BaseCommand):
@@ -14,30 +15,18 @@ class Command(BaseCommand):
     Usage: python manage.py load_state_data ./data/india/states-and-districts.json
     """
 
-    help = "Loads Local Body data from a folder of JSONs"
+    help = "Loads State and District data from a JSON"
 
     def add_arguments(self, parser: CommandParser) -> None:
         parser.add_argument("json_file_path", help="path to the folder of JSONs")
 
     def handle(self, *args, **options):
-        json_file_path = options["json_file_path"]
-
-        data = []
-        with Path(json_file_path).open() as json_file:
+        start = time.perf_counter()
+        with Path(options["json_file_path"]).open() as json_file:
             data = json.load(json_file)
 
-        for item in data:
-            state_name = item["state"].strip()
-            if state_name.lower() in states_to_ignore:
-                continue
-
-            districts = [d.strip() for d in item["districts"].split(",")]
-
-            state, is_created = State.objects.get_or_create(
-                name__iexact=state_name, defaults={"name": state_name}
-            )
-
-            for d in districts:
-                _, is_created = District.objects.get_or_create(
-                    state=state, name__iexact=d, defaults={"name": d}
-                )
+        importer = GeographyImporter()
+        importer.import_states(data, ignore=states_to_ignore)
+        importer.summary.duration = time.perf_counter() - start
+        for line in importer.summary.lines():
+            self.stdout.write(line)
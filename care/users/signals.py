@@ -8,7 +8,15 @@ from django.template.loader import render_to_string
 from django.utils.timezone import now
 from django_rest_passwordreset.signals import reset_password_token_created
 
-from .models import UserFacilityAllocation
+from care.utils.cache.response import invalidate_on_change
+
+from .models import District, LocalBody, State, UserFacilityAllocation, Ward
+
+# cached place responses are scoped by the parent of the place
+invalidate_on_change(State)
+invalidate_on_change(District, scopes=["state_id"])
+invalidate_on_change(LocalBody, scopes=["district_id"])
+invalidate_on_change(Ward)
 
 
 @receiver(reset_password_token_created)
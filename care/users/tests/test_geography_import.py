@@ -0,0 +1,152 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from care.users.geography import GeographyImporter, import_lsg_folders
+from care.users.models import District, LocalBody, State, Ward
+
+
+class GeographyImportTestCase(TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+
+    def write_local_bodies(self, folder, state, local_bodies):
+        path = self.root / folder
+        path.mkdir(exist_ok=True)
+        for i, (district, name, code, wards) in enumerate(local_bodies):
+            (path / f"{i}.json").write_text(
+                json.dumps(
+                    {
+                        "name": name,
+                        "state": state,
+                        "district": district,
+                        "localbody_code": code,
+                        "wards": [
+                            {"ward_no": str(number), "ward_name": ward_name}
+                            for number, ward_name in wards
+                        ],
+                    }
+                )
+            )
+        return path
+
+    def call_command(self, *args):
+        out = StringIO()
+        call_command(*args, stdout=out)
+        return out.getvalue()
+
+    def test_load_lsg_and_ward_data(self):
+        folder = self.write_local_bodies(
+            "kerala",
+            "Kerala",
+            [
+                ("Ernakulam", "Aluva", "M070100", [(1, "North"), (2, "South")]),
+                ("Ernakulam", "Kalamassery", "M070200", [(1, "East")]),
+                ("Kollam", "Kollam", "C020100", [(1, "Central")]),
+                ("", "No District", "G000000", [(1, "Skipped")]),
+            ],
+        )
+
+        output = self.call_command("load_lsg_data", str(folder))
+        self.assertIn("States: 1 inserted, 0 updated", output)
+        self.assertIn("Districts: 2 inserted, 0 updated", output)
+        self.assertIn("Local Bodies: 3 inserted, 0 updated", output)
+        self.assertEqual(Ward.objects.count(), 0)
+        self.assertEqual(
+            LocalBody.objects.get(name="Kollam").district.state.name, "Kerala"
+        )
+
+        output = self.call_command("load_ward_data", str(folder))
+        self.assertIn("Wards: 4 inserted, 0 updated", output)
+        self.assertEqual(
+            set(
+                Ward.objects.filter(local_body__name="Aluva").values_list(
+                    "number", "name"
+                )
+            ),
+            {(1, "North"), (2, "South")},
+        )
+
+        output = self.call_command("load_ward_data", str(folder))
+        self.assertIn("Wards: 0 inserted, 0 updated", output)
+
+    def test_reimport_updates_changed_local_bodies(self):
+        state = State.objects.create(name="Kerala")
+        district = District.objects.create(state=state, name="Ernakulam")
+        LocalBody.objects.create(
+            district=district, name="Aluva", body_type=10, localbody_code="M070100"
+        )
+        LocalBody.objects.create(
+            district=district, name="Kalamassery", body_type=10, localbody_code=None
+        )
+        folder = self.write_local_bodies(
+            "kerala",
+            "kerala",
+            [
+                ("ernakulam", "Aluva", "M070100", []),
+                ("ernakulam", "Kalamassery", "M070200", []),
+            ],
+        )
+
+        output = self.call_command("load_lsg_data", str(folder))
+        self.assertNotIn("States", output)
+        self.assertNotIn("Districts", output)
+        self.assertIn("Local Bodies: 0 inserted, 1 updated", output)
+        self.assertEqual(LocalBody.objects.count(), 2)
+        self.assertEqual(
+            LocalBody.objects.get(name="Kalamassery").localbody_code, "M070200"
+        )
+
+    def test_queries_do_not_grow_with_files(self):
+        def import_folder(folder, count):
+            path = self.write_local_bodies(
+                folder,
+                folder.title(),
+                [
+                    (f"District {i % 3}", f"Body {i}", "G000000", [(1, "Ward")])
+                    for i in range(count)
+                ],
+            )
+            importer = GeographyImporter()
+            with self.assertNumQueries(8):
+                importer.import_lsg_folder(path)
+
+        import_folder("small", 3)
+        import_folder("large", 30)
+
+    def test_import_lsg_folders(self):
+        folders = [
+            self.write_local_bodies(
+                state.lower(), state, [("District", "Body", "G000000", [(1, "Ward")])]
+            )
+            for state in ("Goa", "Sikkim")
+        ]
+        summary = import_lsg_folders(folders)
+        self.assertEqual(summary.counts["States"].inserted, 2)
+        self.assertEqual(summary.counts["Local Bodies"].inserted, 2)
+        self.assertEqual(summary.counts["Wards"].inserted, 2)
+
+    def test_load_state_data(self):
+        State.objects.create(name="Goa")
+        path = self.root / "states.json"
+        path.write_text(
+            json.dumps(
+                [
+                    {"state": "GOA", "districts": "North Goa, South Goa"},
+                    {"state": "Sikkim", "districts": "East Sikkim"},
+                    {"state": "Kerala", "districts": "Ernakulam"},
+                ]
+            )
+        )
+
+        output = self.call_command("load_state_data", str(path))
+        self.assertIn("States: 1 inserted, 0 updated", output)
+        self.assertIn("Districts: 3 inserted, 0 updated", output)
+        self.assertFalse(State.objects.filter(name="Kerala").exists())
+        self.assertEqual(District.objects.filter(state__name="Goa").count(), 2)
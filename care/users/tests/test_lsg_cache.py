@@ -0,0 +1,90 @@
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from care.users.geography import GeographyImporter
+from care.users.models import District, State
+from care.utils.tests.test_utils import OverrideCache, TestUtils
+
+
+class LSGResponseCacheTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.other_state = State.objects.create(name="Goa")
+        cls.user = cls.create_super_user("su", cls.district)
+
+    def add_district(self, state, name):
+        with self.captureOnCommitCallbacks(execute=True):
+            return District.objects.create(state=state, name=name)
+
+    def test_conditional_requests(self):
+        with OverrideCache(self):
+            response = self.client.get("/api/v1/state/")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            etag = response["ETag"]
+            self.assertIn("no-cache", response["Cache-Control"])
+
+            # answered from the cached validators without running the view, the
+            # queries load the session of the logged in user
+            with self.assertNumQueries(2):
+                response = self.client.get("/api/v1/state/", HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response["ETag"], etag)
+
+            response = self.client.get(
+                "/api/v1/state/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+            )
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+            response = self.client.get("/api/v1/state/", HTTP_IF_NONE_MATCH='"stale"')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json()["count"], 2)
+
+    def test_saving_invalidates_cached_responses(self):
+        with OverrideCache(self):
+            etag = self.client.get("/api/v1/state/")["ETag"]
+            with self.captureOnCommitCallbacks(execute=True):
+                State.objects.create(name="Sikkim")
+
+            response = self.client.get("/api/v1/state/", HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response["ETag"], etag)
+            self.assertEqual(response.json()["count"], 3)
+
+    def test_invalidation_is_scoped(self):
+        with OverrideCache(self):
+            url = f"/api/v1/state/{self.state.id}/districts/"
+            other_url = f"/api/v1/state/{self.other_state.id}/districts/"
+            etag = self.client.get(url)["ETag"]
+            other_etag = self.client.get(other_url)["ETag"]
+
+            self.add_district(self.other_state, "North Goa")
+
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            response = self.client.get(other_url, HTTP_IF_NONE_MATCH=other_etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json()[0]["name"], "North Goa")
+
+    def test_bulk_import_invalidates_cached_responses(self):
+        with OverrideCache(self):
+            url = f"/api/v1/state/{self.other_state.id}/districts/"
+            response = self.client.get(url)
+            self.assertEqual(response.json(), [])
+
+            GeographyImporter().import_states(
+                [{"state": "Goa", "districts": "North Goa, South Goa"}]
+            )
+
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.json()), 2)
+
+    def test_modified_since_before_caching(self):
+        with OverrideCache(self):
+            response = self.client.get(
+                "/api/v1/district/", HTTP_IF_MODIFIED_SINCE=http_date(0)
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
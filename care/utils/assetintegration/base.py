@@ -1,7 +1,6 @@
 import json
 from typing import TypedDict
 
-import jsonschema
 import requests
 from django.conf import settings
 from jsonschema import ValidationError as JSONValidationError
@@ -9,6 +8,8 @@ from rest_framework import status
 from rest_framework.exceptions import APIException, ValidationError
 
 from care.utils.jwks.token_generator import generate_jwt
+from care.utils.models.json_schema import get_schema_validator
+from care.utils.profiling import profile_span
 
 from .schema import meta_object_schema
 
@@ -25,7 +26,7 @@ class BaseAssetIntegration:
     def __init__(self, meta):
         try:
             meta["_name"] = self._name
-            jsonschema.validate(instance=meta, schema=meta_object_schema)
+            get_schema_validator(meta_object_schema).validate(meta)
         except JSONValidationError as e:
             error_message = f"Invalid metadata: {e.message}"
             raise ValidationError(error_message) from e
@@ -68,12 +69,16 @@ class BaseAssetIntegration:
 
     def api_post(self, url, data=None, timeout=None):
         timeout = timeout or self.timeout
-        return self._validate_response(
-            requests.post(url, json=data, headers=self.get_headers(), timeout=timeout)
-        )
+        with profile_span("middleware"):
+            response = requests.post(
+                url, json=data, headers=self.get_headers(), timeout=timeout
+            )
+        return self._validate_response(response)
 
     def api_get(self, url, data=None, timeout=None):
         timeout = timeout or self.timeout
-        return self._validate_response(
-            requests.get(url, params=data, headers=self.get_headers(), timeout=timeout)
-        )
+        with profile_span("middleware"):
+            response = requests.get(
+                url, params=data, headers=self.get_headers(), timeout=timeout
+            )
+        return self._validate_response(response)
@@ -0,0 +1,13 @@
+from django.core.cache import caches
+from django_redis.cache import RedisCache
+
+
+def get_redis_client():
+    """
+    Returns the Redis client of the default cache, or None when the default
+    cache is not backed by Redis, as in tests.
+    """
+    cache = caches["default"]
+    if isinstance(cache, RedisCache):
+        return cache.client.get_client(write=True)
+    return None
@@ -1,19 +1,22 @@
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from care.utils.cache.response import cache_response, model_tag
 
 
 class BaseCacheResponseMixin:
-    pass
+    def get_cache_tags(self) -> list[str]:
+        """
+        Tags invalidating the cached responses, the queryset model by default.
+        """
+        return [model_tag(self.get_queryset().model)]
 
 
 class ListCacheResponseMixin(BaseCacheResponseMixin):
-    @method_decorator(cache_page(60 * 100))
+    @cache_response(60 * 100)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
 
 class RetrieveCacheResponseMixin(BaseCacheResponseMixin):
-    @method_decorator(cache_page(60 * 100))
+    @cache_response(60 * 100)
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
@@ -0,0 +1,156 @@
+import hashlib
+import time
+from collections.abc import Callable, Iterable
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+TAG_PREFIX = "cache_tag:"
+RESPONSE_PREFIX = "cached_response:"
+
+type Tags = Iterable[str] | Callable[..., Iterable[str]]
+
+
+def model_tag(model: type[models.Model], **scope) -> str:
+    """
+    Returns the tag of a model, optionally narrowed down to the rows having
+    the given field values, eg. model_tag(District, state_id=1)
+    """
+    tag = model._meta.label_lower  # noqa: SLF001
+    for field, value in sorted(scope.items()):
+        tag += f":{field}={value}"
+    return tag
+
+
+def get_tag_versions(tags: list[str]) -> list[str]:
+    keys = [TAG_PREFIX + tag for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # a new version instead of a fixed initial one, so entries cached
+            # before the version was evicted are never served again
+            version = time.time_ns()
+            cache.add(key, version, timeout=None)
+            # a cache that does not keep values (as in tests) gets a new
+            # version every time
+            versions[key] = cache.get(key, version)
+    return [str(versions[key]) for key in keys]
+
+
+def invalidate_cache_tags(*tags: str):
+    cache.set_many({TAG_PREFIX + tag: time.time_ns() for tag in tags}, timeout=None)
+
+
+def invalidate_on_change(model: type[models.Model], scopes: Iterable[str] = ()):
+    """
+    Invalidates the tag of the model, and the tags scoped by each field in
+    `scopes`, once a transaction saving or deleting one of its rows commits.
+    Bulk operations do not send signals and have to invalidate explicitly.
+    """
+
+    def invalidate(sender, instance, **kwargs):
+        tags = [model_tag(model)]
+        tags.extend(
+            model_tag(model, **{field: getattr(instance, field)}) for field in scopes
+        )
+        transaction.on_commit(lambda: invalidate_cache_tags(*tags))
+
+    uid = f"invalidate_cache_tags:{model_tag(model)}"
+    post_save.connect(invalidate, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(invalidate, sender=model, weak=False, dispatch_uid=uid)
+
+
+def is_not_modified(request, etag: str, last_modified: int) -> bool:
+    if if_none_match := request.headers.get("If-None-Match"):
+        return etag in {tag.strip() for tag in if_none_match.split(",")} or (
+            if_none_match.strip() == "*"
+        )
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since"))
+    return if_modified_since is not None and last_modified <= if_modified_since
+
+
+def conditional_response(request, meta: dict) -> HttpResponse | None:
+    if is_not_modified(request, meta["etag"], meta["last_modified"]):
+        response = HttpResponseNotModified()
+        set_validators(response, meta)
+        return response
+    return None
+
+
+def set_validators(response, meta: dict):
+    response["ETag"] = meta["etag"]
+    response["Last-Modified"] = http_date(meta["last_modified"])
+    # clients may keep the response but have to revalidate it on every use,
+    # which is answered with a 304 until one of its tags is invalidated
+    patch_cache_control(response, no_cache=True)
+
+
+def cache_response(timeout: int, tags: Tags | None = None):
+    """
+    Caches successful responses of a viewset handler until `timeout` or until
+    one of its tags is invalidated, whichever is first.
+
+    `tags` is a list of tags, or a callable receiving the view and the
+    handler arguments, and defaults to view.get_cache_tags(). Responses carry
+    a strong ETag and Last-Modified, and conditional requests matching the
+    cached entry are answered with a 304 without running the view.
+    """
+
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            if callable(tags):
+                tag_names = list(tags(view, *args, **kwargs))
+            else:
+                tag_names = list(tags or view.get_cache_tags())
+            variant = hashlib.md5(  # noqa: S324
+                "\n".join(
+                    (
+                        request.get_full_path(),
+                        request.headers.get("Accept", ""),
+                        *get_tag_versions(tag_names),
+                    )
+                ).encode()
+            ).hexdigest()
+            key = f"{RESPONSE_PREFIX}{view.__class__.__qualname__}.{handler.__name__}:{variant}"
+
+            # the validators are stored apart from the content, so that
+            # revalidations do not transfer the content from the cache
+            if meta := cache.get(f"{key}:meta"):
+                if response := conditional_response(request, meta):
+                    return response
+                if content := cache.get(f"{key}:content"):
+                    response = HttpResponse(content, content_type=meta["content_type"])
+                    set_validators(response, meta)
+                    return response
+
+            def store(response):
+                if response.status_code != 200 or response.streaming:  # noqa: PLR2004
+                    return None
+                meta = {
+                    "etag": quote_etag(hashlib.sha256(response.content).hexdigest()),
+                    "last_modified": int(time.time()),
+                    "content_type": response["Content-Type"],
+                }
+                cache.set_many(
+                    {f"{key}:meta": meta, f"{key}:content": response.content},
+                    timeout,
+                )
+                set_validators(response, meta)
+                return conditional_response(request, meta)
+
+            response = handler(view, request, *args, **kwargs)
+            if hasattr(response, "add_post_render_callback"):
+                # DRF responses are rendered after the handler returns
+                response.add_post_render_callback(store)
+                return response
+            return store(response) or response
+
+        return wrapper
+
+    return decorator
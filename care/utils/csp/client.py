@@ -0,0 +1,48 @@
+import threading
+from typing import TYPE_CHECKING
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+
+from care.utils.csp.config import BucketName, BucketType, get_client_config
+
+if TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client
+
+# files larger than the threshold are transferred in parts of CHUNK_SIZE, so
+# at most a few chunks of a file are held in memory at any time
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+)
+
+_clients: dict[tuple, "S3Client"] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(
+    bucket_type: BucketType, external=False
+) -> tuple["S3Client", BucketName]:
+    """
+    Returns a process wide S3 client for the bucket type and endpoint.
+
+    boto3 clients are thread safe once created, but creating one is slow, so
+    clients are built once per distinct config and reused across requests.
+    """
+    config, bucket_name = get_client_config(bucket_type, external=external)
+    key = (bucket_type, *config.values())
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                # the default session is not thread safe, use a dedicated one
+                client = boto3.session.Session().client("s3", **config)
+                _clients[key] = client
+    return client, bucket_name
+
+
+def clear_clients():
+    with _clients_lock:
+        _clients.clear()
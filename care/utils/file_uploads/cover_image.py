@@ -2,18 +2,17 @@ import logging
 import secrets
 from typing import Literal
 
-import boto3
 from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
 
-from care.utils.csp.config import BucketType, get_client_config
+from care.utils.csp.client import TRANSFER_CONFIG, get_client
+from care.utils.csp.config import BucketType
 
 logger = logging.getLogger(__name__)
 
 
 def delete_cover_image(image_key: str, folder: Literal["cover_images", "avatars"]):
-    config, bucket_name = get_client_config(BucketType.FACILITY)
-    s3 = boto3.client("s3", **config)
+    s3, bucket_name = get_client(BucketType.FACILITY)
 
     try:
         s3.delete_object(Bucket=bucket_name, Key=image_key)
@@ -27,8 +26,7 @@ def upload_cover_image(
     folder: Literal["cover_images", "avatars"],
     old_key: str | None = None,
 ) -> str:
-    config, bucket_name = get_client_config(BucketType.FACILITY)
-    s3 = boto3.client("s3", **config)
+    s3, bucket_name = get_client(BucketType.FACILITY)
 
     if old_key:
         try:
@@ -41,13 +39,15 @@ def upload_cover_image(
         f"{folder}/{object_external_id}_{secrets.token_hex(8)}.{image_extension}"
     )
 
-    boto_params = {
-        "Bucket": bucket_name,
-        "Key": image_key,
-        "Body": image.file,
-    }
+    extra_args = {}
     if settings.BUCKET_HAS_FINE_ACL:
-        boto_params["ACL"] = "public-read"
-    s3.put_object(**boto_params)
+        extra_args["ACL"] = "public-read"
+    s3.upload_fileobj(
+        image.file,
+        bucket_name,
+        image_key,
+        ExtraArgs=extra_args or None,
+        Config=TRANSFER_CONFIG,
+    )
 
     return image_key
@@ -1,7 +1,55 @@
+import logging
+import random
+import threading
+import time
+from uuid import uuid4
+
 from django.conf import settings
 from django.core.cache import cache
 from rest_framework.exceptions import APIException
 
+from care.utils.cache.client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# bounds of the randomized delay between attempts of a blocking acquire
+RETRY_DELAY = 0.02
+MAX_RETRY_DELAY = 0.5
+
+# the fencing counter of a lock is kept for this many lock timeouts after
+# its last acquire, so that the counters of unused locks do not pile up
+FENCING_TIMEOUT_FACTOR = 1000
+
+# KEYS: lock, fencing counter
+# ARGV: owner token, timeout (ms), fencing counter seed, counter timeout (ms)
+ACQUIRE_SCRIPT = """
+if not redis.call("SET", KEYS[1], ARGV[1], "NX", "PX", ARGV[2]) then
+    return 0
+end
+redis.call("SET", KEYS[2], ARGV[3], "NX")
+local fencing_token = redis.call("INCR", KEYS[2])
+redis.call("PEXPIRE", KEYS[2], ARGV[4])
+return fencing_token
+"""
+
+# KEYS: the lock
+# ARGV: owner token
+RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+# KEYS: the lock
+# ARGV: owner token, timeout (ms)
+RENEW_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
 
 class ObjectLocked(APIException):
     status_code = 423
@@ -10,17 +58,141 @@ class ObjectLocked(APIException):
 
 
 class Lock:
-    def __init__(self, key, timeout=settings.LOCK_TIMEOUT):
+    """
+    A lock held by a single owner at a time, expiring after `timeout` seconds
+    unless it is renewed.
+
+    acquire() waits up to `wait` seconds for the lock before raising
+    ObjectLocked, and returns a fencing token that is greater than the
+    token of every earlier holder, so that writes made by a holder whose
+    lock expired can be told apart. The lock is only released or renewed
+    by its owner. With `auto_renew`, the lock is renewed in the background
+    until it is released, for jobs that may outlive the timeout.
+
+    Locks are kept in Redis when it backs the default cache, and in the
+    default cache otherwise, where releasing is not atomic.
+    """
+
+    def __init__(
+        self,
+        key,
+        timeout=settings.LOCK_TIMEOUT,
+        *,
+        wait: float = 0,
+        auto_renew: bool = False,
+    ):
         self.key = f"lock:{key}"
+        self.fencing_key = f"lock_fencing:{key}"
         self.timeout = timeout
+        self.wait = wait
+        self.auto_renew = auto_renew
+        self.token = None
+        self.fencing_token = None
+        self._renewal = None
+        self._redis = get_redis_client()
+
+    def _try_acquire(self, token: str) -> int | None:
+        # a counter evicted from the cache or expired restarts from the
+        # current time, which is above every token it handed out before
+        seed = time.time_ns()
+        fencing_timeout = self.timeout * FENCING_TIMEOUT_FACTOR
+        if self._redis:
+            fencing_token = self._redis.eval(
+                ACQUIRE_SCRIPT,
+                2,
+                cache.make_key(self.key),
+                cache.make_key(self.fencing_key),
+                token,
+                int(self.timeout * 1000),
+                seed,
+                int(fencing_timeout * 1000),
+            )
+            return fencing_token or None
+
+        if not cache.add(self.key, token, timeout=self.timeout):
+            return None
+        cache.add(self.fencing_key, seed, timeout=fencing_timeout)
+        try:
+            fencing_token = cache.incr(self.fencing_key)
+        except ValueError:
+            # the cache does not keep values, as in tests
+            return seed
+        cache.touch(self.fencing_key, fencing_timeout)
+        return fencing_token
+
+    def acquire(self) -> int:
+        token = uuid4().hex
+        deadline = time.monotonic() + self.wait
+        delay = RETRY_DELAY
+        while (fencing_token := self._try_acquire(token)) is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ObjectLocked
+            # jittered so that waiters do not retry in lockstep
+            time.sleep(min(remaining, random.uniform(delay / 2, delay)))  # noqa: S311
+            delay = min(delay * 2, MAX_RETRY_DELAY)
+
+        self.token = token
+        self.fencing_token = fencing_token
+        if self.auto_renew:
+            self._start_renewal(token)
+        return fencing_token
 
-    def acquire(self):
-        if not cache.set(self.key, value=True, timeout=self.timeout, nx=True):
-            raise ObjectLocked
+    def renew(self) -> bool:
+        """
+        Resets the timeout of the lock, returns False if it is no longer held
+        """
+        if self.token is None:
+            return False
+        return self._renew(self.token)
 
-    def release(self):
+    def _renew(self, token: str) -> bool:
+        if self._redis:
+            return bool(
+                self._redis.eval(
+                    RENEW_SCRIPT,
+                    1,
+                    cache.make_key(self.key),
+                    token,
+                    int(self.timeout * 1000),
+                )
+            )
+        if cache.get(self.key) != token:
+            return False
+        return cache.touch(self.key, self.timeout)
+
+    def release(self) -> bool:
+        """
+        Releases the lock if it is still held, returns False if it expired
+        and may have been acquired by someone else
+        """
+        if self._renewal:
+            self._renewal.set()
+            self._renewal = None
+        if self.token is None:
+            return False
+        token, self.token = self.token, None
+        if self._redis:
+            return bool(
+                self._redis.eval(RELEASE_SCRIPT, 1, cache.make_key(self.key), token)
+            )
+        if cache.get(self.key) != token:
+            return False
         return cache.delete(self.key)
 
+    def _start_renewal(self, token: str):
+        stopped = self._renewal = threading.Event()
+
+        # renews with the token it was started with, release() may clear
+        # self.token while a renewal is running
+        def renew():
+            while not stopped.wait(self.timeout / 3):
+                if not self._renew(token) and not stopped.is_set():
+                    logger.warning("Lock %s expired before it was renewed", self.key)
+                    return
+
+        threading.Thread(target=renew, daemon=True).start()
+
     def __enter__(self):
         self.acquire()
         return self
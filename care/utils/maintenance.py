@@ -0,0 +1,144 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connections, models, transaction
+from django.db.models import Max, Min
+from simple_history.utils import bulk_update_with_history
+
+CHECKPOINT_DURATION = 7 * 24 * 60 * 60  # 1 week
+
+
+@dataclass
+class BatchResult:
+    updated: int = 0
+    failed: list = field(default_factory=list)
+
+    def merge(self, other: "BatchResult"):
+        self.updated += other.updated
+        self.failed.extend(other.failed)
+
+
+class BulkMaintenanceCommand(BaseCommand):
+    """
+    Base for maintenance commands that recompute fields across a whole table.
+
+    Rows are processed in primary key ranges of --batch-size, each range in
+    its own transaction, optionally spread over --workers threads. After
+    every range the highest primary key below which all rows are done is
+    stored as a checkpoint, so an interrupted run can be continued with
+    --resume.
+
+    Subclasses either implement update_object to change fields of a row in
+    memory, which are then written with bulk_update, or override
+    update_batch to update a range in SQL. Both skip save(), signals and
+    history unless record_history is set.
+    """
+
+    model: type[models.Model]
+    update_fields: tuple[str, ...] = ()
+    record_history = False
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="number of primary keys processed in each transaction",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="number of batches processed in parallel",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="continue from the checkpoint of an interrupted run",
+        )
+
+    def get_queryset(self) -> models.QuerySet:
+        return self.model.objects.all()
+
+    def update_object(self, obj) -> bool:
+        """
+        Updates the fields of obj in memory, returning whether it changed.
+        """
+        raise NotImplementedError
+
+    def update_batch(self, queryset: models.QuerySet) -> BatchResult:
+        result = BatchResult()
+        changed = []
+        for obj in queryset:
+            try:
+                if self.update_object(obj):
+                    changed.append(obj)
+            except Exception:
+                result.failed.append(obj.pk)
+        if changed:
+            if self.record_history:
+                bulk_update_with_history(changed, self.model, self.update_fields)
+            else:
+                self.model.objects.bulk_update(changed, self.update_fields)
+        result.updated = len(changed)
+        return result
+
+    def report(self, result: BatchResult):
+        self.stdout.write(
+            f"Updated {result.updated} rows | Failed for {len(result.failed)}"
+        )
+
+    @property
+    def checkpoint_key(self):
+        return f"maintenance_checkpoint:{self.__module__.rsplit('.', 1)[-1]}"
+
+    def get_ranges(self, after: int, batch_size: int) -> list[tuple[int, int]]:
+        bounds = (
+            self.get_queryset()
+            .filter(pk__gt=after)
+            .aggregate(start=Min("pk"), end=Max("pk"))
+        )
+        if bounds["start"] is None:
+            return []
+        return [
+            (start, min(start + batch_size, bounds["end"] + 1))
+            for start in range(bounds["start"], bounds["end"] + 1, batch_size)
+        ]
+
+    def run_range(self, pk_range: tuple[int, int]) -> BatchResult:
+        start, end = pk_range
+        try:
+            with transaction.atomic():
+                return self.update_batch(
+                    self.get_queryset().filter(pk__gte=start, pk__lt=end).order_by("pk")
+                )
+        finally:
+            if self.workers > 1:
+                connections.close_all()
+
+    def handle(self, *args, **options):
+        self.workers = options["workers"]
+        after = cache.get(self.checkpoint_key, 0) if options["resume"] else 0
+        ranges = self.get_ranges(after, options["batch_size"])
+
+        result = BatchResult()
+        if self.workers > 1:
+            executor = ThreadPoolExecutor(max_workers=self.workers)
+            results = executor.map(self.run_range, ranges)
+        else:
+            executor = None
+            results = map(self.run_range, ranges)
+        try:
+            # results are yielded in order, so every range below the
+            # checkpoint is done even when workers finish out of order
+            for (_, end), batch_result in zip(ranges, results, strict=True):
+                result.merge(batch_result)
+                cache.set(self.checkpoint_key, end - 1, timeout=CHECKPOINT_DURATION)
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+        cache.delete(self.checkpoint_key)
+        self.report(result)
@@ -90,3 +90,56 @@ class BaseFlag(BaseModel):
             ),
             timeout=FLAGS_CACHE_TTL,
         )
+
+    @classmethod
+    def get_all_flags_many(cls, entity_ids) -> dict[int, tuple[FlagName]]:
+        """
+        Returns the flags of each entity with a single cache round trip, the
+        entities missing from the cache are loaded with a single query.
+        """
+        keys = {
+            cls.all_flags_cache_key_template.format(entity_id=entity_id): entity_id
+            for entity_id in entity_ids
+        }
+        cached = cache.get_many(keys)
+        flags = {keys[key]: value for key, value in cached.items()}
+        missing = {entity_id for key, entity_id in keys.items() if key not in cached}
+        if not missing:
+            return flags
+
+        loaded = {entity_id: [] for entity_id in missing}
+        entity_field = f"{cls.entity_field_name}_id"
+        for entity_id, flag in cls.objects.filter(
+            **{f"{entity_field}__in": missing}
+        ).values_list(entity_field, "flag"):
+            loaded[entity_id].append(flag)
+        loaded = {entity_id: tuple(names) for entity_id, names in loaded.items()}
+        cache.set_many(
+            {
+                cls.all_flags_cache_key_template.format(entity_id=entity_id): names
+                for entity_id, names in loaded.items()
+            },
+            timeout=FLAGS_CACHE_TTL,
+        )
+        flags.update(loaded)
+        return flags
+
+
+class FlagResolver:
+    """
+    Keeps the flags of the entities serialized in a response, so that the
+    flags of a whole page are fetched together by prefetch().
+    """
+
+    def __init__(self, flag_model: type[BaseFlag]):
+        self.flag_model = flag_model
+        self.flags: dict[int, tuple[FlagName]] = {}
+
+    def prefetch(self, entity_ids):
+        missing = {entity_id for entity_id in entity_ids if entity_id not in self.flags}
+        if missing:
+            self.flags.update(self.flag_model.get_all_flags_many(missing))
+
+    def get_flags(self, entity_id: int) -> tuple[FlagName]:
+        self.prefetch([entity_id])
+        return self.flags[entity_id]
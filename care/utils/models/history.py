@@ -0,0 +1,64 @@
+from copy import deepcopy
+
+from django.db.models.signals import post_init
+from simple_history.models import HistoricalRecords
+
+SNAPSHOT_ATTRIBUTE = "_history_snapshot"
+
+
+class ChangedHistoricalRecords(HistoricalRecords):
+    """
+    HistoricalRecords that only records updates changing a tracked field.
+
+    The tracked values of an instance are kept when it is loaded and after
+    every save, and a save that leaves all of them as they were (such as one
+    only bumping modified_date) adds no row to the history table. Creations
+    and deletions are always recorded.
+    """
+
+    def __init__(self, *args, ignored_fields=("modified_date",), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ignored_fields = ignored_fields
+
+    def finalize(self, sender, **kwargs):
+        super().finalize(sender, **kwargs)
+        if sender is self.cls:
+            post_init.connect(self.take_snapshot, sender=sender, weak=False)
+
+    def get_tracked_attnames(self, instance) -> list[str]:
+        return [
+            field.attname
+            for field in self.fields_included(instance)
+            if field.name not in self.ignored_fields
+        ]
+
+    def get_values(self, instance) -> dict:
+        # deferred fields that were never loaded are left out instead of
+        # being fetched
+        values = instance.__dict__
+        return {
+            attname: values[attname]
+            for attname in self.get_tracked_attnames(instance)
+            if attname in values
+        }
+
+    def take_snapshot(self, instance, **kwargs):
+        if instance.pk is None:
+            return
+        setattr(
+            instance,
+            SNAPSHOT_ATTRIBUTE,
+            {
+                attname: deepcopy(value) if isinstance(value, dict | list) else value
+                for attname, value in self.get_values(instance).items()
+            },
+        )
+
+    def has_changes(self, instance) -> bool:
+        snapshot = getattr(instance, SNAPSHOT_ATTRIBUTE, None)
+        return snapshot is None or self.get_values(instance) != snapshot
+
+    def post_save(self, instance, created, using=None, **kwargs):
+        if created or self.has_changes(instance):
+            super().post_save(instance, created, using=using, **kwargs)
+        self.take_snapshot(instance)
@@ -0,0 +1,223 @@
+import json
+import re
+import threading
+from collections.abc import Callable, Iterator
+from numbers import Number
+
+import jsonschema
+from jsonschema.exceptions import best_match
+
+type Check = Callable[[object], bool]
+
+# keywords that do not affect validation, "format" is not asserted since no
+# format checker is used
+ANNOTATIONS = frozenset(
+    {"$schema", "$id", "$comment", "title", "description", "default", "examples"}
+    | {"format", "definitions"}
+)
+
+
+def is_number(value) -> bool:
+    return isinstance(value, Number) and not isinstance(value, bool)
+
+
+def is_integer(value) -> bool:
+    # like jsonschema, floats without a fractional part are integers
+    if isinstance(value, float):
+        return value.is_integer()
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+TYPE_CHECKS: dict[str, Check] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "number": is_number,
+    "integer": is_integer,
+}
+
+
+class UnsupportedSchemaError(Exception):
+    pass
+
+
+class SchemaCompiler:
+    """
+    Compiles the subset of Draft 7 used by the JSON field schemas into nested
+    Python closures that only answer whether a value is valid. Schemas using
+    any other keyword raise UnsupportedSchemaError and are left to jsonschema.
+    """
+
+    KEYWORDS = (
+        "type",
+        "enum",
+        "minimum",
+        "maximum",
+        "pattern",
+        "required",
+        "properties",
+        "additionalProperties",
+        "items",
+        "anyOf",
+    )
+
+    def __init__(self, root: dict):
+        self.root = root
+        self.refs: dict[str, Check] = {}
+
+    def compile(self, schema) -> Check:
+        if schema is True or schema == {}:
+            return lambda v: True
+        if schema is False:
+            return lambda v: False
+        if "$ref" in schema:
+            # siblings of $ref are ignored in Draft 7
+            return self.compile_ref(schema["$ref"])
+
+        unsupported = schema.keys() - ANNOTATIONS - set(self.KEYWORDS)
+        if unsupported:
+            raise UnsupportedSchemaError(sorted(unsupported))
+
+        checks = []
+        for keyword in self.KEYWORDS:
+            if keyword in schema:
+                checks.append(getattr(self, f"compile_{keyword}")(schema))
+
+        if len(checks) == 1:
+            return checks[0]
+        return lambda v: all(check(v) for check in checks)
+
+    def compile_ref(self, ref: str) -> Check:
+        if not ref.startswith("#/"):
+            raise UnsupportedSchemaError(ref)
+        if ref not in self.refs:
+            # resolved lazily so that recursive definitions terminate
+            self.refs[ref] = None
+            target = self.root
+            for part in ref[2:].split("/"):
+                target = target[part]
+            self.refs[ref] = self.compile(target)
+        return lambda v: self.refs[ref](v)
+
+    def compile_type(self, schema) -> Check:
+        types = schema["type"]
+        if isinstance(types, str):
+            return TYPE_CHECKS[types]
+        checks = [TYPE_CHECKS[t] for t in types]
+        return lambda v: any(check(v) for check in checks)
+
+    def compile_enum(self, schema) -> Check:
+        options = schema["enum"]
+        if all(isinstance(option, str) for option in options):
+            strings = frozenset(options)
+            return lambda v: isinstance(v, str) and v in strings
+        # jsonschema does not consider booleans equal to 0 and 1
+        return lambda v: any(
+            v is option
+            if isinstance(v, bool) or isinstance(option, bool)
+            else v == option
+            for option in options
+        )
+
+    def compile_minimum(self, schema) -> Check:
+        minimum = schema["minimum"]
+        return lambda v: not is_number(v) or v >= minimum
+
+    def compile_maximum(self, schema) -> Check:
+        maximum = schema["maximum"]
+        return lambda v: not is_number(v) or v <= maximum
+
+    def compile_pattern(self, schema) -> Check:
+        pattern = re.compile(schema["pattern"])
+        return lambda v: not isinstance(v, str) or pattern.search(v) is not None
+
+    def compile_required(self, schema) -> Check:
+        required = schema["required"]
+        return lambda v: not isinstance(v, dict) or all(key in v for key in required)
+
+    def compile_properties(self, schema) -> Check:
+        properties = {
+            name: self.compile(subschema)
+            for name, subschema in schema["properties"].items()
+        }
+        return lambda v: not isinstance(v, dict) or all(
+            check(v[name]) for name, check in properties.items() if name in v
+        )
+
+    def compile_additionalProperties(self, schema) -> Check:  # noqa: N802
+        known = frozenset(schema.get("properties", {}))
+        if schema["additionalProperties"] is False:
+            return lambda v: not isinstance(v, dict) or v.keys() <= known
+        check = self.compile(schema["additionalProperties"])
+        return lambda v: not isinstance(v, dict) or all(
+            check(value) for key, value in v.items() if key not in known
+        )
+
+    def compile_items(self, schema) -> Check:
+        if isinstance(schema["items"], list):
+            # a list of schemas validates the items at the same positions
+            checks = [self.compile(subschema) for subschema in schema["items"]]
+            return lambda v: not isinstance(v, list) or all(
+                check(item) for check, item in zip(checks, v, strict=False)
+            )
+        check = self.compile(schema["items"])
+        return lambda v: not isinstance(v, list) or all(check(item) for item in v)
+
+    def compile_anyOf(self, schema) -> Check:  # noqa: N802
+        checks = [self.compile(subschema) for subschema in schema["anyOf"]]
+        return lambda v: any(check(v) for check in checks)
+
+
+class SchemaValidator:
+    """
+    A Draft 7 validator compiled once per schema. Valid values are checked by
+    the compiled closures when the schema supports it, jsonschema is only
+    used to collect the errors of invalid values.
+    """
+
+    def __init__(self, schema: dict):
+        self.schema = schema
+        self.validator = jsonschema.Draft7Validator(schema)
+        try:
+            self.check = SchemaCompiler(schema).compile(schema)
+        except UnsupportedSchemaError:
+            self.check = self.validator.is_valid
+
+    def is_valid(self, value) -> bool:
+        return self.check(value)
+
+    def iter_errors(self, value) -> Iterator[jsonschema.ValidationError]:
+        if self.check(value):
+            return iter(())
+        return self.validator.iter_errors(value)
+
+    def validate(self, value):
+        """
+        Raises the most relevant error of an invalid value, like
+        jsonschema.validate without checking the schema on every call.
+        """
+        if not self.check(value):
+            raise best_match(self.validator.iter_errors(value))
+
+
+_validators: dict[str, SchemaValidator] = {}
+_validators_lock = threading.Lock()
+
+
+def get_schema_validator(schema: dict) -> SchemaValidator:
+    """
+    Returns the process wide validator of a schema, compiling it on first use.
+    Validators are keyed by the schema content, so model fields and their
+    serializer fields share the same compiled validator.
+    """
+    key = json.dumps(schema, sort_keys=True)
+    validator = _validators.get(key)
+    if validator is None:
+        with _validators_lock:
+            validator = _validators.get(key)
+            if validator is None:
+                jsonschema.Draft7Validator.check_schema(schema)
+                validator = _validators[key] = SchemaValidator(schema)
+    return validator
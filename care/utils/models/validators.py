@@ -11,6 +11,8 @@ from django.utils.deconstruct import deconstructible
 from django.utils.translation import gettext_lazy as _
 from PIL import Image
 
+from care.utils.models.json_schema import SchemaValidator, get_schema_validator
+
 
 @deconstructible
 class JSONFieldSchemaValidator:
@@ -20,10 +22,16 @@ class JSONFieldSchemaValidator:
 
     def __init__(self, schema: dict):
         self.schema = schema
-        self.schema_validator_class = jsonschema.Draft7Validator
+        self._validator = None
+
+    @property
+    def validator(self) -> SchemaValidator:
+        if self._validator is None:
+            self._validator = get_schema_validator(self.schema)
+        return self._validator
 
     def __call__(self, value):
-        errors = self.schema_validator_class(self.schema).iter_errors(value)
+        errors = self.validator.iter_errors(value)
 
         django_errors = []
         self._extract_errors(errors, django_errors)
@@ -37,6 +45,11 @@ class JSONFieldSchemaValidator:
             return False
         return self.deconstruct() == other.deconstruct()
 
+    def __deepcopy__(self, memo):
+        # serializer fields are deep copied on every instantiation, the schema
+        # is never changed so the copies can share the compiled validator
+        return self
+
     def _extract_errors(
         self,
         errors: Iterable[jsonschema.ValidationError],
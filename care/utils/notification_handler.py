@@ -197,6 +197,13 @@ class NotificationGenerator:
                         self.caused_by.get_full_name(),
                     )
                 )
+            if self.event == Notification.Event.INVESTIGATION_UPDATED.value:
+                message = (
+                    "Investigation Values for Patient {} were updated by {}".format(
+                        self.extra_data["consultation"].patient.name,
+                        self.caused_by.get_full_name(),
+                    )
+                )
         elif isinstance(self.caused_object, InvestigationValue):
             if self.event == Notification.Event.INVESTIGATION_UPDATED.value:
                 message = f"Investigation Value for {self.caused_object.investigation.name} for Patient {self.caused_object.consultation.patient.name} was updated by {self.caused_by.get_full_name()}"
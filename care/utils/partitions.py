@@ -0,0 +1,197 @@
+import gzip
+import os
+import re
+from datetime import date
+from pathlib import Path
+
+from django.db import connection, transaction
+
+PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+DEFAULT_PARTITION_SUFFIX = "_default"
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def get_partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def get_partitions(cursor, table: str) -> dict[str, date]:
+    """
+    Returns the monthly partitions of a table by name, with the first day of
+    the month each one holds, oldest first
+    """
+    cursor.execute(
+        """
+        SELECT child.relname FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = %s::regclass
+        """,
+        [table],
+    )
+    partitions = {}
+    for (name,) in cursor.fetchall():
+        if match := PARTITION_SUFFIX.search(name):
+            partitions[name] = date(int(match[1]), int(match[2]), 1)
+    return dict(sorted(partitions.items(), key=lambda item: item[1]))
+
+
+def create_partition(cursor, table: str, month: date, column: str):
+    """
+    Creates the partition of a table for a month. Rows of the month that
+    were stored in the default partition meanwhile are moved into it.
+    """
+    qn = cursor.db.ops.quote_name
+    name = get_partition_name(table, month)
+    default = f"{table}{DEFAULT_PARTITION_SUFFIX}"
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    bounds = f"FOR VALUES FROM ('{start} 00:00:00+00') TO ('{end} 00:00:00+00')"
+
+    cursor.execute(
+        f"SELECT EXISTS (SELECT 1 FROM {qn(default)} WHERE {qn(column)} >= %s "  # noqa: S608
+        f"AND {qn(column)} < %s)",
+        [f"{start} 00:00:00+00", f"{end} 00:00:00+00"],
+    )
+    (in_default,) = cursor.fetchone()
+    if not in_default:
+        cursor.execute(f"CREATE TABLE {qn(name)} PARTITION OF {qn(table)} {bounds}")
+        return
+
+    # the rows cannot be in the default partition once the month has its own
+    cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(default)}")
+    cursor.execute(f"CREATE TABLE {qn(name)} PARTITION OF {qn(table)} {bounds}")
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {qn(default)} WHERE {qn(column)} >= %s "  # noqa: S608
+        f"AND {qn(column)} < %s RETURNING *) INSERT INTO {qn(name)} SELECT * FROM moved",
+        [f"{start} 00:00:00+00", f"{end} 00:00:00+00"],
+    )
+    cursor.execute(f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(default)} DEFAULT")
+
+
+def ensure_partitions(
+    table: str, column: str, until: date, start: date | None = None
+) -> list[str]:
+    """
+    Creates the missing monthly partitions of a table from `start` (the
+    month after the latest partition by default) through the month of
+    `until`, returning their names
+    """
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        partitions = get_partitions(cursor, table)
+        if start is None:
+            start = add_months(max(partitions.values()), 1) if partitions else until
+        month = start.replace(day=1)
+        while month <= until:
+            if get_partition_name(table, month) not in partitions:
+                create_partition(cursor, table, month, column)
+                created.append(get_partition_name(table, month))
+            month = add_months(month, 1)
+    return created
+
+
+def partition_table(cursor, table: str, column: str, start: date, until: date):
+    """
+    Converts a table into one partitioned by month on `column`, with a
+    partition for every month from the oldest row (or `start` if earlier)
+    through `until` and a default partition for the rest. The primary key
+    becomes (pk, column), as the primary key of a partitioned table has to
+    include the partition key. Meant to be run from a migration, it copies
+    all the rows of the table.
+    """
+    qn = cursor.db.ops.quote_name
+    old = f"{table}_unpartitioned"
+    cursor.execute(
+        """
+        SELECT attname FROM pg_index
+        JOIN pg_attribute ON attrelid = indrelid AND attnum = ANY(indkey)
+        WHERE indrelid = %s::regclass AND indisprimary
+        """,
+        [table],
+    )
+    (pk,) = cursor.fetchone()
+    cursor.execute(
+        """
+        SELECT indexdef FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = %s AND indexname NOT IN (
+            SELECT conname FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = 'p'
+        )
+        """,
+        [table, table],
+    )
+    indexes = [indexdef for (indexdef,) in cursor.fetchall()]
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype = 'f'
+        """,
+        [table],
+    )
+    foreign_keys = cursor.fetchall()
+    cursor.execute(f"SELECT min({qn(column)}), max({qn(pk)}) FROM {qn(table)}")  # noqa: S608
+    first, last_pk = cursor.fetchone()
+
+    cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(old)}")
+    cursor.execute(
+        f"CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS "
+        f"INCLUDING CONSTRAINTS) PARTITION BY RANGE ({qn(column)})"
+    )
+    cursor.execute(
+        f"CREATE TABLE {qn(table + DEFAULT_PARTITION_SUFFIX)} "
+        f"PARTITION OF {qn(table)} DEFAULT"
+    )
+    month = min(first.date(), start) if first else start
+    month = month.replace(day=1)
+    while month <= until:
+        create_partition(cursor, table, month, column)
+        month = add_months(month, 1)
+    cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(old)}")  # noqa: S608
+    # drops the identity sequence of the old table along with it
+    cursor.execute(f"DROP TABLE {qn(old)}")
+
+    sequence = f"{table}_{pk}_seq"
+    cursor.execute(f"CREATE SEQUENCE {qn(sequence)} OWNED BY {qn(table)}.{qn(pk)}")
+    cursor.execute("SELECT setval(%s, %s, false)", [sequence, (last_pk or 0) + 1])
+    cursor.execute(
+        f"ALTER TABLE {qn(table)} ALTER COLUMN {qn(pk)} "
+        f"SET DEFAULT nextval('{sequence}')"
+    )
+    cursor.execute(
+        f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(table + '_pkey')} "
+        f"PRIMARY KEY ({qn(pk)}, {qn(column)})"
+    )
+    for indexdef in indexes:
+        cursor.execute(indexdef)
+    for name, definition in foreign_keys:
+        cursor.execute(
+            f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}"
+        )
+
+
+def archive_partition(table: str, name: str, directory: Path) -> Path:
+    """
+    Writes the rows of a partition to a gzipped CSV file in `directory`, then
+    detaches and drops the partition. The file can be loaded back with
+    COPY <table> FROM ... WITH (FORMAT csv, HEADER).
+    """
+    qn = connection.ops.quote_name
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}.csv.gz"
+    partial = directory / f"{name}.csv.gz.partial"
+    with transaction.atomic(), connection.cursor() as cursor:
+        with (
+            gzip.open(partial, "wb") as archive,
+            cursor.copy(f"COPY {qn(name)} TO STDOUT WITH (FORMAT csv, HEADER)") as copy,
+        ):
+            for data in copy:
+                archive.write(data)
+        with partial.open("rb") as archive:
+            os.fsync(archive.fileno())
+        partial.replace(path)
+        cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+        cursor.execute(f"DROP TABLE {qn(name)}")
+    return path
@@ -0,0 +1,163 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+current_profile: ContextVar["RequestProfile | None"] = ContextVar(
+    "current_profile", default=None
+)
+
+
+@dataclass
+class RequestProfile:
+    """
+    Per request counters collected while a sampled request is being served
+    """
+
+    db_queries: int = 0
+    db_time: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    spans: dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    span_calls: Counter = field(default_factory=Counter)
+    statements: Counter = field(default_factory=Counter)
+
+    @property
+    def duplicate_queries(self) -> int:
+        """
+        Number of queries that were exact repeats (same sql and params) of a
+        query already executed in this request
+        """
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def record_query(self, sql, params, duration: float):
+        self.db_queries += 1
+        self.db_time += duration
+        self.statements[(sql, repr(params))] += 1
+
+    def record_span(self, name: str, duration: float):
+        self.spans[name] += duration
+        self.span_calls[name] += 1
+
+
+def record_cache_lookup(hits: int, misses: int):
+    if profile := current_profile.get():
+        profile.cache_hits += hits
+        profile.cache_misses += misses
+
+
+@contextmanager
+def profile_span(name: str):
+    """
+    Measures the time spent inside the block against the current request, eg:
+
+        with profile_span("middleware"):
+            requests.get(...)
+    """
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.record_span(name, time.perf_counter() - start)
+
+
+class QueryProfiler:
+    """
+    Database execute wrapper that records every query against the given profile
+    """
+
+    def __init__(self, profile: RequestProfile):
+        self.profile = profile
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.profile.record_query(sql, params, time.perf_counter() - start)
+
+
+class ProfileMetrics:
+    """
+    In-process aggregation of request profiles by resolved view name, exposed in
+    the prometheus text format. Each worker process keeps its own counters.
+    """
+
+    COUNTERS = (
+        ("requests_total", "Total number of requests"),
+        ("request_duration_seconds_total", "Total time spent serving requests"),
+        ("sampled_requests_total", "Number of profiled requests"),
+        ("db_queries_total", "Database queries executed by profiled requests"),
+        ("db_duplicate_queries_total", "Repeated identical queries"),
+        ("db_duration_seconds_total", "Time spent in the database"),
+        ("cache_hits_total", "Cache hits"),
+        ("cache_misses_total", "Cache misses"),
+        ("span_calls_total", "Calls to instrumented external services"),
+        ("span_duration_seconds_total", "Time spent in external services"),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: dict[str, Counter] = defaultdict(Counter)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def observe(
+        self,
+        view: str,
+        method: str,
+        status: int,
+        duration: float,
+        profile: RequestProfile | None = None,
+    ):
+        labels = (("view", view), ("method", method))
+        with self._lock:
+            self._values["requests_total"][(*labels, ("status", str(status)))] += 1
+            self._values["request_duration_seconds_total"][labels] += duration
+            if profile is None:
+                return
+            self._values["sampled_requests_total"][labels] += 1
+            self._values["db_queries_total"][labels] += profile.db_queries
+            self._values["db_duplicate_queries_total"][labels] += (
+                profile.duplicate_queries
+            )
+            self._values["db_duration_seconds_total"][labels] += profile.db_time
+            self._values["cache_hits_total"][labels] += profile.cache_hits
+            self._values["cache_misses_total"][labels] += profile.cache_misses
+            for span, span_duration in profile.spans.items():
+                span_labels = (*labels, ("service", span))
+                self._values["span_calls_total"][span_labels] += profile.span_calls[
+                    span
+                ]
+                self._values["span_duration_seconds_total"][span_labels] += (
+                    span_duration
+                )
+
+    def render(self, prefix: str = "care") -> str:
+        lines = []
+        with self._lock:
+            for name, help_text in self.COUNTERS:
+                metric = f"{prefix}_{name}"
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for labels, value in sorted(self._values[name].items()):
+                    label_str = ",".join(
+                        f'{key}="{escape_label(label)}"' for key, label in labels
+                    )
+                    lines.append(f"{metric}{{{label_str}}} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = ProfileMetrics()
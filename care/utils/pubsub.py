@@ -0,0 +1,139 @@
+import asyncio
+import contextlib
+import json
+import threading
+from collections import defaultdict
+from functools import cache
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from care.utils.cache.client import get_redis_client
+
+
+class LocalSubscription:
+    """
+    Subscription to a channel of a LocalBroker, open within an `async with`
+    block
+    """
+
+    def __init__(self, broker: "LocalBroker", channel: str):
+        self.broker = broker
+        self.channel = channel
+        self.queue = asyncio.Queue()
+        self.subscriber = None
+
+    async def __aenter__(self):
+        self.subscriber = (asyncio.get_running_loop(), self.queue)
+        with self.broker.lock:
+            self.broker.subscribers[self.channel].add(self.subscriber)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        with self.broker.lock:
+            subscribers = self.broker.subscribers[self.channel]
+            subscribers.discard(self.subscriber)
+            if not subscribers:
+                del self.broker.subscribers[self.channel]
+
+    async def get(self, timeout: float) -> dict | None:
+        """
+        Waits up to `timeout` seconds for the next message of the channel,
+        returning None if none arrived
+        """
+        try:
+            return json.loads(await asyncio.wait_for(self.queue.get(), timeout))
+        except TimeoutError:
+            return None
+
+
+class LocalBroker:
+    """
+    Delivers the messages to the subscribers of the same process, used when
+    the default cache is not backed by Redis, as in tests
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers: dict[str, set[tuple]] = defaultdict(set)
+
+    def publish(self, channel: str, message: dict):
+        data = json.dumps(message, cls=DjangoJSONEncoder)
+        with self.lock:
+            subscribers = list(self.subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            # the loop of a subscriber that just went away may be closed
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(queue.put_nowait, data)
+
+    def subscribe(self, channel: str) -> LocalSubscription:
+        return LocalSubscription(self, channel)
+
+
+class RedisSubscription:
+    """
+    Subscription to a Redis channel, holding a connection of its own while
+    it is open within an `async with` block
+    """
+
+    def __init__(self, url: str, channel: str):
+        self.url = url
+        self.channel = channel
+        self.client = None
+        self.pubsub = None
+
+    async def __aenter__(self):
+        self.client = aioredis.Redis.from_url(self.url)
+        self.pubsub = self.client.pubsub()
+        await self.pubsub.subscribe(self.channel)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+    async def get(self, timeout: float) -> dict | None:
+        """
+        Waits up to `timeout` seconds for the next message of the channel,
+        returning None if none arrived
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
+            message = await self.pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=remaining
+            )
+            if message is not None:
+                return json.loads(message["data"])
+        return None
+
+
+class RedisBroker:
+    """
+    Publishes the messages on Redis channels, so that they reach the
+    subscribers of every worker
+    """
+
+    def __init__(self, url: str, client: redis.Redis | None = None):
+        self.url = url
+        self.client = client or redis.Redis.from_url(url)
+
+    def publish(self, channel: str, message: dict):
+        self.client.publish(channel, json.dumps(message, cls=DjangoJSONEncoder))
+
+    def subscribe(self, channel: str) -> RedisSubscription:
+        return RedisSubscription(self.url, channel)
+
+
+@cache
+def get_broker() -> LocalBroker | RedisBroker:
+    """
+    Returns the broker of the process, backed by Redis pub/sub when the
+    default cache is
+    """
+    client = get_redis_client()
+    if client is None:
+        return LocalBroker()
+    return RedisBroker(settings.REDIS_URL, client)
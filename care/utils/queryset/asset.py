@@ -0,0 +1,32 @@
+from django.db.models import CharField, F, Q, Value
+from django.db.models.fields.json import KT
+from django.db.models.functions import Coalesce, NullIf
+
+from care.facility.models.asset import Asset
+from care.utils.assetintegration.asset_classes import AssetClasses
+
+
+def get_middleware_asset_queryset(hostname: str, facility=None):
+    """
+    Returns the assets configured on the middleware at `hostname`, of the
+    given facility or of every facility
+    """
+    queryset = Asset.objects.filter(
+        asset_class__in=[AssetClasses.ONVIF.name, AssetClasses.HL7MONITOR.name]
+    )
+    if facility is not None:
+        queryset = queryset.filter(current_location__facility=facility)
+    return (
+        queryset.annotate(
+            resolved_middleware_hostname=Coalesce(
+                NullIf(KT("meta__middleware_hostname"), Value("")),
+                NullIf(F("current_location__middleware_address"), Value("")),
+                F("current_location__facility__middleware_address"),
+                output_field=CharField(),
+            )
+        )
+        .filter(resolved_middleware_hostname=hostname)
+        .exclude(
+            Q(meta__local_ip_address__isnull=True) | Q(meta__local_ip_address__exact="")
+        )
+    ).only("external_id", "meta", "description", "name", "asset_class")
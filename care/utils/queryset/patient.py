@@ -40,3 +40,22 @@ def get_patient_notes_queryset(user):
             q_filters |= Q(facility__id=user.home_facility)
         queryset = queryset.filter(q_filters)
     return queryset
+
+
+def get_patient_notes_feed_queryset(user):
+    """
+    Returns the patients whose notes are listed to the user by
+    PatientNotesViewSet
+    """
+    queryset = PatientRegistration.objects.all()
+    if user.is_superuser:
+        return queryset
+    if user.user_type >= User.TYPE_VALUE_MAP["StateLabAdmin"]:
+        return queryset.filter(facility__state=user.state)
+    if user.user_type >= User.TYPE_VALUE_MAP["DistrictLabAdmin"]:
+        return queryset.filter(facility__district=user.district)
+    allowed_facilities = get_accessible_facilities(user)
+    q_filters = Q(facility__id__in=allowed_facilities)
+    q_filters |= Q(last_consultation__assigned_to=user)
+    q_filters |= Q(assigned_to=user)
+    return queryset.filter(q_filters)
@@ -0,0 +1,134 @@
+import gzip
+import json
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+from care.utils.csp.client import get_client
+from care.utils.csp.config import BucketType
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PREFIX = "retention"
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    Rows of `model` (an "app_label.ModelName" label) matching `filters` whose
+    `date_field` is older than `days` are deleted, after being archived to
+    the patient bucket when `archive` is set. A policy with `days` of 0 keeps
+    rows forever.
+    """
+
+    name: str
+    model: str
+    days: int
+    date_field: str = "created_date"
+    filters: dict = field(default_factory=dict)
+    archive: bool = False
+
+    def get_queryset(self, now: datetime) -> models.QuerySet:
+        model = apps.get_model(self.model)
+        threshold = now - timedelta(days=self.days)
+        # the base manager also includes soft deleted rows
+        return model._base_manager.filter(  # noqa: SLF001
+            **{f"{self.date_field}__lte": threshold}, **self.filters
+        )
+
+
+@dataclass
+class RetentionResult:
+    policy: str
+    deleted: int = 0
+    archived: int = 0
+    batches: int = 0
+    duration: float = 0
+
+    @property
+    def rate(self) -> float:
+        return self.deleted / self.duration if self.duration else 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.policy}: deleted {self.deleted} rows in {self.batches} batches "
+            f"({self.duration:.1f}s, {self.rate:.0f} rows/s)"
+        )
+
+
+def archive_rows(policy: RetentionPolicy, run: datetime, batch: int, rows) -> str:
+    """
+    Uploads the rows as gzipped JSON lines to the patient bucket, one object
+    per batch, and returns its key.
+    """
+    key = f"{ARCHIVE_PREFIX}/{policy.name}/{run:%Y%m%dT%H%M%S}/{batch:06d}.jsonl.gz"
+    body = gzip.compress(
+        "".join(json.dumps(row, cls=DjangoJSONEncoder) + "\n" for row in rows).encode()
+    )
+    client, bucket_name = get_client(BucketType.PATIENT)
+    client.put_object(
+        Bucket=bucket_name, Key=key, Body=body, ContentType="application/gzip"
+    )
+    return key
+
+
+def log_progress(result: RetentionResult):
+    logger.info("Retention %s", result)
+
+
+def apply_retention_policy(
+    policy: RetentionPolicy,
+    *,
+    batch_size: int | None = None,
+    pause: float | None = None,
+    progress: Callable[[RetentionResult], None] = log_progress,
+) -> RetentionResult:
+    """
+    Deletes the expired rows of a policy in primary key order, at most
+    `batch_size` rows per DELETE with a `pause` in seconds between batches,
+    so that no statement holds locks on a large part of the table.
+
+    Batches are deleted with a plain DELETE, without loading the rows or
+    sending delete signals (which the audit log listens to for every model),
+    so policies are meant for tables that no other table references.
+    """
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    pause = settings.RETENTION_BATCH_PAUSE if pause is None else pause
+    result = RetentionResult(policy.name)
+    if not policy.days:
+        return result
+
+    now = timezone.now()
+    queryset = policy.get_queryset(now)
+    start = time.perf_counter()
+    last_pk = None
+    while True:
+        remaining = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        pks = list(remaining.order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            break
+        last_pk = pks[-1]
+
+        batch = queryset.filter(pk__in=pks)
+        if policy.archive:
+            rows = list(batch.values())
+            archive_rows(policy, now, result.batches, rows)
+            result.archived += len(rows)
+        deleted = batch._raw_delete(batch.db)  # noqa: SLF001
+
+        result.deleted += deleted
+        result.batches += 1
+        result.duration = time.perf_counter() - start
+        progress(result)
+        if len(pks) < batch_size:
+            break
+        time.sleep(pause)
+    return result
@@ -0,0 +1,35 @@
+from django.db import models
+from rest_framework import serializers
+
+from care.utils.models.base import BaseFlag, FlagResolver
+
+
+class FlagListSerializer(serializers.ListSerializer):
+    """
+    Prefetches the flags of all the items before serializing them, set as
+    the list_serializer_class of serializers using FlagsSerializerMixin.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.Manager) else data)
+        self.child.get_flag_resolver().prefetch(item.id for item in items)
+        return super().to_representation(items)
+
+
+class FlagsSerializerMixin:
+    """
+    Resolves the flags of the serialized entities with the FlagResolver of
+    `flag_model` kept in the serializer context, shared by every serializer
+    of the response.
+    """
+
+    flag_model: type[BaseFlag]
+
+    def get_flag_resolver(self) -> FlagResolver:
+        resolvers = self.context.setdefault("flag_resolvers", {})
+        if self.flag_model not in resolvers:
+            resolvers[self.flag_model] = FlagResolver(self.flag_model)
+        return resolvers[self.flag_model]
+
+    def get_flags(self, obj) -> tuple[str]:
+        return self.get_flag_resolver().get_flags(obj.id)
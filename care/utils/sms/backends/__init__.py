@@ -0,0 +1,25 @@
+from functools import cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class BaseSmsBackend:
+    """
+    Interface of the backends delivering SMS messages, set with SMS_BACKEND.
+
+    A backend instance is shared by all threads of a process, so send must be
+    thread safe. It raises on failures, which are retried by the outbox.
+    """
+
+    def send(self, phone_number: str, message: str):
+        raise NotImplementedError
+
+
+@cache
+def load_sms_backend(path: str) -> BaseSmsBackend:
+    return import_string(path)()
+
+
+def get_sms_backend() -> BaseSmsBackend:
+    return load_sms_backend(settings.SMS_BACKEND)
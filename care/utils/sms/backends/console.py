@@ -0,0 +1,19 @@
+import sys
+import threading
+
+from care.utils.sms.backends import BaseSmsBackend
+
+
+class SmsBackend(BaseSmsBackend):
+    """
+    Writes messages to stdout instead of sending them, for local development.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.lock = threading.Lock()
+
+    def send(self, phone_number: str, message: str):
+        with self.lock:
+            self.stream.write(f"SMS to {phone_number}: {message}\n")
+            self.stream.flush()
@@ -0,0 +1,17 @@
+import threading
+
+from care.utils.sms.backends import BaseSmsBackend
+
+# messages sent by the backend as (phone number, message), like mail.outbox
+outbox: list[tuple[str, str]] = []
+_lock = threading.Lock()
+
+
+class SmsBackend(BaseSmsBackend):
+    """
+    Keeps the sent messages in memory, for tests.
+    """
+
+    def send(self, phone_number: str, message: str):
+        with _lock:
+            outbox.append((phone_number, message))
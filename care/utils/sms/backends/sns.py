@@ -0,0 +1,25 @@
+import boto3
+from botocore.config import Config
+from django.conf import settings
+
+from care.utils.sms.backends import BaseSmsBackend
+
+
+class SmsBackend(BaseSmsBackend):
+    """
+    Publishes messages with AWS SNS, using one client per process since
+    creating a boto3 client is slow and clients are thread safe.
+    """
+
+    def __init__(self):
+        # the default session is not thread safe, use a dedicated one
+        self.client = boto3.session.Session().client(
+            "sns",
+            aws_access_key_id=settings.SNS_ACCESS_KEY,
+            aws_secret_access_key=settings.SNS_SECRET_KEY,
+            region_name=settings.SNS_REGION,
+            config=Config(max_pool_connections=settings.SMS_WORKERS),
+        )
+
+    def send(self, phone_number: str, message: str):
+        self.client.publish(PhoneNumber=phone_number, Message=message)
@@ -0,0 +1,100 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from care.facility.models.notification import SMSMessage
+from care.utils.sms.backends import BaseSmsBackend, get_sms_backend
+
+logger = logging.getLogger(__name__)
+
+# how long a batch is claimed by the worker sending it
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+@dataclass
+class DeliveryResult:
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+def send_message(backend: BaseSmsBackend, sms: SMSMessage) -> Exception | None:
+    try:
+        backend.send(sms.phone_number, sms.message)
+    except Exception as e:
+        return e
+    return None
+
+
+def claim_batch(batch_size: int) -> list[SMSMessage]:
+    """
+    Claims a batch of due messages by pushing their next attempt past the
+    time it takes to send them. Rows are locked with SKIP LOCKED only while
+    they are claimed, so several workers can drain the outbox at the same
+    time, and the messages of a worker that died are sent again once their
+    claim expires.
+    """
+    with transaction.atomic():
+        batch = list(
+            SMSMessage.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=SMSMessage.Status.PENDING,
+                next_attempt_at__lte=timezone.now(),
+            )
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        SMSMessage.objects.filter(id__in=[sms.id for sms in batch]).update(
+            next_attempt_at=timezone.now() + CLAIM_TIMEOUT
+        )
+    return batch
+
+
+def deliver_pending(batch_size: int | None = None) -> DeliveryResult:
+    """
+    Delivers the pending messages in batches, each batch sent in parallel by
+    SMS_WORKERS threads outside of any transaction. Failed messages are
+    retried with an exponential backoff until SMS_MAX_ATTEMPTS.
+    """
+    batch_size = batch_size or settings.SMS_BATCH_SIZE
+    backend = get_sms_backend()
+    result = DeliveryResult()
+    with ThreadPoolExecutor(max_workers=settings.SMS_WORKERS) as executor:
+        while batch := claim_batch(batch_size):
+            errors = list(executor.map(lambda sms: send_message(backend, sms), batch))
+            with transaction.atomic():
+                record_attempts(batch, errors, result)
+    return result
+
+
+def record_attempts(batch: list[SMSMessage], errors: list, result: DeliveryResult):
+    now = timezone.now()
+    sent = [sms.id for sms, error in zip(batch, errors, strict=True) if not error]
+    SMSMessage.objects.filter(id__in=sent).update(
+        status=SMSMessage.Status.SENT, attempts=F("attempts") + 1, sent_at=now
+    )
+    result.sent += len(sent)
+
+    failed = []
+    for sms, error in zip(batch, errors, strict=True):
+        if not error:
+            continue
+        sms.attempts += 1
+        sms.last_error = repr(error)
+        if sms.attempts >= settings.SMS_MAX_ATTEMPTS:
+            sms.status = SMSMessage.Status.FAILED
+            result.failed += 1
+            logger.error("SMS %s failed after %s attempts", sms.id, sms.attempts)
+        else:
+            delay = settings.SMS_RETRY_DELAY * 2 ** (sms.attempts - 1)
+            sms.next_attempt_at = now + timedelta(seconds=delay)
+            result.retried += 1
+        failed.append(sms)
+    SMSMessage.objects.bulk_update(
+        failed, ["attempts", "last_error", "status", "next_attempt_at"]
+    )
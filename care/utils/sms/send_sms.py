@@ -1,17 +1,27 @@
 import logging
+from itertools import batched
 
-import boto3
 from django.conf import settings
+from django.db import transaction
 
+from care.facility.models.notification import SMSMessage
+from care.facility.tasks.sms import deliver_sms
 from care.utils.models.validators import mobile_validator
 
 logger = logging.getLogger(__name__)
 
+ENQUEUE_BATCH_SIZE = 1000
+
 
 def send_sms(phone_numbers, message, many=False):
+    """
+    Queues the message for each valid phone number in the SMS outbox, which
+    is delivered by the deliver_sms task once the transaction commits.
+    """
     if not many:
         phone_numbers = [phone_numbers]
     phone_numbers = list(set(phone_numbers))
+    messages = []
     for phone in phone_numbers:
         try:
             mobile_validator(phone)
@@ -19,11 +29,10 @@ def send_sms(phone_numbers, message, many=False):
             if settings.DEBUG:
                 logger.error("Invalid Phone Number %s", phone)
             continue
-        client = boto3.client(
-            "sns",
-            aws_access_key_id=settings.SNS_ACCESS_KEY,
-            aws_secret_access_key=settings.SNS_SECRET_KEY,
-            region_name=settings.SNS_REGION,
-        )
-        client.publish(PhoneNumber=phone, Message=message)
+        messages.append(SMSMessage(phone_number=phone, message=message))
+
+    for batch in batched(messages, ENQUEUE_BATCH_SIZE):
+        SMSMessage.objects.bulk_create(batch)
+    if messages:
+        transaction.on_commit(deliver_sms.delay)
     return True
@@ -1,13 +1,27 @@
 from abc import ABC
 
+import redis
 from django.conf import settings
 from redis_om import HashModel, get_redis_connection
 from redis_om.model.migrations.migrator import schema_hash_key
 
+from care.utils.profiling import profile_span
+
+
+class ProfiledRedis(redis.Redis):
+    """
+    Redis client that reports the time spent in redisearch commands to the
+    request profiler
+    """
+
+    def execute_command(self, *args, **options):
+        with profile_span("redisearch"):
+            return super().execute_command(*args, **options)
+
 
 class BaseRedisModel(HashModel, ABC):
     class Meta:
-        database = get_redis_connection(url=settings.REDIS_URL)
+        database = ProfiledRedis.from_url(settings.REDIS_URL, decode_responses=True)
         global_key_prefix = "care_static_data"
 
 
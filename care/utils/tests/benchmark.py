@@ -0,0 +1,212 @@
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from care.facility.events.handler import create_consultation_events
+from care.facility.models import DailyRound
+
+BASELINE_FILE = Path(__file__).resolve().parent / "benchmark_baseline.json"
+
+# number of facilities, patients per facility, daily rounds per consultation
+# generated for each unit of BENCHMARK_SCALE
+FACILITIES_PER_SCALE = 2
+PATIENTS_PER_FACILITY = 4
+DAILY_ROUNDS_PER_CONSULTATION = 3
+
+
+def get_benchmark_scale() -> int:
+    return int(os.environ.get("BENCHMARK_SCALE", "1"))
+
+
+def should_update_baseline() -> bool:
+    return os.environ.get("BENCHMARK_UPDATE_BASELINE", "0") == "1"
+
+
+def should_check_timings() -> bool:
+    return os.environ.get("BENCHMARK_CHECK_TIMINGS", "0") == "1"
+
+
+def get_timing_tolerance() -> float:
+    return float(os.environ.get("BENCHMARK_TIMING_TOLERANCE", "0.25"))
+
+
+@dataclass
+class BenchmarkResult:
+    queries: int
+    p50_ms: float
+    p95_ms: float
+    peak_memory_kb: float
+
+
+def percentile(samples: list[float], pct: int) -> float:
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def measure(func: Callable, iterations: int = 10) -> BenchmarkResult:
+    """
+    Runs func once to warm up, then records the query count of a single call,
+    the p50/p95 latency over `iterations` calls and the peak memory allocated
+    by a single call.
+    """
+    func()
+
+    with CaptureQueriesContext(connection) as context:
+        func()
+    queries = len(context.captured_queries)
+
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        queries=queries,
+        p50_ms=round(percentile(durations, 50), 2),
+        p95_ms=round(percentile(durations, 95), 2),
+        peak_memory_kb=round(peak / 1024, 2),
+    )
+
+
+def load_baseline() -> dict:
+    if not BASELINE_FILE.exists():
+        return {}
+    with BASELINE_FILE.open() as f:
+        return json.load(f)
+
+
+def write_baseline(scale: int, results: dict[str, BenchmarkResult]) -> None:
+    baseline = load_baseline()
+    recorded = baseline.setdefault(str(scale), {})
+    recorded.update({name: asdict(result) for name, result in results.items()})
+    with BASELINE_FILE.open("w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+class BenchmarkMixin:
+    """
+    Mixin for TestUtils based test cases that builds a scaled synthetic dataset
+    and compares query counts, latency and memory against benchmark_baseline.json
+
+    Environment variables:
+        BENCHMARK_SCALE: multiplier for the generated dataset (default 1)
+        BENCHMARK_UPDATE_BASELINE: set to 1 to record results as the new baseline
+        BENCHMARK_CHECK_TIMINGS: set to 1 to also fail on latency/memory regressions
+        BENCHMARK_TIMING_TOLERANCE: allowed latency/memory growth (default 0.25)
+    """
+
+    benchmark_iterations = 10
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.benchmark_results = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        if should_update_baseline() and cls.benchmark_results:
+            write_baseline(get_benchmark_scale(), cls.benchmark_results)
+        super().tearDownClass()
+
+    @classmethod
+    def create_benchmark_dataset(cls, user, district, local_body, scale: int = 1):
+        """
+        Creates facilities with beds, assets, patients, consultations, daily
+        rounds and consultation events. Returns the list of created facilities.
+        """
+        call_command("load_event_types", stdout=StringIO())
+        facilities = []
+        for facility_index in range(FACILITIES_PER_SCALE * scale):
+            facility = cls.create_facility(
+                user,
+                district,
+                local_body,
+                name=f"Benchmark {facility_index}",
+                features=[],
+            )
+            location = cls.create_asset_location(facility)
+            for patient_index in range(PATIENTS_PER_FACILITY):
+                bed = cls.create_bed(facility, location, name=f"Bed {patient_index}")
+                asset = cls.create_asset(location, name=f"Monitor {patient_index}")
+                cls.create_assetbed(bed, asset)
+                patient = cls.create_patient(
+                    district, facility, local_body=local_body, created_by=user
+                )
+                consultation = cls.create_consultation(
+                    patient, facility, doctor=user, created_by=user
+                )
+                consultation.current_bed = cls.create_consultation_bed(
+                    consultation, bed
+                )
+                consultation.save(update_fields=["current_bed"])
+                for round_index in range(DAILY_ROUNDS_PER_CONSULTATION):
+                    daily_round = DailyRound.objects.create(
+                        consultation=consultation,
+                        created_by=user,
+                        rounds_type=DailyRound.RoundsType.NORMAL.value,
+                        taken_at=now() - timedelta(hours=round_index),
+                        bp={"systolic": 120, "diastolic": 80},
+                        pulse=72,
+                        resp=16,
+                    )
+                    create_consultation_events(
+                        consultation.id,
+                        daily_round,
+                        caused_by=user.id,
+                        taken_at=daily_round.taken_at,
+                    )
+            facilities.append(facility)
+        return facilities
+
+    def assertBenchmark(self, name: str, func: Callable):  # noqa: N802
+        result = measure(func, self.benchmark_iterations)
+        self.benchmark_results[name] = result
+        if should_update_baseline():
+            return result
+
+        scale = get_benchmark_scale()
+        expected = load_baseline().get(str(scale), {}).get(name)
+        if expected is None:
+            self.skipTest(
+                f"no baseline recorded for '{name}' at scale {scale}, "
+                "run with BENCHMARK_UPDATE_BASELINE=1 to record one"
+            )
+
+        self.assertLessEqual(
+            result.queries,
+            expected["queries"],
+            f"{name}: query count regressed from {expected['queries']} "
+            f"to {result.queries}",
+        )
+        if should_check_timings():
+            tolerance = 1 + get_timing_tolerance()
+            for metric in ("p50_ms", "p95_ms", "peak_memory_kb"):
+                self.assertLessEqual(
+                    getattr(result, metric),
+                    expected[metric] * tolerance,
+                    f"{name}: {metric} regressed from {expected[metric]} "
+                    f"to {getattr(result, metric)}",
+                )
+        return result
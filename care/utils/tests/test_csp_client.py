@@ -0,0 +1,87 @@
+import io
+from urllib.parse import urlparse
+
+from botocore.response import StreamingBody
+from botocore.stub import ANY, Stubber
+from django.test import TestCase, override_settings
+
+from care.facility.models.file_upload import FileUpload
+from care.utils.csp.client import clear_clients, get_client
+from care.utils.csp.config import BucketType
+
+
+@override_settings(
+    FILE_UPLOAD_BUCKET="patient-bucket",
+    FILE_UPLOAD_REGION="ap-south-1",
+    FILE_UPLOAD_KEY="key",
+    FILE_UPLOAD_SECRET="secret",
+    FILE_UPLOAD_BUCKET_ENDPOINT="http://localstack:4566",
+    FILE_UPLOAD_BUCKET_EXTERNAL_ENDPOINT="http://localhost:4566",
+)
+class S3ClientTestCase(TestCase):
+    def setUp(self) -> None:
+        clear_clients()
+        self.addCleanup(clear_clients)
+
+    def test_client_is_reused(self):
+        client, bucket_name = get_client(BucketType.PATIENT)
+        self.assertEqual(bucket_name, "patient-bucket")
+        self.assertIs(get_client(BucketType.PATIENT)[0], client)
+
+    def test_client_per_endpoint(self):
+        internal, _ = get_client(BucketType.PATIENT)
+        external, _ = get_client(BucketType.PATIENT, external=True)
+        self.assertIsNot(internal, external)
+        self.assertEqual(internal.meta.endpoint_url, "http://localstack:4566")
+        self.assertEqual(external.meta.endpoint_url, "http://localhost:4566")
+
+        with override_settings(FILE_UPLOAD_BUCKET_ENDPOINT="http://minio:9000"):
+            self.assertIsNot(get_client(BucketType.PATIENT)[0], internal)
+
+    def test_read_signed_urls(self):
+        files = [
+            FileUpload(
+                internal_name=f"file{i}.pdf",
+                file_type=FileUpload.FileType.DISCHARGE_SUMMARY,
+            )
+            for i in range(3)
+        ]
+        urls = FileUpload.read_signed_urls(files)
+        self.assertEqual(len(urls), 3)
+        for file in files:
+            url = urlparse(urls[file.external_id])
+            self.assertEqual(url.netloc, "localhost:4566")
+            self.assertEqual(url.path, f"/patient-bucket/{file.get_object_key()}")
+            self.assertEqual(urls[file.external_id], file.read_signed_url())
+
+    def test_streaming_transfers(self):
+        file = FileUpload(
+            internal_name="file.pdf", file_type=FileUpload.FileType.DISCHARGE_SUMMARY
+        )
+        client, _ = get_client(BucketType.PATIENT)
+        with Stubber(client) as stubber:
+            stubber.add_response(
+                "put_object",
+                {},
+                {
+                    "Bucket": "patient-bucket",
+                    "Key": "DISCHARGE_SUMMARY/file.pdf",
+                    "Body": ANY,
+                    "ContentType": "application/pdf",
+                },
+            )
+            file.put_object(io.BytesIO(b"%PDF"), ContentType="application/pdf")
+
+            body = b"0123456789"
+            stubber.add_response(
+                "get_object",
+                {
+                    "Body": StreamingBody(io.BytesIO(body), len(body)),
+                    "ContentLength": len(body),
+                },
+                {"Bucket": "patient-bucket", "Key": "DISCHARGE_SUMMARY/file.pdf"},
+            )
+            self.assertEqual(
+                list(file.iter_contents(chunk_size=4)), [b"0123", b"4567", b"89"]
+            )
+            stubber.assert_no_pending_responses()
@@ -0,0 +1,115 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from care.facility.models.facility_flag import FacilityFlag
+from care.users.api.serializers.user import UserSerializer
+from care.users.models import User, UserFlag
+from care.utils.registries.feature_flag import FlagRegistry, FlagType
+from care.utils.tests.test_utils import OverrideCache, TestUtils
+
+
+class FlagResolverTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facilities = [
+            cls.create_facility(cls.user, cls.district, cls.local_body)
+            for _ in range(5)
+        ]
+        cls.users = [
+            cls.create_user(f"user{i}", cls.district, home_facility=cls.facilities[0])
+            for i in range(5)
+        ]
+
+    def setUp(self) -> None:
+        super().setUp()
+        FlagRegistry.register(FlagType.FACILITY, "TEST_FACILITY_FLAG")
+        FlagRegistry.register(FlagType.USER, "TEST_USER_FLAG")
+        FacilityFlag.objects.create(
+            facility=self.facilities[0], flag="TEST_FACILITY_FLAG"
+        )
+        UserFlag.objects.create(user=self.users[0], flag="TEST_USER_FLAG")
+
+    def count_flag_queries(self, context, table):
+        return sum(table in query["sql"] for query in context.captured_queries)
+
+    def count_flag_cache_calls(self, cache_method):
+        return sum("flags_cache" in str(call) for call in cache_method.call_args_list)
+
+    def test_facility_list(self):
+        with OverrideCache(self):
+            cache = caches["default"]
+            for attempt in range(2):
+                with (
+                    mock.patch.object(
+                        cache, "get_many", wraps=cache.get_many
+                    ) as get_many,
+                    mock.patch.object(
+                        cache, "get_or_set", wraps=cache.get_or_set
+                    ) as get_or_set,
+                    mock.patch.object(
+                        cache, "set_many", wraps=cache.set_many
+                    ) as set_many,
+                    CaptureQueriesContext(connection) as context,
+                ):
+                    response = self.client.get("/api/v1/facility/")
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+                flags = {
+                    facility["id"]: facility["facility_flags"]
+                    for facility in response.json()["results"]
+                }
+                self.assertEqual(
+                    flags.pop(str(self.facilities[0].external_id)),
+                    ["TEST_FACILITY_FLAG"],
+                )
+                self.assertEqual(set(map(tuple, flags.values())), {()})
+
+                self.assertEqual(self.count_flag_cache_calls(get_many), 1)
+                self.assertEqual(self.count_flag_cache_calls(get_or_set), 0)
+                # the flags are loaded once and then served from the cache
+                self.assertEqual(
+                    self.count_flag_queries(context, "facility_facilityflag"),
+                    int(attempt == 0),
+                )
+                self.assertEqual(set_many.call_count, int(attempt == 0))
+
+    def test_user_list(self):
+        users = User.objects.filter(id__in=[user.id for user in self.users])
+        with OverrideCache(self):
+            cache = caches["default"]
+            with (
+                mock.patch.object(cache, "get_many", wraps=cache.get_many) as get_many,
+                mock.patch.object(
+                    cache, "get_or_set", wraps=cache.get_or_set
+                ) as get_or_set,
+                CaptureQueriesContext(connection) as context,
+            ):
+                data = UserSerializer(users, many=True).data
+
+            flags = {user["id"]: user["user_flags"] for user in data}
+            self.assertEqual(flags.pop(self.users[0].id), ("TEST_USER_FLAG",))
+            self.assertEqual(set(flags.values()), {()})
+            self.assertEqual(self.count_flag_cache_calls(get_many), 1)
+            self.assertEqual(self.count_flag_cache_calls(get_or_set), 0)
+            self.assertEqual(self.count_flag_queries(context, "users_userflag"), 1)
+
+    def test_flags_are_invalidated_on_save(self):
+        with OverrideCache(self):
+            facility = self.facilities[1]
+            self.assertEqual(
+                FacilityFlag.get_all_flags_many([facility.id]), {facility.id: ()}
+            )
+            FacilityFlag.objects.create(facility=facility, flag="TEST_FACILITY_FLAG")
+            self.assertEqual(
+                FacilityFlag.get_all_flags_many([facility.id]),
+                {facility.id: ("TEST_FACILITY_FLAG",)},
+            )
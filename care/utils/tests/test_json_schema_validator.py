@@ -0,0 +1,149 @@
+import importlib
+import pkgutil
+from itertools import islice
+
+import jsonschema
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from care.facility.api.serializers.daily_round import DailyRoundSerializer
+from care.facility.models import DailyRound
+from care.facility.models import json_schema as schema_package
+from care.utils.assetintegration.schema import meta_object_schema
+from care.utils.models.json_schema import SchemaCompiler, get_schema_validator
+from care.utils.models.validators import JSONFieldSchemaValidator
+
+MAX_DEPTH = 3
+SCALARS = [None, True, False, 0, 1, -1, 0.5, 2.0, 19, 20, 1000, "", "x", "1:2:3"]
+
+
+def get_repo_schemas() -> list[dict]:
+    schemas = [meta_object_schema]
+    for module_info in pkgutil.iter_modules(schema_package.__path__):
+        module = importlib.import_module(
+            f"{schema_package.__name__}.{module_info.name}"
+        )
+        schemas.extend(
+            value
+            for name, value in vars(module).items()
+            if name.isupper() and isinstance(value, dict) and "type" in value
+        )
+    return schemas
+
+
+def resolve(schema, root):
+    if "$ref" not in schema:
+        return schema
+    target = root
+    for part in schema["$ref"][2:].split("/"):
+        target = target[part]
+    return resolve(target, root)
+
+
+def generate_samples(schema, root, depth):
+    """
+    Returns up to 30 generated values of a subschema, the valid ones first.
+    """
+    schema = resolve(schema, root)
+    reference = jsonschema.Draft7Validator(
+        {**schema, "definitions": root.get("definitions", {})}
+    )
+    samples = list(islice(generate_instances(schema, root, depth + 1), 30))
+    return sorted(samples, key=lambda value: not reference.is_valid(value))
+
+
+def generate_instances(schema, root, depth=0):
+    """
+    Yields values close to the boundaries of a schema: its enum options,
+    minimum and maximum, objects with valid, invalid, missing and unknown
+    properties, and arrays of generated items.
+    """
+    schema = resolve(schema, root)
+    yield from SCALARS
+    yield from schema.get("enum", [])
+    for bound in ("minimum", "maximum"):
+        if bound in schema:
+            yield from (schema[bound] - 1, schema[bound], schema[bound] + 1)
+    for subschema in schema.get("anyOf", []):
+        yield from islice(generate_instances(subschema, root, depth + 1), 20)
+    if depth > MAX_DEPTH:
+        return
+
+    items = schema.get("items")
+    if isinstance(items, list):
+        items = items[0] if items else {}
+    if isinstance(items, dict):
+        samples = generate_samples(items, root, depth)
+        yield []
+        yield from ([sample] for sample in samples)
+        yield samples[:3]
+        yield [samples[0], samples[-1]]
+
+    properties = schema.get("properties", {})
+    if properties:
+        samples = {
+            name: generate_samples(subschema, root, depth)
+            for name, subschema in properties.items()
+        }
+        yield {}
+        for index in range(10):
+            value = {
+                name: options[index % len(options)] for name, options in samples.items()
+            }
+            yield value
+            yield {**value, "unknown": 1}
+            for name in schema.get("required", []):
+                yield {k: v for k, v in value.items() if k != name}
+            for name, options in samples.items():
+                yield {**value, name: options[-1]}
+
+
+class JSONSchemaValidatorTestCase(TestCase):
+    def test_compiled_validators_match_jsonschema(self):
+        for schema in get_repo_schemas():
+            validator = get_schema_validator(schema)
+            reference = jsonschema.Draft7Validator(schema)
+            for instance in generate_instances(schema, schema):
+                self.assertEqual(
+                    validator.is_valid(instance),
+                    reference.is_valid(instance),
+                    f"{instance!r} against {schema}",
+                )
+
+    def test_daily_round_schemas_are_compiled(self):
+        for field in DailyRound._meta.get_fields():  # noqa: SLF001
+            for validator in getattr(field, "validators", []):
+                if isinstance(validator, JSONFieldSchemaValidator):
+                    # raises UnsupportedSchemaError for schemas left to jsonschema
+                    SchemaCompiler(validator.schema).compile(validator.schema)
+
+    def test_validators_are_shared(self):
+        model_validator = next(
+            v
+            for v in DailyRound._meta.get_field("bp").validators  # noqa: SLF001
+            if isinstance(v, JSONFieldSchemaValidator)
+        )
+        serializer_validator = next(
+            v
+            for v in DailyRoundSerializer().fields["bp"].validators
+            if isinstance(v, JSONFieldSchemaValidator)
+        )
+        self.assertIs(model_validator.validator, serializer_validator.validator)
+        self.assertIs(
+            model_validator.validator,
+            JSONFieldSchemaValidator(dict(model_validator.schema)).validator,
+        )
+
+    def test_invalid_values_report_jsonschema_errors(self):
+        validator = JSONFieldSchemaValidator(
+            {
+                "type": "object",
+                "properties": {"quantity": {"type": "number", "minimum": 0}},
+                "required": ["quantity"],
+            }
+        )
+        validator({"quantity": 1})
+        with self.assertRaisesMessage(ValidationError, "-1 is less than the minimum"):
+            validator({"quantity": -1})
+        with self.assertRaisesMessage(ValidationError, "'quantity' is a required"):
+            validator({})
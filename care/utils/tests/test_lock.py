@@ -0,0 +1,141 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from freezegun import freeze_time
+
+from care.utils.lock import FENCING_TIMEOUT_FACTOR, Lock, ObjectLocked
+from care.utils.tests.test_utils import OverrideCache
+
+
+class LockTestCase(SimpleTestCase):
+    def test_lock_is_exclusive(self):
+        with OverrideCache(self):
+            with Lock("resource"):
+                with self.assertRaises(ObjectLocked):
+                    Lock("resource").acquire()
+                with Lock("other-resource"):
+                    pass
+            with Lock("resource"):
+                pass
+
+    def test_expired_holder_does_not_release_new_holder(self):
+        with OverrideCache(self), freeze_time() as frozen_time:
+            expired = Lock("resource", timeout=1)
+            expired_token = expired.acquire()
+            frozen_time.tick(2)
+
+            holder = Lock("resource", timeout=10)
+            token = holder.acquire()
+            self.assertGreater(token, expired_token)
+
+            self.assertFalse(expired.release())
+            self.assertFalse(expired.renew())
+            with self.assertRaises(ObjectLocked):
+                Lock("resource").acquire()
+            self.assertTrue(holder.release())
+
+    def test_fencing_tokens_increase(self):
+        with OverrideCache(self):
+            tokens = []
+            for _ in range(3):
+                with Lock("resource") as lock:
+                    tokens.append(lock.fencing_token)
+            self.assertEqual(tokens, sorted(set(tokens)))
+
+    def test_fencing_counter_expires(self):
+        with OverrideCache(self), freeze_time() as frozen_time:
+            with Lock("resource", timeout=1) as lock:
+                token = lock.fencing_token
+            self.assertIsNotNone(cache.get(lock.fencing_key))
+
+            frozen_time.tick(FENCING_TIMEOUT_FACTOR + 1)
+            self.assertIsNone(cache.get(lock.fencing_key))
+            with Lock("resource", timeout=1) as lock:
+                self.assertGreater(lock.fencing_token, token)
+
+    def test_blocking_acquire(self):
+        with OverrideCache(self):
+            holder = Lock("resource")
+            holder.acquire()
+            threading.Timer(0.1, holder.release).start()
+            with Lock("resource", wait=5):
+                pass
+
+    def test_blocking_acquire_is_bounded(self):
+        with OverrideCache(self), Lock("resource"):
+            start = time.monotonic()
+            with self.assertRaises(ObjectLocked):
+                Lock("resource", wait=0.2).acquire()
+            self.assertLess(time.monotonic() - start, 1)
+
+    def test_auto_renew(self):
+        with OverrideCache(self):
+            with Lock("resource", timeout=0.3, auto_renew=True):
+                time.sleep(0.6)
+                with self.assertRaises(ObjectLocked):
+                    Lock("resource").acquire()
+            with Lock("resource"):
+                pass
+
+    def test_release_during_renewal(self):
+        with OverrideCache(self):
+            lock = Lock("resource", timeout=0.3, auto_renew=True)
+            renewals = []
+            renewed = threading.Event()
+            renew = lock._renew  # noqa: SLF001
+
+            def release_and_renew(token):
+                lock.release()
+                renewals.append(renew(token))
+                renewed.set()
+                return renewals[-1]
+
+            lock._renew = release_and_renew  # noqa: SLF001
+            lock.acquire()
+            self.assertTrue(renewed.wait(5))
+            self.assertEqual(renewals, [False])
+            self.assertFalse(lock.renew())
+
+
+class LockContentionTestCase(SimpleTestCase):
+    """
+    Contending threads each take the lock repeatedly, the critical sections
+    must never overlap and the fencing tokens must follow the order in which
+    the lock was held.
+    """
+
+    threads = 8
+    acquisitions = 10
+
+    def test_contention(self):
+        with OverrideCache(self):
+            holders = []
+            tokens = []
+            errors = []
+
+            def worker():
+                for _ in range(self.acquisitions):
+                    try:
+                        with Lock("resource", wait=10) as lock:
+                            holders.append(lock)
+                            if len(holders) > 1:
+                                errors.append("critical sections overlap")
+                            tokens.append(lock.fencing_token)
+                            holders.remove(lock)
+                    except ObjectLocked as e:
+                        errors.append(str(e))
+
+            workers = [threading.Thread(target=worker) for _ in range(self.threads)]
+            start = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            duration = time.perf_counter() - start
+
+            self.assertEqual(errors, [])
+            self.assertEqual(len(tokens), self.threads * self.acquisitions)
+            self.assertEqual(tokens, sorted(set(tokens)))
+            self.assertLess(duration, 10)
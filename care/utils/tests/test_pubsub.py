@@ -0,0 +1,55 @@
+import asyncio
+from unittest import skipUnless
+
+import redis
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from care.utils.pubsub import LocalBroker, RedisBroker
+
+
+def redis_available() -> bool:
+    try:
+        return redis.Redis.from_url(settings.REDIS_URL).ping()
+    except redis.ConnectionError:
+        return False
+
+
+class LocalBrokerTestCase(SimpleTestCase):
+    def get_broker(self):
+        return LocalBroker()
+
+    def test_publish_and_subscribe(self):
+        broker = self.get_broker()
+
+        async def subscribe():
+            async with (
+                broker.subscribe("channel") as subscription,
+                broker.subscribe("other-channel") as other,
+            ):
+                await asyncio.to_thread(broker.publish, "channel", {"id": 1})
+                message = await subscription.get(timeout=5)
+                return message, await other.get(timeout=0.1)
+
+        message, other = async_to_sync(subscribe)()
+        self.assertEqual(message, {"id": 1})
+        self.assertIsNone(other)
+
+    def test_get_times_out(self):
+        broker = self.get_broker()
+
+        async def subscribe():
+            async with broker.subscribe("channel") as subscription:
+                return await subscription.get(timeout=0.1)
+
+        self.assertIsNone(async_to_sync(subscribe)())
+
+    def test_publish_without_subscribers(self):
+        self.get_broker().publish("channel", {"id": 1})
+
+
+@skipUnless(redis_available(), "needs a Redis server at REDIS_URL")
+class RedisBrokerTestCase(LocalBrokerTestCase):
+    def get_broker(self):
+        return RedisBroker(settings.REDIS_URL)
@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from care.utils.profiling import RequestProfile, metrics, profile_span
+from care.utils.tests.test_utils import TestUtils
+
+PROFILED_MIDDLEWARE = [
+    "config.middlewares.RequestProfilingMiddleware",
+    *settings.MIDDLEWARE,
+]
+
+
+class RequestProfileTestCase(TestCase):
+    def test_duplicate_queries(self):
+        profile = RequestProfile()
+        profile.record_query("SELECT 1 WHERE id = %s", (1,), 0.1)
+        profile.record_query("SELECT 1 WHERE id = %s", (1,), 0.1)
+        profile.record_query("SELECT 1 WHERE id = %s", (1,), 0.1)
+        profile.record_query("SELECT 1 WHERE id = %s", (2,), 0.1)
+        self.assertEqual(profile.db_queries, 4)
+        self.assertEqual(profile.duplicate_queries, 2)
+
+    def test_span_outside_request(self):
+        with profile_span("middleware"):
+            pass
+
+
+@override_settings(
+    MIDDLEWARE=PROFILED_MIDDLEWARE,
+    REQUEST_PROFILING_ENABLED=True,
+    REQUEST_PROFILING_SAMPLE_RATE=1,
+    REQUEST_PROFILING_METRICS_TOKEN="",
+)
+class RequestProfilingMiddlewareTestCase(TestUtils, APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.state = cls.create_state()
+        cls.district = cls.create_district(cls.state)
+        cls.local_body = cls.create_local_body(cls.district)
+        cls.user = cls.create_super_user("su", cls.district)
+        cls.facility = cls.create_facility(cls.user, cls.district, cls.local_body)
+
+    def setUp(self) -> None:
+        metrics.reset()
+        self.client.force_authenticate(user=self.user)
+
+    def test_server_timing_header(self):
+        response = self.client.get("/api/v1/facility/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        server_timing = response.headers["Server-Timing"]
+        self.assertIn("db;dur=", server_timing)
+        self.assertIn("cache;desc=", server_timing)
+        self.assertIn("total;dur=", server_timing)
+
+    @override_settings(REQUEST_PROFILING_SAMPLE_RATE=0)
+    def test_unsampled_request(self):
+        response = self.client.get("/api/v1/facility/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Server-Timing", response.headers)
+        rendered = metrics.render()
+        self.assertIn(
+            'care_requests_total{view="facility-list",method="GET",status="200"} 1',
+            rendered,
+        )
+        self.assertNotIn('care_db_queries_total{view="facility-list"', rendered)
+
+    def test_metrics_aggregated_by_view(self):
+        self.client.get("/api/v1/facility/")
+        self.client.get(f"/api/v1/facility/{self.facility.external_id}/")
+        self.client.get(f"/api/v1/facility/{self.facility.external_id}/")
+
+        response = self.client.get("/metrics/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = response.content.decode()
+        self.assertIn(
+            'care_requests_total{view="facility-detail",method="GET",status="200"} 2',
+            content,
+        )
+        self.assertIn(
+            'care_db_queries_total{view="facility-list",method="GET"}', content
+        )
+
+    @override_settings(REQUEST_PROFILING_METRICS_TOKEN="secret")
+    def test_metrics_token(self):
+        response = self.client.get("/metrics/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get("/metrics/", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(REQUEST_PROFILING_ENABLED=False)
+    def test_metrics_disabled(self):
+        response = self.client.get("/metrics/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
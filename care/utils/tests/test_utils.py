@@ -1,7 +1,7 @@
 import uuid
 from collections import OrderedDict
 from datetime import UTC, date, datetime
-from typing import Any
+from types import FunctionType
 from uuid import uuid4
 
 from django.test import override_settings
@@ -59,11 +59,20 @@ fake = Faker()
 class OverrideCache(override_settings):
     """
     Overrides the cache settings for the test to use a
-    local memory cache instead of the redis cache
+    local memory cache instead of the redis cache, either as
+    `with OverrideCache(self):` or as a decorator of a test
+    method or class
     """
 
-    def __init__(self, decorated):
-        self.decorated = decorated
+    def __new__(cls, decorated=None):
+        override = super().__new__(cls)
+        if isinstance(decorated, type | FunctionType):
+            override.__init__()
+            # the decorated test, which runs with the cache overridden
+            return override(decorated)
+        return override
+
+    def __init__(self, decorated=None):
         super().__init__(
             CACHES={
                 "default": {
@@ -73,9 +82,6 @@ class OverrideCache(override_settings):
             },
         )
 
-    def __call__(self) -> Any:
-        return super().__call__(self.decorated)
-
 
 class EverythingEquals:
     def __eq__(self, other):
@@ -70,6 +70,7 @@ from care.facility.api.viewsets.patient_investigation import (
     PatientInvestigationSummaryViewSet,
     PatientInvestigationViewSet,
 )
+from care.facility.api.viewsets.patient_notes_feed import patient_notes_feed
 from care.facility.api.viewsets.patient_otp import PatientMobileOTPViewSet
 from care.facility.api.viewsets.patient_otp_data import OTPPatientDataViewSet
 from care.facility.api.viewsets.patient_sample import PatientSampleViewSet
@@ -321,6 +322,12 @@ router.register("public/asset_qr", AssetPublicQRViewSet, basename="public-asset-
 
 app_name = "api"
 urlpatterns = [
+    # ahead of the notes routes, which would take "feed" for a note id
+    path(
+        "patient/<uuid:patient_external_id>/notes/feed/",
+        patient_notes_feed,
+        name="patient-notes-feed",
+    ),
     path("", include(router.urls)),
     path("", include(user_nested_router.urls)),
     path("", include(facility_nested_router.urls)),
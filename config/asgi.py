@@ -0,0 +1,21 @@
+"""
+ASGI config for Care project.
+
+Serves the same application as config.wsgi, for the views that hold their
+connections open (like the live feed of patient notes), which would each
+tie up a WSGI worker. Run it with an ASGI capable worker, for example
+``gunicorn config.asgi:application -k uvicorn.workers.UvicornWorker``.
+
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR / "care"))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+application = get_asgi_application()
@@ -1,5 +1,8 @@
 from django.core.cache.backends import dummy, locmem
 from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis import cache as django_redis
+
+from care.utils.profiling import record_cache_lookup
 
 
 class DummyCache(dummy.DummyCache):
@@ -14,3 +17,21 @@ class LocMemCache(locmem.LocMemCache):
         super().set(key, value, timeout, version)
         # mimic the behavior of django_redis with setnx, for tests
         return True
+
+
+class RedisCache(django_redis.RedisCache):
+    """
+    django_redis cache that reports hits and misses to the request profiler
+    """
+
+    def get(self, key, default=None, version=None, client=None):
+        value = super().get(key, default=default, version=version, client=client)
+        hit = value is not default
+        record_cache_lookup(hits=int(hit), misses=int(not hit))
+        return value
+
+    def get_many(self, keys, version=None, client=None):
+        keys = list(keys)
+        values = super().get_many(keys, version=version, client=client)
+        record_cache_lookup(hits=len(values), misses=len(keys) - len(values))
+        return values
@@ -1,5 +1,18 @@
+import json
 import logging
+import random
 import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from care.utils.profiling import (
+    QueryProfiler,
+    RequestProfile,
+    current_profile,
+    metrics,
+)
 
 
 class RequestTimeLoggingMiddleware:
@@ -13,3 +26,85 @@ class RequestTimeLoggingMiddleware:
         duration = time.time() - request.start_time
         self.logger.info("Request to %s took %.4f seconds", request.path, duration)
         return response
+
+
+class RequestProfilingMiddleware:
+    """
+    Profiles a sample of requests (REQUEST_PROFILING_SAMPLE_RATE), recording
+    database queries, cache lookups and time spent in external services.
+
+    Sampled requests get a Server-Timing header and a structured log line,
+    and all requests are aggregated by view name for the metrics endpoint.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.logger = logging.getLogger("request_profiling_middleware")
+        self.sample_rate = settings.REQUEST_PROFILING_SAMPLE_RATE
+
+    def __call__(self, request):
+        profile = None
+        if random.random() < self.sample_rate:  # noqa: S311
+            profile = RequestProfile()
+
+        token = current_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                if profile is not None:
+                    for connection in connections.all():
+                        stack.enter_context(
+                            connection.execute_wrapper(QueryProfiler(profile))
+                        )
+                response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        duration = time.perf_counter() - start
+
+        view_name = self.get_view_name(request)
+        metrics.observe(
+            view_name, request.method, response.status_code, duration, profile
+        )
+        if profile is not None:
+            response["Server-Timing"] = self.get_server_timing(profile, duration)
+            self.logger.info(
+                json.dumps(
+                    {
+                        "view": view_name,
+                        "method": request.method,
+                        "path": request.path,
+                        "status": response.status_code,
+                        "duration_ms": round(duration * 1000, 2),
+                        "db_queries": profile.db_queries,
+                        "db_duplicate_queries": profile.duplicate_queries,
+                        "db_ms": round(profile.db_time * 1000, 2),
+                        "cache_hits": profile.cache_hits,
+                        "cache_misses": profile.cache_misses,
+                        "spans_ms": {
+                            name: round(span * 1000, 2)
+                            for name, span in profile.spans.items()
+                        },
+                    }
+                )
+            )
+        return response
+
+    @staticmethod
+    def get_view_name(request) -> str:
+        if match := getattr(request, "resolver_match", None):
+            return match.view_name or match.route
+        return "unresolved"
+
+    @staticmethod
+    def get_server_timing(profile: RequestProfile, duration: float) -> str:
+        metrics = [
+            f'db;dur={profile.db_time * 1000:.2f};desc="{profile.db_queries} queries, '
+            f'{profile.duplicate_queries} duplicate"',
+            f'cache;desc="{profile.cache_hits} hits, {profile.cache_misses} misses"',
+        ]
+        metrics.extend(
+            f'{name};dur={span * 1000:.2f};desc="{profile.span_calls[name]} calls"'
+            for name, span in profile.spans.items()
+        )
+        metrics.append(f"total;dur={duration * 1000:.2f}")
+        return ", ".join(metrics)
@@ -13,6 +13,7 @@ from healthy_django.healthcheck.celery_queue_length import (
 )
 from healthy_django.healthcheck.django_cache import DjangoCacheHealthCheck
 from healthy_django.healthcheck.django_database import DjangoDatabaseHealthCheck
+from kombu import Queue
 
 from care.utils.csp import config as csp_config
 from plug_config import manager
@@ -78,7 +79,7 @@ REDIS_URL = env("REDIS_URL", default="redis://localhost:6379")
 # https://docs.djangoproject.com/en/dev/ref/settings/#caches
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        "BACKEND": "config.caches.RedisCache",
         "LOCATION": REDIS_URL,
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
@@ -95,6 +96,7 @@ CACHES = {
 ROOT_URLCONF = "config.urls"
 # https://docs.djangoproject.com/en/dev/ref/settings/#wsgi-application
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
 
 # APPS
 # ------------------------------------------------------------------------------
@@ -202,6 +204,15 @@ MIDDLEWARE = [
 if env.bool("ENABLE_REQUEST_TIME_LOGGING", default=False):
     MIDDLEWARE.insert(0, "config.middlewares.RequestTimeLoggingMiddleware")
 
+# add RequestProfilingMiddleware based on the environment variable, profiles a
+# fraction of the requests given by REQUEST_PROFILING_SAMPLE_RATE (0 to 1)
+REQUEST_PROFILING_ENABLED = env.bool("ENABLE_REQUEST_PROFILING", default=False)
+REQUEST_PROFILING_SAMPLE_RATE = env.float("REQUEST_PROFILING_SAMPLE_RATE", default=0.01)
+# bearer token required to scrape the metrics endpoint, leave empty to disable auth
+REQUEST_PROFILING_METRICS_TOKEN = env("REQUEST_PROFILING_METRICS_TOKEN", default="")
+if REQUEST_PROFILING_ENABLED:
+    MIDDLEWARE.insert(0, "config.middlewares.RequestProfilingMiddleware")
+
 # STATIC
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#static-files
@@ -349,6 +360,11 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "request_profiling_middleware": {
+            "handlers": ["time_logging"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
     "root": {"level": "INFO", "handlers": ["console"]},
 }
@@ -420,6 +436,54 @@ CELERY_TASK_TIME_LIMIT = 1800 * 5
 # https://docs.celeryq.dev/en/latest/userguide/configuration.html#task-soft-time-limit
 # TODO: set to whatever value is adequate in your circumstances
 CELERY_TASK_SOFT_TIME_LIMIT = 1800
+# https://docs.celeryq.dev/en/latest/userguide/configuration.html#worker-prefetch-multiplier
+# long running tasks (discharge summaries, summarisation) should not be reserved
+# by a busy worker while others are idle
+CELERY_WORKER_PREFETCH_MULTIPLIER = env.int("CELERY_WORKER_PREFETCH_MULTIPLIER", 1)
+
+# Celery queues
+# ------------------------------------------------------------------------------
+# A worker started without -Q consumes every queue below, run separate workers
+# per queue (see scripts/celery_worker.sh) to isolate slow jobs from user facing
+# ones. Tasks that are not routed go to the default "celery" queue.
+CELERY_QUEUE_DEFAULT = "celery"
+CELERY_QUEUE_INTERACTIVE = "interactive"  # user is waiting on the result
+CELERY_QUEUE_NOTIFICATIONS = "notifications"  # notifications and webpush
+CELERY_QUEUE_REPORTS = "reports"  # discharge summary generation and emails
+CELERY_QUEUE_MAINTENANCE = "maintenance"  # periodic summaries, monitors, cleanup
+CELERY_QUEUES = [
+    CELERY_QUEUE_DEFAULT,
+    CELERY_QUEUE_INTERACTIVE,
+    CELERY_QUEUE_NOTIFICATIONS,
+    CELERY_QUEUE_REPORTS,
+    CELERY_QUEUE_MAINTENANCE,
+]
+# https://docs.celeryq.dev/en/latest/userguide/configuration.html#task-default-queue
+CELERY_TASK_DEFAULT_QUEUE = CELERY_QUEUE_DEFAULT
+# https://docs.celeryq.dev/en/latest/userguide/configuration.html#task-queues
+CELERY_TASK_QUEUES = [Queue(name) for name in CELERY_QUEUES]
+# https://docs.celeryq.dev/en/latest/userguide/configuration.html#task-routes
+CELERY_TASK_ROUTES = {
+    "care.facility.tasks.push_asset_config.*": {"queue": CELERY_QUEUE_INTERACTIVE},
+    "care.facility.tasks.consultation_events.*": {"queue": CELERY_QUEUE_INTERACTIVE},
+    "care.utils.notification_handler.*": {"queue": CELERY_QUEUE_NOTIFICATIONS},
+    "care.facility.tasks.sms.*": {"queue": CELERY_QUEUE_NOTIFICATIONS},
+    "care.facility.tasks.discharge_summary.*": {"queue": CELERY_QUEUE_REPORTS},
+    "care.facility.tasks.external_test.*": {"queue": CELERY_QUEUE_REPORTS},
+    "care.facility.tasks.summarisation.*": {"queue": CELERY_QUEUE_MAINTENANCE},
+    "care.facility.tasks.asset_monitor.*": {"queue": CELERY_QUEUE_MAINTENANCE},
+    "care.facility.tasks.location_monitor.*": {"queue": CELERY_QUEUE_MAINTENANCE},
+    "care.facility.tasks.redis_index.*": {"queue": CELERY_QUEUE_MAINTENANCE},
+    "care.facility.tasks.cleanup.*": {"queue": CELERY_QUEUE_MAINTENANCE},
+    "care.facility.tasks.plausible_stats.*": {"queue": CELERY_QUEUE_MAINTENANCE},
+}
+# https://docs.celeryq.dev/en/latest/userguide/configuration.html#task-annotations
+# rate limits are enforced per worker instance
+CELERY_TASK_ANNOTATIONS = {
+    "care.facility.tasks.discharge_summary.generate_discharge_summary_task": {
+        "rate_limit": env("DISCHARGE_SUMMARY_RATE_LIMIT", default="30/m"),
+    },
+}
 
 # Maintenance Mode
 # ------------------------------------------------------------------------------
@@ -448,15 +512,22 @@ HEALTHY_DJANGO = [
         "Database", slug="main_database", connection_name="default"
     ),
     DjangoCacheHealthCheck("Cache", slug="main_cache", connection_name="default"),
-    DjangoCeleryQueueLengthHealthCheck(
-        "Celery Queue Length",
-        slug="celery_queue_length",
-        broker=REDIS_URL,
-        queue_name="celery",
-        info_length=50,
-        warning_length=0,  # this skips the 300 status code
-        alert_length=200,
-    ),
+    *[
+        DjangoCeleryQueueLengthHealthCheck(
+            f"Celery Queue Length ({queue_name})",
+            slug=(
+                "celery_queue_length"
+                if queue_name == CELERY_QUEUE_DEFAULT
+                else f"celery_queue_length_{queue_name}"
+            ),
+            broker=REDIS_URL,
+            queue_name=queue_name,
+            info_length=50,
+            warning_length=0,  # this skips the 300 status code
+            alert_length=200,
+        )
+        for queue_name in CELERY_QUEUES
+    ],
 ]
 
 # Audit logs
@@ -497,6 +568,11 @@ AUDIT_LOG = {
 # ------------------------------------------------------------------------------
 OTP_REPEAT_WINDOW = 6  # OTPs will only be valid for 6 hours to login
 OTP_MAX_REPEATS_WINDOW = 10  # times OTPs can be sent within OTP_REPEAT_WINDOW
+# times OTPs can be sent from a client IP within OTP_REPEAT_WINDOW, only enforced
+# when set and the default cache is Redis
+OTP_MAX_REPEATS_IP_WINDOW = env.int("OTP_MAX_REPEATS_IP_WINDOW", default=0)
+# header the client IP is read from behind a proxy, REMOTE_ADDR otherwise
+OTP_CLIENT_IP_HEADER = env("OTP_CLIENT_IP_HEADER", default="")
 OTP_LENGTH = 5
 
 # ICD
@@ -519,6 +595,12 @@ GOOGLE_CAPTCHA_POST_KEY = "g-recaptcha-response"
 # SMS
 # ------------------------------------------------------------------------------
 USE_SMS = False
+SMS_BACKEND = env("SMS_BACKEND", default="care.utils.sms.backends.sns.SmsBackend")
+SMS_BATCH_SIZE = env.int("SMS_BATCH_SIZE", default=100)
+SMS_WORKERS = env.int("SMS_WORKERS", default=8)  # parallel sends per worker
+SMS_MAX_ATTEMPTS = env.int("SMS_MAX_ATTEMPTS", default=3)
+SMS_RETRY_DELAY = env.int("SMS_RETRY_DELAY", default=60)  # seconds, doubled per attempt
+SMS_RETENTION_DAYS = env.int("SMS_RETENTION_DAYS", default=7)
 
 # Push Notifications
 # ------------------------------------------------------------------------------
@@ -532,6 +614,41 @@ VAPID_PRIVATE_KEY = env(
 SEND_SMS_NOTIFICATION = False
 NOTIFICATION_RETENTION_DAYS = env.int("NOTIFICATION_RETENTION_DAYS", default=30)
 
+# Patient Notes Feed
+# ------------------------------------------------------------------------------
+# seconds between the keep-alive comments of an idle event stream
+PATIENT_NOTES_FEED_HEARTBEAT = env.int("PATIENT_NOTES_FEED_HEARTBEAT", default=15)
+# seconds a long poll waits for new notes before answering 304
+PATIENT_NOTES_LONG_POLL_TIMEOUT = env.int("PATIENT_NOTES_LONG_POLL_TIMEOUT", default=25)
+
+# Data Retention
+# ------------------------------------------------------------------------------
+# 0 keeps the rows forever
+SUMMARY_RETENTION_DAYS = env.int("SUMMARY_RETENTION_DAYS", default=0)
+CONSULTATION_EVENT_RETENTION_DAYS = env.int(
+    "CONSULTATION_EVENT_RETENTION_DAYS", default=0
+)
+HISTORY_RETENTION_DAYS = env.int("HISTORY_RETENTION_DAYS", default=0)
+RETENTION_ARCHIVE = env.bool("RETENTION_ARCHIVE", default=False)
+RETENTION_BATCH_SIZE = env.int("RETENTION_BATCH_SIZE", default=1000)
+RETENTION_BATCH_PAUSE = env.float("RETENTION_BATCH_PAUSE", default=0.1)  # seconds
+# the history tables are partitioned by month, partitions are created this
+# many months ahead and archive_history_partitions archives the ones older
+# than HISTORY_ARCHIVE_AFTER_MONTHS
+HISTORY_PARTITION_MONTHS_AHEAD = env.int("HISTORY_PARTITION_MONTHS_AHEAD", default=3)
+HISTORY_ARCHIVE_AFTER_MONTHS = env.int("HISTORY_ARCHIVE_AFTER_MONTHS", default=12)
+HISTORY_ARCHIVE_DIR = env(
+    "HISTORY_ARCHIVE_DIR", default=str(BASE_DIR / "history_archive")
+)
+
+# Asset Monitoring
+# ------------------------------------------------------------------------------
+# availability records older than this are collapsed into intervals
+AVAILABILITY_COMPACTION_DAYS = env.int("AVAILABILITY_COMPACTION_DAYS", default=7)
+# seconds over which changes to the assets of a middleware are coalesced into
+# a single push of their configuration
+ASSET_CONFIG_SYNC_DEBOUNCE = env.int("ASSET_CONFIG_SYNC_DEBOUNCE", default=10)
+
 # Cloud and Buckets
 # ------------------------------------------------------------------------------
 
@@ -628,6 +745,12 @@ MIN_ENCOUNTER_DATE = env(
 # for exporting csv
 CSV_REQUEST_PARAMETER = "csv"
 
+# external test result uploads with more rows than this are processed as a
+# background job, the upload returns a job id to poll for progress
+EXTERNAL_TEST_BULK_UPSERT_ASYNC_THRESHOLD = env.int(
+    "EXTERNAL_TEST_BULK_UPSERT_ASYNC_THRESHOLD", default=500
+)
+
 # current hosted domain
 CURRENT_DOMAIN = env("CURRENT_DOMAIN", default="localhost:8000")
 BACKEND_DOMAIN = env("BACKEND_DOMAIN", default="localhost:9000")
@@ -34,6 +34,10 @@ TEMPLATES[-1]["OPTIONS"]["loaders"] = [  # type: ignore[index]
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+# SMS
+# ------------------------------------------------------------------------------
+SMS_BACKEND = "care.utils.sms.backends.locmem.SmsBackend"
 # Your stuff...
 # ------------------------------------------------------------------------------
 
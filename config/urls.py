@@ -26,12 +26,13 @@ from config.health_views import (
 )
 
 from .auth_views import AnnotatedTokenVerifyView, TokenObtainPairView, TokenRefreshView
-from .views import app_version, home_view, ping
+from .views import app_version, home_view, ping, request_metrics
 
 urlpatterns = [
     path("", home_view, name="home"),
     path("ping/", ping, name="ping"),
     path("app_version/", app_version, name="app_version"),
+    path("metrics/", request_metrics, name="request_metrics"),
     # Django Admin, use {% url 'admin:index' %}
     path(f"{settings.ADMIN_URL.rstrip('/')}/", admin.site.urls),
     # Rest API
@@ -1,7 +1,9 @@
 from django.conf import settings
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import render
 
+from care.utils.profiling import metrics
+
 
 def app_version(request):
     return JsonResponse({"version": settings.APP_VERSION})
@@ -13,3 +15,14 @@ def home_view(request):
 
 def ping(request):
     return JsonResponse({"status": "OK"})
+
+
+def request_metrics(request):
+    if not settings.REQUEST_PROFILING_ENABLED:
+        raise Http404
+    token = settings.REQUEST_PROFILING_METRICS_TOKEN
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponse(status=401)
+    return HttpResponse(
+        metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -7,4 +7,17 @@ fi
 
 python manage.py collectstatic --noinput
 python manage.py compilemessages
-celery --app=config.celery_app worker --max-tasks-per-child=6 --loglevel=info
+
+# CELERY_WORKER_QUEUES: comma separated queues to consume (default: all queues)
+#   eg. "interactive,notifications" for user facing work, "reports" for discharge
+#   summaries and "maintenance,celery" for periodic jobs
+# CELERY_WORKER_CONCURRENCY: number of worker processes (default: number of cpus)
+WORKER_ARGS=()
+if [ -n "${CELERY_WORKER_QUEUES}" ]; then
+    WORKER_ARGS+=(--queues="${CELERY_WORKER_QUEUES}" --hostname="worker-${CELERY_WORKER_QUEUES//,/-}@%h")
+fi
+if [ -n "${CELERY_WORKER_CONCURRENCY}" ]; then
+    WORKER_ARGS+=(--concurrency="${CELERY_WORKER_CONCURRENCY}")
+fi
+
+celery --app=config.celery_app worker --max-tasks-per-child=6 --loglevel=info "${WORKER_ARGS[@]}"